@@ -1,12 +1,125 @@
-import openai
+import numpy as np
 import pandas as pd
-import streamlit as st
+import math
+import re
+import threading
 import time
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
 import os
-from dotenv import load_dotenv
+from circuit_breaker import CLOSED, STATE_CODES, CircuitBreaker, CircuitOpenError
+from instrumentation import timed
+from language_detection import DEFAULT_LANGUAGE, LANGUAGE_COLUMN, language_name
+from metrics import AIMetrics, MetricsRegistry
+from model_routing import LOCAL_TIER, KeywordClassifier, ModelRouter
+from pii_redaction import PIIRedactor
+from prompt_compaction import DEFAULT_MAX_FEEDBACK_TOKENS, compact_feedback
+from reporters import CallbackReporter, ProgressCallback, Reporter, default_reporter
+from result_cache import CacheEntry, ResultCache
+from sentiment import SENTIMENT_COLUMN, URGENCY_COLUMN, from_ratings, unscored_rows
+
+_dotenv_loaded = False
+
+
+def _load_dotenv_once():
+    # python-dotenv and openai are imported lazily so that importing this
+    # module stays cheap for the CLI, worker processes and sample-data runs.
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv()
+    _dotenv_loaded = True
+
+
+# Keep-alive pool shared by every request through a given client. Sized for
+# the CLI's --workers fan-out; idle connections are kept for two minutes so
+# consecutive Streamlit reruns don't pay for a new TCP/TLS handshake.
+HTTP_POOL_LIMITS = {
+    'max_connections': 32,
+    'max_keepalive_connections': 16,
+    'keepalive_expiry': 120.0,
+}
+HTTP_TIMEOUT_SECONDS = 30.0
+
+_client_lock = threading.Lock()
+_shared_clients: Dict[Tuple[str, Optional[str]], object] = {}
+
+
+def _build_http_client():
+    import httpx
+    import openai
+    try:
+        import h2  # noqa: F401 - only needed to enable HTTP/2
+        http2 = True
+    except ImportError:
+        http2 = False
+    return openai.DefaultHttpxClient(
+        limits=httpx.Limits(**HTTP_POOL_LIMITS),
+        http2=http2,
+    )
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None):
+    """Return the process-wide OpenAI client for this key and endpoint.
+
+    openai.OpenAI is thread-safe, so one instance (and its connection pool)
+    is shared by every AIAnalyzer, Streamlit session and worker thread.
+    """
+    key = (api_key, base_url)
+    with _client_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            import openai
+            # AIAnalyzer owns the retry policy; SDK-level retries on top of
+            # it would multiply every failure into up to 9 requests
+            client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                                   timeout=HTTP_TIMEOUT_SECONDS, http_client=_build_http_client())
+            _shared_clients[key] = client
+        return client
+
+
+# Static instructions live in the system message and the feedback goes last,
+# so every request shares an identical prefix that the provider can cache.
+# The category is answered with one letter, so the reply is a single token
+# whose log-probabilities give a probability for every category.
+CATEGORY_LABELS = ['A', 'B', 'C']
+
+CATEGORIZE_SYSTEM_PROMPT = """You are a business analyst specializing in product feedback categorization.
+Categorize the customer feedback into exactly one of these three categories:
+A. Win Enterprise Deals
+B. Ensure Regulatory & Data Compliance
+C. Improve Platform Usability & Performance
+Respond with only the letter of the category, nothing else."""
+
+# Alternatives returned per reply token; the three labels plus some slack
+CATEGORY_TOP_LOGPROBS = 5
+
+# (AI_Category, AI_Summary, AI_Status, per-category probabilities)
+RowResult = Tuple[str, str, str, Tuple[float, ...]]
+
+SUMMARIZE_SYSTEM_PROMPT = """You are a product management assistant helping Product Managers quickly understand customer feedback.
+Write a concise, one-sentence executive summary of the core problem or request:
+- Maximum 25 words
+- Be specific about what the customer needs or what's broken, not generic
+- Business-friendly language suitable for executive dashboards
+- Highlight the impact or urgency if mentioned
+Respond with only the summary."""
+
+# Asked only for rows the sentiment lexicon found nothing in
+SENTIMENT_SYSTEM_PROMPT = """You rate customer feedback for a product team.
+Reply with two digits and nothing else:
+- first, sentiment from 1 (very negative) to 5 (very positive)
+- second, urgency from 1 (can wait) to 5 (needs action now)
+For example, 24 means somewhat negative and fairly urgent."""
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s')
+_RATINGS = re.compile(r'([1-5])\D*([1-5])')
 
-load_dotenv()
 
 class AIAnalyzer:
     
@@ -16,170 +129,650 @@ class AIAnalyzer:
         "Improve Platform Usability & Performance"
     ]
     
-    def __init__(self):
+    MODEL = "gpt-3.5-turbo"
+    DEFAULT_CATEGORY = "Improve Platform Usability & Performance"
+    
+    # float32 probability per category (same order as STRATEGIC_CATEGORIES)
+    # and the top one. Replies without logprobs, cache entries from before
+    # probabilities were stored and local estimates spread the remaining
+    # mass evenly over the other categories.
+    PROBABILITY_COLUMNS = ['AI_P_Enterprise', 'AI_P_Compliance', 'AI_P_Usability']
+    CONFIDENCE_COLUMN = 'AI_Confidence'
+    
+    # AI_Status values. 'fallback' rows were filled in locally while the
+    # circuit breaker was open, 'failed' rows after a call ran out of
+    # retries; both carry local estimates and are the ones to re-process.
+    STATUS_OK = 'ok'
+    STATUS_FALLBACK = 'fallback'
+    STATUS_FAILED = 'failed'
+    STATUS_SAMPLE = 'sample'
+    REPROCESS_STATUSES = (STATUS_FALLBACK, STATUS_FAILED)
+    
+    # Reply budget per task
+    TASK_MAX_TOKENS = {'categorize': 1, 'summarize': 60, 'sentiment': 2}
+    
+    # Length of the extractive summary used while the API is unavailable
+    FALLBACK_SUMMARY_TOKENS = 25
+    
+    # Exponential backoff between retries: base * 2**attempt seconds
+    RETRY_BACKOFF_BASE = 1.0
+    
+    # iter_batch yields a chunk once it has this many rows or this many
+    # seconds have passed, whichever comes first
+    STREAM_CHUNK_ROWS = 500
+    STREAM_FLUSH_SECONDS = 2.0
+    
+    def __init__(self, reporter: Optional[Reporter] = None, cache: Optional[ResultCache] = None,
+                 api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 metrics_registry: Optional[MetricsRegistry] = None,
+                 max_feedback_tokens: Optional[int] = DEFAULT_MAX_FEEDBACK_TOKENS,
+                 router: Optional[ModelRouter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 redactor: Optional[PIIRedactor] = None):
+        self.reporter = reporter if reporter is not None else default_reporter()
+        self.cache = cache
+        # None sends every call to MODEL; see model_routing for tiered policies
+        self.router = router
+        # Shared by every call, so an outage trips it once for all workers
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.fallback_classifier = router.classifier if router is not None else KeywordClassifier()
+        # Token budget for the feedback text in each prompt; None disables truncation
+        self.max_feedback_tokens = max_feedback_tokens
+        # Frames from DataProcessor are redacted once at load; this covers
+        # the single-text methods, which take text from anywhere
+        self.redactor = redactor if redactor is not None else PIIRedactor.from_env()
+        self.metrics = AIMetrics(metrics_registry)
         self.client = None
-        self._setup_openai()
+        self._setup_openai(api_key, base_url)
     
-    def _setup_openai(self):
-        api_key = os.getenv('OPENAI_API_KEY')
+    def _setup_openai(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        _load_dotenv_once()
+        api_key = api_key or os.getenv('OPENAI_API_KEY')
+        base_url = base_url or os.getenv('OPENAI_BASE_URL')
         if not api_key:
-            st.warning("OpenAI API key not found. Will use sample data.")
+            self.reporter.warning("OpenAI API key not found. Will use sample data.")
             return
         
         try:
-            # Test if the API key is valid by trying to create client
-            self.client = openai.OpenAI(api_key=api_key)
-            # Don't test the API here - just create the client
+            # Don't test the API here - just create (or reuse) the client
+            self.client = get_openai_client(api_key, base_url)
         except Exception as e:
-            st.warning(f"Error setting up OpenAI client: {str(e)}. Will use sample data.")
+            self.reporter.warning(f"Error setting up OpenAI client: {str(e)}. Will use sample data.")
             self.client = None
     
-    def categorize_feedback(self, feedback_text: str, max_retries: int = 3) -> str:
+    @timed()
+    def categorize_feedback(self, feedback_text: str, max_retries: int = 3,
+                            reporter: Optional[Reporter] = None, model: Optional[str] = None,
+                            language: Optional[str] = None) -> str:
+        feedback_text = self.redactor.redact_text(feedback_text)
+        return self._categorize(feedback_text, max_retries, reporter, model, language)[0]
+    
+    def category_probabilities(self, feedback_text: str, max_retries: int = 3,
+                               reporter: Optional[Reporter] = None,
+                               language: Optional[str] = None) -> Dict[str, float]:
+        """Probability of each strategic category for one feedback text"""
+        feedback_text = self.redactor.redact_text(feedback_text)
+        _, probabilities, _ = self._categorize(feedback_text, max_retries, reporter, language=language)
+        return dict(zip(self.STRATEGIC_CATEGORIES, probabilities))
+    
+    def _categorize(self, feedback_text: str, max_retries: int = 3, reporter: Optional[Reporter] = None,
+                    model: Optional[str] = None,
+                    language: Optional[str] = None) -> Tuple[str, Tuple[float, ...], str]:
+        """(category, per-category probabilities, status); failed calls return a local estimate"""
         if not self.client:
             # Return a default category when API is not configured
             # This should not be called when using sample data, but just in case
-            return "Improve Platform Usability & Performance"
+            return self.DEFAULT_CATEGORY, self.spread_probabilities(self.DEFAULT_CATEGORY, 0.0), self.STATUS_OK
         
-        prompt = f"""Categorize this customer feedback into exactly one of these three categories:
-
-1. Win Enterprise Deals
-2. Ensure Regulatory & Data Compliance  
-3. Improve Platform Usability & Performance
-
-Feedback: "{feedback_text}"
-
-Respond with only the category name, nothing else:"""
-
+        model = model or self.MODEL
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a business analyst specializing in product feedback categorization."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=50,
-                    temperature=0.1
+                response = self._create_completion(
+                    'categorize',
+                    messages=self._build_messages(CATEGORIZE_SYSTEM_PROMPT, feedback_text, language),
+                    max_tokens=self.TASK_MAX_TOKENS['categorize'],
+                    model=model,
+                    top_logprobs=CATEGORY_TOP_LOGPROBS
                 )
                 
-                category = response.choices[0].message.content.strip()
-                
-                if category in self.STRATEGIC_CATEGORIES:
-                    return category
-                else:
-                    # Try to match partial strings (in case of formatting issues)
-                    for valid_cat in self.STRATEGIC_CATEGORIES:
-                        if valid_cat.lower() in category.lower() or category.lower() in valid_cat.lower():
-                            return valid_cat
-                    
-                    # If no match found, return default
-                    return "Improve Platform Usability & Performance"
-                    
+                choice = response.choices[0]
+                return self._parse_category(choice.message.content or '', self._top_logprobs(choice)) + (self.STATUS_OK,)
+            
+            except CircuitOpenError:
+                return self._fallback_category(feedback_text) + (self.STATUS_FALLBACK,)
+            
             except Exception as e:
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    self.metrics.retries.inc(model=model, task='categorize')
+                    self._retry_backoff(attempt)
                     continue
                 else:
-                    st.error(f"Error categorizing feedback: {str(e)}")
-                    return "Improve Platform Usability & Performance"
+                    self.metrics.failures.inc(model=model, task='categorize')
+                    (reporter or self.reporter).error(f"Error categorizing feedback: {str(e)}")
+                    return self._fallback_category(feedback_text) + (self.STATUS_FAILED,)
+    
+    @staticmethod
+    def _top_logprobs(choice) -> Optional[List[Tuple[str, float]]]:
+        # (token, logprob) alternatives for the first reply token, if returned
+        logprobs = getattr(choice, 'logprobs', None)
+        content = getattr(logprobs, 'content', None) if logprobs is not None else None
+        if not content:
+            return None
+        return [(alternative.token, alternative.logprob) for alternative in content[0].top_logprobs or []]
+    
+    def _parse_category(self, reply: str,
+                        top_logprobs: Optional[List[Tuple[str, float]]] = None) -> Tuple[str, Tuple[float, ...]]:
+        """(category, probabilities) from a reply and its first-token logprobs"""
+        if top_logprobs:
+            mass = [0.0] * len(CATEGORY_LABELS)
+            for token, logprob in top_logprobs:
+                label = token.strip(' ."\'').upper()
+                if label in CATEGORY_LABELS:
+                    mass[CATEGORY_LABELS.index(label)] += math.exp(logprob)
+            total = sum(mass)
+            if total > 0:
+                probabilities = tuple(m / total for m in mass)
+                return self.STRATEGIC_CATEGORIES[probabilities.index(max(probabilities))], probabilities
+        category, confidence = self._match_category(reply.strip())
+        return category, self.spread_probabilities(category, confidence)
+    
+    def spread_probabilities(self, category: Optional[str], confidence: float) -> Tuple[float, ...]:
+        """``confidence`` on ``category``, the rest shared evenly by the others"""
+        n = len(self.STRATEGIC_CATEGORIES)
+        if category not in self.STRATEGIC_CATEGORIES:
+            return (1.0 / n,) * n
+        top = max(confidence, 1.0 / n)
+        rest = (1.0 - top) / (n - 1)
+        return tuple(top if c == category else rest for c in self.STRATEGIC_CATEGORIES)
+    
+    def _match_category(self, category: str) -> Tuple[str, float]:
+        # Confidence reflects how cleanly the reply names a category: a
+        # label letter or exact name, one category mentioned in a longer
+        # reply, a partial match, or none
+        label = category.strip(' ."\'').upper()
+        if label in CATEGORY_LABELS:
+            return self.STRATEGIC_CATEGORIES[CATEGORY_LABELS.index(label)], 1.0
+        normalized = category.strip(' ."\'').lower()
+        for valid_cat in self.STRATEGIC_CATEGORIES:
+            if normalized == valid_cat.lower():
+                return valid_cat, 1.0
+        
+        mentioned = [c for c in self.STRATEGIC_CATEGORIES if c.lower() in category.lower()]
+        if len(mentioned) == 1:
+            return mentioned[0], 0.75
+        
+        # Try to match partial strings (in case of formatting issues)
+        for valid_cat in self.STRATEGIC_CATEGORIES:
+            if normalized and (valid_cat.lower() in category.lower() or category.lower() in valid_cat.lower()):
+                return valid_cat, 0.5
+        
+        # If no match found, return default
+        return self.DEFAULT_CATEGORY, 0.0
+    
+    @timed()
+    def generate_summary(self, feedback_text: str, max_retries: int = 3,
+                         reporter: Optional[Reporter] = None, model: Optional[str] = None,
+                         language: Optional[str] = None) -> str:
+        feedback_text = self.redactor.redact_text(feedback_text)
+        return self._summarize(feedback_text, max_retries, reporter, model, language)[0]
     
-    def generate_summary(self, feedback_text: str, max_retries: int = 3) -> str:
+    def _summarize(self, feedback_text: str, max_retries: int = 3, reporter: Optional[Reporter] = None,
+                   model: Optional[str] = None, language: Optional[str] = None) -> Tuple[str, str]:
+        """(summary, status)"""
         if not self.client:
             # Return a default summary when API is not configured
             # This should not be called when using sample data, but just in case
-            return "Summary not available - API not configured"
+            return "Summary not available - API not configured", self.STATUS_OK
         
-        prompt = f"""
-You are an AI assistant helping Product Managers quickly understand customer feedback. 
-
-Your task: Create a concise, one-sentence executive summary that captures the core problem or request.
-
-Requirements:
-- Maximum 25 words
-- Focus on the specific issue or need, not generic descriptions
-- Use business-friendly language suitable for executive dashboards
-- Highlight the impact or urgency if mentioned
-- Be specific about what the customer needs or what's broken
-
-Feedback: "{feedback_text}"
-
-Executive Summary:"""
-
+        model = model or self.MODEL
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a product management assistant specializing in concise business communication."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=60,
-                    temperature=0.1
+                response = self._create_completion(
+                    'summarize',
+                    messages=self._build_messages(SUMMARIZE_SYSTEM_PROMPT, feedback_text, language),
+                    max_tokens=self.TASK_MAX_TOKENS['summarize'],
+                    model=model
                 )
                 
                 summary = response.choices[0].message.content.strip()
-                return summary
-                
+                return summary, self.STATUS_OK
+            
+            except CircuitOpenError:
+                return self._fallback_summary(feedback_text), self.STATUS_FALLBACK
+            
             except Exception as e:
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    self.metrics.retries.inc(model=model, task='summarize')
+                    self._retry_backoff(attempt)
                     continue
                 else:
-                    st.error(f"Error generating summary: {str(e)}")
-                    return "Unable to generate summary"
+                    self.metrics.failures.inc(model=model, task='summarize')
+                    (reporter or self.reporter).error(f"Error generating summary: {str(e)}")
+                    return self._fallback_summary(feedback_text), self.STATUS_FAILED
     
-    def process_batch(self, df: pd.DataFrame, show_progress: bool = True) -> pd.DataFrame:
-        if not self.client:
-            st.info("OpenAI API not configured. Using sample AI data for demonstration.")
-            
-            # Show progress bar even for sample data
-            if show_progress:
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                status_text.text('Generating sample AI categorization...')
-                progress_bar.progress(0.5)
-            
-            result = self._add_sample_ai_data(df)
-            
-            if show_progress:
-                progress_bar.progress(1.0)
-                status_text.text('Sample AI processing complete!')
-                time.sleep(0.5)  # Brief pause to show completion
-            
-            return result
+    @timed()
+    def refine_sentiment(self, df: pd.DataFrame, max_texts: Optional[int] = None, max_workers: int = 1,
+                         show_progress: bool = True, reporter: Optional[Reporter] = None) -> pd.DataFrame:
+        """Ask the model for Sentiment and Urgency where the lexicon found neither.
+        
+        Each distinct text is sent once, up to ``max_texts`` of them. Rows
+        whose request fails keep the lexicon's zeros.
+        """
+        reporter = reporter if reporter is not None else self.reporter
+        unscored = unscored_rows(df)
+        if not self.client or not unscored.any():
+            return df
+        languages = self.row_languages(df)
+        # text -> language; the lexicon is English, so other languages are often unscored
+        texts = dict(zip(df.loc[unscored, 'Feedback'].tolist(),
+                         np.asarray(languages, dtype=object)[unscored] if languages is not None
+                         else [None] * int(unscored.sum())))
+        texts = dict(list(texts.items())[:max_texts])
+        ratings = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(self._rate_sentiment, text, reporter=reporter, language=language): text
+                       for text, language in texts.items()}
+            for completed, future in enumerate(as_completed(futures), start=1):
+                if show_progress:
+                    reporter.progress(completed / len(texts), f'Rated sentiment of {completed} of {len(texts)} texts...')
+                rating = future.result()
+                if rating is not None:
+                    ratings[futures[future]] = rating
+        if show_progress:
+            reporter.progress_done('Sentiment refinement complete!')
+        
+        sentiment = df[SENTIMENT_COLUMN].to_numpy(dtype=np.float32, copy=True)
+        urgency = df[URGENCY_COLUMN].to_numpy(dtype=np.float32, copy=True)
+        refined = 0
+        for position, text in zip(np.flatnonzero(unscored), df['Feedback'].to_numpy()[unscored]):
+            rating = ratings.get(text)
+            if rating is not None:
+                sentiment[position], urgency[position] = rating
+                refined += 1
+        reporter.info(f"Model rated sentiment and urgency for {refined} rows the lexicon had no terms for.")
+        return df.assign(**{SENTIMENT_COLUMN: sentiment, URGENCY_COLUMN: urgency})
+    
+    def _rate_sentiment(self, feedback_text: str, max_retries: int = 3, reporter: Optional[Reporter] = None,
+                        language: Optional[str] = None) -> Optional[Tuple[np.float32, np.float32]]:
+        """(Sentiment, Urgency) from the model, or None if it failed or gave no ratings"""
+        for attempt in range(max_retries):
+            try:
+                response = self._create_completion(
+                    'sentiment',
+                    messages=self._build_messages(SENTIMENT_SYSTEM_PROMPT, feedback_text, language),
+                    max_tokens=self.TASK_MAX_TOKENS['sentiment']
+                )
+            except CircuitOpenError:
+                return None
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    self.metrics.retries.inc(model=self.MODEL, task='sentiment')
+                    self._retry_backoff(attempt)
+                    continue
+                self.metrics.failures.inc(model=self.MODEL, task='sentiment')
+                (reporter or self.reporter).error(f"Error rating sentiment: {str(e)}")
+                return None
+            match = _RATINGS.search(response.choices[0].message.content or '')
+            return from_ratings(int(match.group(1)), int(match.group(2))) if match else None
+    
+    def _retry_backoff(self, attempt: int):
+        # Once the breaker has opened the next attempt fails fast to the
+        # fallback, so there is nothing to wait for
+        if self.circuit_breaker.state == CLOSED:
+            time.sleep(self.RETRY_BACKOFF_BASE * 2 ** attempt)
+    
+    def _fallback_category(self, feedback_text: str) -> Tuple[str, Tuple[float, ...]]:
+        category, confidence = self.fallback_classifier.predict(feedback_text)
+        return category or self.DEFAULT_CATEGORY, self.spread_probabilities(category, confidence)
+    
+    def _fallback_summary(self, feedback_text: str) -> str:
+        # First sentence of the compacted feedback, within a short token budget
+        text = compact_feedback(feedback_text, self.FALLBACK_SUMMARY_TOKENS)
+        if not isinstance(text, str):
+            return ''
+        return _SENTENCE_END.split(text.strip(), 1)[0]
+    
+    def _build_messages(self, system_prompt: str, feedback_text: str,
+                        language: Optional[str] = None) -> List[dict]:
+        feedback_text = compact_feedback(feedback_text, self.max_feedback_tokens)
+        if language not in (None, DEFAULT_LANGUAGE):
+            # Appended, so each language keeps its own cacheable prefix and
+            # English prompts stay byte-identical
+            system_prompt = (f"{system_prompt}\nThe feedback is written in {language_name(language)}. "
+                             "Answer in English.")
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f'Feedback: "{feedback_text}"'}
+        ]
+    
+    def request_body(self, task: str, feedback_text: str, model: Optional[str] = None,
+                     language: Optional[str] = None) -> dict:
+        """Chat-completion request for 'categorize' or 'summarize', as _create_completion sends it"""
+        system_prompt = CATEGORIZE_SYSTEM_PROMPT if task == 'categorize' else SUMMARIZE_SYSTEM_PROMPT
+        body = {
+            'model': model or self.MODEL,
+            'messages': self._build_messages(system_prompt, feedback_text, language),
+            'max_tokens': self.TASK_MAX_TOKENS[task],
+            'temperature': 0.1,
+        }
+        if task == 'categorize':
+            body.update(logprobs=True, top_logprobs=CATEGORY_TOP_LOGPROBS)
+        return body
+    
+    def result_from_replies(self, feedback_text: str, category_reply: Optional[str], summary_reply: Optional[str],
+                            top_logprobs: Optional[List[Tuple[str, float]]] = None
+                            ) -> Tuple[str, str, str, Tuple[float, ...]]:
+        """(AI_Category, AI_Summary, AI_Status, probabilities) from raw model replies obtained elsewhere.
+        
+        A reply of None means that request failed; its value is estimated
+        locally and the row is marked 'failed'. ``top_logprobs`` are the
+        (token, logprob) alternatives of the category reply's first token.
+        """
+        if category_reply is None or summary_reply is None:
+            status = self.STATUS_FAILED
+        else:
+            status = self.STATUS_OK
+        if category_reply is not None:
+            category, probabilities = self._parse_category(category_reply, top_logprobs)
+        else:
+            category, probabilities = self._fallback_category(feedback_text)
+        summary = summary_reply.strip() if summary_reply is not None else self._fallback_summary(feedback_text)
+        return category, summary, status, probabilities
+    
+    def result_from_cache(self, cached: CacheEntry) -> RowResult:
+        # Entries cached before probabilities were stored count as certain
+        category, summary, probabilities = cached
+        return category, summary, self.STATUS_OK, probabilities or self.spread_probabilities(category, 1.0)
+    
+    def _create_completion(self, task: str, messages: List[dict], max_tokens: int,
+                           model: Optional[str] = None, top_logprobs: Optional[int] = None):
+        model = model or self.MODEL
+        breaker = self.circuit_breaker
+        if not breaker.allow_request():
+            self.metrics.short_circuited.inc(model=model, task=task)
+            raise CircuitOpenError(f"{breaker.failure_threshold} consecutive OpenAI API failures")
+        self.metrics.in_flight.inc(model=model)
+        start = time.perf_counter()
+        try:
+            logprob_args = {'logprobs': True, 'top_logprobs': top_logprobs} if top_logprobs else {}
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                **logprob_args
+            )
+        except Exception as e:
+            outcome = 'rate_limited' if getattr(e, 'status_code', None) == 429 else 'error'
+            self.metrics.requests.inc(model=model, task=task, outcome=outcome)
+            breaker.record_failure()
+            self.metrics.circuit_state.set(STATE_CODES[breaker.state])
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.in_flight.dec(model=model)
+            self.metrics.latency.observe(elapsed, model=model, task=task)
+        
+        self.metrics.requests.inc(model=model, task=task, outcome='success')
+        breaker.record_success()
+        self.metrics.circuit_state.set(STATE_CODES[breaker.state])
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = (usage.prompt_tokens or 0) if usage is not None else 0
+        completion_tokens = (usage.completion_tokens or 0) if usage is not None else 0
+        if usage is not None:
+            self.metrics.observe_usage(model, task, prompt_tokens, completion_tokens)
+        if self.router is not None:
+            self.router.observe_call(model, elapsed, prompt_tokens, completion_tokens)
+        return response
+    
+    @timed()
+    def process_batch(self, df: pd.DataFrame, show_progress: bool = True,
+                      max_workers: int = 1, request_interval: float = 0.5,
+                      progress_callback: Optional[ProgressCallback] = None,
+                      reporter: Optional[Reporter] = None,
+                      use_sample_data: bool = False) -> pd.DataFrame:
+        # A per-call reporter lets one long-lived analyzer serve many sessions
+        reporter = reporter if reporter is not None else self.reporter
+        if progress_callback is not None:
+            reporter = CallbackReporter(progress_callback, base=reporter)
+        
+        if use_sample_data or not self.client:
+            return self._process_sample(df, show_progress, reporter)
         
         df_copy = df.copy()
-        total_rows = len(df_copy)
+        results: List[Optional[RowResult]] = [None] * len(df_copy)
+        for position, result in self._iter_row_results(df_copy['Feedback'].tolist(), show_progress,
+                                                        max_workers, request_interval, reporter,
+                                                        self._row_severities(df_copy),
+                                                        self.row_languages(df_copy)):
+            results[position] = result
+        
+        self.assign_results(df_copy, results)
+        return df_copy
+    
+    @classmethod
+    def assign_results(cls, df: pd.DataFrame, results: List[RowResult]):
+        """Write row results into the AI columns of ``df`` (in place)"""
+        df['AI_Category'] = [r[0] for r in results]
+        df['AI_Summary'] = [r[1] for r in results]
+        df['AI_Status'] = [r[2] for r in results]
+        probabilities = np.array([r[3] for r in results], dtype=np.float32).reshape(len(results), len(cls.PROBABILITY_COLUMNS))
+        for column, values in zip(cls.PROBABILITY_COLUMNS, probabilities.T):
+            df[column] = values
+        df[cls.CONFIDENCE_COLUMN] = probabilities.max(axis=1, initial=0.0)
+    
+    def iter_batch(self, df: pd.DataFrame, chunk_size: Optional[int] = None,
+                   flush_seconds: Optional[float] = None, show_progress: bool = True, max_workers: int = 1, request_interval: float = 0.5,
+                   progress_callback: Optional[ProgressCallback] = None,
+                   reporter: Optional[Reporter] = None,
+                   use_sample_data: bool = False) -> Iterator[pd.DataFrame]:
+        """Like process_batch, but yield completed rows as they finish.
         
+        Each chunk holds up to ``chunk_size`` rows of ``df`` (original index
+        kept) with AI_Category, AI_Summary and AI_Status filled in, in
+        completion order.
+        A partial chunk is flushed after ``flush_seconds`` so the first
+        results arrive quickly even with slow, sequential requests.
+        Closing the generator early cancels rows that haven't started.
+        """
+        reporter = reporter if reporter is not None else self.reporter
+        if progress_callback is not None:
+            reporter = CallbackReporter(progress_callback, base=reporter)
+        
+        if use_sample_data or not self.client:
+            yield self._process_sample(df, show_progress, reporter)
+            return
+        
+        chunk_size = chunk_size or self.STREAM_CHUNK_ROWS
+        flush_seconds = flush_seconds if flush_seconds is not None else self.STREAM_FLUSH_SECONDS
+        positions: List[int] = []
+        results: List[RowResult] = []
+        last_flush = time.perf_counter()
+        for position, result in self._iter_row_results(df['Feedback'].tolist(), show_progress,
+                                                        max_workers, request_interval, reporter,
+                                                        self._row_severities(df), self.row_languages(df)):
+            positions.append(position)
+            results.append(result)
+            if len(positions) >= chunk_size or time.perf_counter() - last_flush >= flush_seconds:
+                yield self._result_chunk(df, positions, results)
+                positions, results = [], []
+                last_flush = time.perf_counter()
+        if positions:
+            yield self._result_chunk(df, positions, results)
+    
+    @classmethod
+    def _result_chunk(cls, df: pd.DataFrame, positions: List[int], results: List[RowResult]) -> pd.DataFrame:
+        chunk = df.iloc[positions].copy()
+        cls.assign_results(chunk, results)
+        return chunk
+    
+    def _row_severities(self, df: pd.DataFrame) -> Optional[List[str]]:
+        # Only routing looks at severity (Critical rows go to the largest tier)
+        if self.router is None or 'Severity' not in df.columns:
+            return None
+        return df['Severity'].astype(object).tolist()
+    
+    @staticmethod
+    def row_languages(df: pd.DataFrame) -> Optional[List[Optional[str]]]:
+        # None for English, which keeps the plain prompts and cache keys
+        if LANGUAGE_COLUMN not in df.columns:
+            return None
+        languages = df[LANGUAGE_COLUMN].astype(object)
+        if (languages == DEFAULT_LANGUAGE).all():
+            return None
+        return languages.where(languages != DEFAULT_LANGUAGE, None).tolist()
+    
+    def _process_sample(self, df: pd.DataFrame, show_progress: bool, reporter: Reporter) -> pd.DataFrame:
+        reporter.info("OpenAI API not configured. Using sample AI data for demonstration.")
+        
+        # Show progress bar even for sample data
         if show_progress:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            reporter.progress(0.5, 'Generating sample AI categorization...')
         
-        ai_categories = []
-        ai_summaries = []
+        result = self._add_sample_ai_data(df)
+        result['AI_Status'] = self.STATUS_SAMPLE
+        self._add_sample_probabilities(result)
         
-        for idx, row in df_copy.iterrows():
-            if show_progress:
-                progress = (idx + 1) / total_rows
-                progress_bar.progress(progress)
-                status_text.text(f'Processing feedback {idx + 1} of {total_rows}...')
-            
-            category = self.categorize_feedback(row['Feedback'])
-            summary = self.generate_summary(row['Feedback'])
-            
-            ai_categories.append(category)
-            ai_summaries.append(summary)
-            
-            time.sleep(0.5)
+        if show_progress:
+            reporter.progress_done('Sample AI processing complete!')
+        
+        return result
+    
+    def _iter_row_results(self, feedback_texts: List[str], show_progress: bool, max_workers: int,
+                          request_interval: float, reporter: Reporter,
+                          severities: Optional[List[str]] = None,
+                          languages: Optional[List[Optional[str]]] = None) -> Iterator[Tuple[int, RowResult]]:
+        """Yield (position, (category, summary, status, probabilities)) as each row completes"""
+        total_rows = len(feedback_texts)
+        if severities is None:
+            severities = [None] * total_rows
+        if languages is None:
+            languages = [None] * total_rows
+            order = range(total_rows)
+        else:
+            # One language at a time, so consecutive requests share a prompt prefix
+            order = sorted(range(total_rows), key=lambda i: languages[i] or '')
+        degraded_rows = 0
         
-        df_copy['AI_Category'] = ai_categories
-        df_copy['AI_Summary'] = ai_summaries
+        try:
+            if max_workers <= 1:
+                for done, i in enumerate(order, start=1):
+                    if show_progress:
+                        reporter.progress(done / total_rows, f'Processing feedback {done} of {total_rows}...')
+                    result = self._analyze_row(feedback_texts[i], request_interval, reporter, severities[i],
+                                               languages[i])
+                    degraded_rows += result[2] in self.REPROCESS_STATUSES
+                    yield i, result
+            else:
+                # Rows are independent, so fan out and let the caller restore input order
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                try:
+                    futures = {executor.submit(self._analyze_row, feedback_texts[i], request_interval, reporter,
+                                               severities[i], languages[i]): i
+                               for i in order}
+                    for completed, future in enumerate(as_completed(futures), start=1):
+                        if show_progress:
+                            reporter.progress(completed / total_rows, f'Processed {completed} of {total_rows} feedback items...')
+                        result = future.result()
+                        degraded_rows += result[2] in self.REPROCESS_STATUSES
+                        yield futures[future], result
+                finally:
+                    # Also runs when a streaming consumer stops early
+                    executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            # Keep whatever was analyzed, even from an abandoned stream
+            if self.cache is not None:
+                self.cache.save()
         
         if show_progress:
-            progress_bar.progress(1.0)
-            status_text.text('AI processing complete!')
+            reporter.progress_done('AI processing complete!')
+        if degraded_rows:
+            reporter.warning(f"{degraded_rows} of {total_rows} rows could not be analyzed by the OpenAI API and "
+                             f"hold local estimates. They are marked in AI_Status for re-processing.")
+    
+    def analyze_row(self, feedback_text: str, severity: Optional[str] = None,
+                    reporter: Optional[Reporter] = None, language: Optional[str] = None) -> RowResult:
+        """(AI_Category, AI_Summary, AI_Status, probabilities) for one feedback text"""
+        return self._analyze_row(feedback_text, 0.0, reporter, severity, language)
+    
+    def _row_status(self, *statuses: str) -> str:
+        for status in (self.STATUS_FAILED, self.STATUS_FALLBACK):
+            if status in statuses:
+                return status
+        return self.STATUS_OK
+    
+    def _analyze_row(self, feedback_text: str, request_interval: float = 0.0,
+                     reporter: Optional[Reporter] = None, severity: Optional[str] = None,
+                     language: Optional[str] = None) -> RowResult:
+        if language == DEFAULT_LANGUAGE:
+            language = None
+        if self.cache is not None:
+            cached = self.cache.get(feedback_text, language)
+            if cached is not None:
+                return self.result_from_cache(cached)
         
-        return df_copy
+        if self.router is None:
+            category, probabilities, category_status = self._categorize(feedback_text, reporter=reporter,
+                                                                        language=language)
+            summary, summary_status = self._summarize(feedback_text, reporter=reporter, language=language)
+            status = self._row_status(category_status, summary_status)
+        else:
+            category, summary, status, probabilities = self._analyze_routed(feedback_text, severity, reporter,
+                                                                            language)
+        
+        if status != self.STATUS_OK:
+            # Local estimates are not cached, so a later run asks the API again
+            return category, summary, status, probabilities
+        
+        if self.cache is not None:
+            self.cache.put(feedback_text, category, summary, probabilities, language)
+        
+        # Simple client-side rate limiting between API calls
+        if request_interval > 0:
+            time.sleep(request_interval)
+        
+        return category, summary, status, probabilities
+    
+    @timed()
+    def _analyze_routed(self, feedback_text: str, severity: Optional[str],
+                        reporter: Optional[Reporter] = None, language: Optional[str] = None) -> RowResult:
+        """Categorize on the cheapest confident tier, then summarize to match"""
+        router = self.router
+        category, confidence, status = None, 0.0, self.STATUS_OK
+        tiers = router.tiers_for(severity)
+        if language is not None:
+            # The keyword classifier only knows English terms
+            tiers = [tier for tier in tiers if tier != LOCAL_TIER]
+        for tier in tiers:
+            if tier == LOCAL_TIER:
+                start = time.perf_counter()
+                category, confidence = router.classifier.predict(feedback_text)
+                elapsed = time.perf_counter() - start
+                router.observe_call(LOCAL_TIER, elapsed)
+                self.metrics.latency.observe(elapsed, model=LOCAL_TIER, task='categorize')
+                probabilities = self.spread_probabilities(category, confidence)
+            else:
+                category, probabilities, status = self._categorize(feedback_text, reporter=reporter,
+                                                                   model=router.models[tier], language=language)
+                # Top-label probability, so escalation follows the model's own uncertainty
+                confidence = max(probabilities)
+            if confidence >= router.confidence_threshold or status == self.STATUS_FALLBACK:
+                # An open circuit breaker fails every model tier alike
+                break
+        
+        if status != self.STATUS_OK:
+            reason = status
+        elif severity == 'Critical':
+            reason = 'critical'
+        else:
+            reason = 'confident' if confidence >= router.confidence_threshold else 'low_confidence'
+        router.observe_row(tier, reason)
+        self.metrics.routed.inc(tier=tier, reason=reason)
+        
+        summary, summary_status = self._summarize(feedback_text, reporter=reporter, model=router.summary_model(tier),
+                                                  language=language)
+        status = self._row_status(status, summary_status)
+        return category or self.DEFAULT_CATEGORY, summary, status, probabilities
     
     def _add_sample_ai_data(self, df: pd.DataFrame) -> pd.DataFrame:
         df_copy = df.copy()
@@ -233,5 +826,21 @@ Executive Summary:"""
         
         return df_copy
     
+    def _add_sample_probabilities(self, df: pd.DataFrame):
+        # Seeded, so the confidence filter has something to show in the demo
+        rng = np.random.default_rng(0)
+        n = len(df)
+        top = rng.uniform(0.5, 0.99, n).astype(np.float32)
+        split = rng.uniform(0.0, 1.0, n).astype(np.float32)
+        categories = df['AI_Category'].to_numpy()
+        # The two other categories share the rest as split / 1 - split
+        other_seen = np.zeros(n, dtype=bool)
+        for column, category in zip(self.PROBABILITY_COLUMNS, self.STRATEGIC_CATEGORIES):
+            is_top = categories == category
+            other = (1 - top) * np.where(other_seen, 1 - split, split)
+            df[column] = np.where(is_top, top, other).astype(np.float32)
+            other_seen |= ~is_top
+        df[self.CONFIDENCE_COLUMN] = top
+    
     def is_configured(self) -> bool:
         return self.client is not None
\ No newline at end of file
@@ -1,15 +1,24 @@
+import os
+import time
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from data_processor import DataProcessor
+from language_detection import LANGUAGE_COLUMN, language_name
 from ai_analyzer import AIAnalyzer
-from styles import inject_robinhood_css, RobinhoodColors
+from metrics import start_metrics_server
+from reporters import LoggingReporter, StreamlitReporter
+from reprocessing import ReprocessingQueue
+from rollups import FREQUENCIES
+import instrumentation
+from instrumentation import timed
+from styles import inject_robinhood_css, minify_html, RobinhoodColors
 from components import (
     render_robinhood_header, render_metric_card, create_robinhood_donut_chart,
     create_robinhood_bar_chart, create_opportunity_trend_chart, render_sidebar_header,
     render_chart_container, render_loading_spinner, create_metrics_overview_section,
-    style_dataframe_robinhood, render_sidebar_info_card
+    style_dataframe_robinhood, render_sidebar_info_card, render_performance_panel,
+    create_time_trend_chart, create_point_chart, TABLE_PAGE_ROWS
 )
 
 st.set_page_config(
@@ -22,6 +31,20 @@ st.set_page_config(
 # Inject Robinhood-inspired CSS styling
 inject_robinhood_css()
 
+@st.cache_resource
+def get_ai_analyzer():
+    # One analyzer (and OpenAI connection pool) for all sessions and reruns.
+    # Per-run UI output goes through the reporter passed to process_batch.
+    return AIAnalyzer(reporter=LoggingReporter())
+
+@st.cache_resource
+def start_metrics_endpoint(port):
+    # Once per server process; all sessions share the default registry
+    return start_metrics_server(port)
+
+if os.getenv('FEEDBACK_METRICS_PORT'):
+    start_metrics_endpoint(int(os.environ['FEEDBACK_METRICS_PORT']))
+
 def initialize_session_state():
     if 'data' not in st.session_state:
         st.session_state.data = None
@@ -29,6 +52,15 @@ def initialize_session_state():
         st.session_state.processed_data = None
     if 'ai_processed' not in st.session_state:
         st.session_state.ai_processed = False
+    if 'rollups' not in st.session_state:
+        st.session_state.rollups = None
+    if 'data_version' not in st.session_state:
+        # Bumped whenever processed_data is replaced; keys per-dataset caches
+        st.session_state.data_version = 0
+    if 'reprocess_queue' not in st.session_state:
+        # Background retries of rows whose AI analysis fell back or failed
+        st.session_state.reprocess_queue = None
+        st.session_state.reprocess_summary = None
     
     # Enhanced sidebar with info cards and styling
     with st.sidebar:
@@ -44,10 +76,15 @@ def initialize_session_state():
         if st.button("🔄 Reset All Data", help="Clear all cached data and start fresh"):
             st.session_state.data = None
             st.session_state.processed_data = None
+            st.session_state.rollups = None
             st.session_state.ai_processed = False
+            stop_reprocessing()
+            # Pick up API key changes on the next run
+            get_ai_analyzer.clear()
             st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
 
+@timed('app.load_data')
 def load_data():
     data_processor = DataProcessor()
     
@@ -56,16 +93,29 @@ def load_data():
     use_sample_data = st.sidebar.checkbox("Use Sample Data", value=True)
     
     if use_sample_data:
+        sample_size = st.sidebar.selectbox(
+            "Sample Size",
+            options=[10, 10_000, 100_000, 1_000_000],
+            format_func=lambda n: "10 (curated examples)" if n == 10 else f"{n:,} (synthetic)",
+            help="Synthetic datasets are generated with realistic distributions for load testing"
+        )
+        
         if st.sidebar.button("Load Sample Data"):
             with st.spinner("Loading sample data..."):
                 # Clear ALL session state to ensure fresh start
                 st.session_state.data = None
                 st.session_state.processed_data = None
+                st.session_state.rollups = None
                 st.session_state.ai_processed = False
+                stop_reprocessing()
                 
-                df = data_processor.create_sample_data()
+                if sample_size == 10:
+                    df = data_processor.create_sample_data()
+                else:
+                    df = data_processor.create_synthetic_data(sample_size)
                 st.session_state.data = df
                 st.success(f"✅ Sample data loaded! {len(df)} rows ready for analysis")
+                show_redaction_notice(data_processor)
                 st.info("👉 Click 'Process with AI' to categorize feedback")
                 
                 # Add data overview in sidebar
@@ -88,11 +138,21 @@ def load_data():
             with st.spinner("Processing uploaded file..."):
                 df = data_processor.load_uploaded_file(uploaded_file)
                 if not df.empty:
-                    df = data_processor.calculate_opportunity_score(df)
+                    df = data_processor.detect_language(df)
+                    df = data_processor.calculate_opportunity_score(data_processor.analyze_sentiment(df))
                     st.session_state.data = df
+                    st.session_state.rollups = None
                     st.session_state.ai_processed = False
+                    stop_reprocessing()
                     st.success(f"✅ Loaded {len(df)} feedback items successfully!")
+                    show_redaction_notice(data_processor)
+
+def show_redaction_notice(data_processor):
+    report = data_processor.redaction_report
+    if report is not None and report.total:
+        st.info(f"🔒 Redacted {report.total} personal details before analysis ({report.summary()})")
 
+@timed('app.process_with_ai')
 def process_with_ai():
     if st.session_state.data is None:
         st.warning("⚠️ Please load data first.")
@@ -105,11 +165,9 @@ def process_with_ai():
     use_sample_ai = st.checkbox("Force use sample AI data (ignore API)", value=False, 
                                  help="Check this to use pre-defined sample AI categorization instead of calling OpenAI API")
     
-    ai_analyzer = AIAnalyzer()
+    ai_analyzer = get_ai_analyzer()
     
-    # Override client if user wants to force sample data
     if use_sample_ai:
-        ai_analyzer.client = None
         st.info("🔧 Using sample AI data as requested.")
     elif not ai_analyzer.is_configured():
         st.warning("⚙️ OpenAI API not configured. Using sample AI data.")
@@ -122,11 +180,52 @@ def process_with_ai():
         
         # Clear old processed data
         st.session_state.processed_data = None
+        st.session_state.rollups = None
+        stop_reprocessing()
         
-        processed_df = ai_analyzer.process_batch(st.session_state.data)
+        # Show the dashboard on the rows analyzed so far while the rest run.
+        # New chunks are appended to the running frame only when redrawing,
+        # and redraws are throttled, so copying and rendering stay linear
+        data = st.session_state.data
+        live_view = st.empty()
+        received = None
+        pending = []
+        pending_rows = 0
+        redraws = 0
+        last_redraw = 0.0
+        for chunk in ai_analyzer.iter_batch(data, reporter=StreamlitReporter(), use_sample_data=use_sample_ai):
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            drawn_rows = 0 if received is None else len(received)
+            if (drawn_rows + pending_rows < len(data)
+                    and pending_rows >= drawn_rows * (LIVE_REDRAW_GROWTH - 1)
+                    and time.perf_counter() - last_redraw >= LIVE_REDRAW_SECONDS):
+                received = pd.concat(([received] if received is not None else []) + pending)
+                pending, pending_rows = [], 0
+                redraws += 1
+                with live_view.container():
+                    render_partial_results(received, len(data), redraws)
+                last_redraw = time.perf_counter()
+        live_view.empty()
+        
+        if received is not None:
+            pending.insert(0, received)
+        processed_df = pd.concat(pending).loc[data.index] if len(pending) > 1 else pending[0]
+        data_processor = DataProcessor()
+        if data_processor.scoring.uses_column('AI_Category'):
+            processed_df = data_processor.calculate_opportunity_score(processed_df)
         st.session_state.processed_data = processed_df
+        st.session_state.data_version += 1
+        # Built once per processed dataset; trend charts never scan the rows
+        st.session_state.rollups = data_processor.create_rollups(processed_df)
         st.session_state.ai_processed = True
         
+        if not use_sample_ai and ai_analyzer.is_configured():
+            # Retry rows left with local estimates without re-running the batch
+            queue = ReprocessingQueue(ai_analyzer)
+            if queue.enqueue(processed_df):
+                st.session_state.reprocess_queue = queue
+        
         progress_container.empty()
         
         # Show completion message with category breakdown
@@ -146,6 +245,59 @@ def process_with_ai():
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def stop_reprocessing():
+    queue = st.session_state.get('reprocess_queue')
+    if queue is not None:
+        queue.stop()
+    st.session_state.reprocess_queue = None
+    st.session_state.reprocess_summary = None
+
+REPROCESS_POLL_SECONDS = 5
+
+@st.fragment(run_every=REPROCESS_POLL_SECONDS)
+def display_reprocessing_status():
+    queue = st.session_state.reprocess_queue
+    if queue is None:
+        return
+    # Stats before draining: once nothing is pending, every result is in the drain
+    stats = queue.to_dict()
+    updates = queue.drain()
+    if not updates.empty:
+        data_processor = DataProcessor()
+        st.session_state.processed_data, st.session_state.rollups = data_processor.apply_ai_updates(
+            st.session_state.processed_data, updates, st.session_state.rollups)
+        st.session_state.data_version += 1
+    if stats['pending'] == 0:
+        st.session_state.reprocess_queue = None
+        st.session_state.reprocess_summary = stats
+    if not updates.empty or stats['pending'] == 0:
+        # Full rerun so the KPIs, charts and table pick up the updated rows
+        st.rerun()
+    st.caption(f"🔁 Re-processing {stats['pending']:,} rows that hold local AI estimates in the background "
+               f"({stats['completed']:,} updated so far)")
+
+STREAM_PREVIEW_ROWS = 100
+# Live results redraw once the rows received have grown by half since the
+# last redraw, and at most once per LIVE_REDRAW_SECONDS
+LIVE_REDRAW_GROWTH = 1.5
+LIVE_REDRAW_SECONDS = 1.0
+
+@timed('app.render_partial_results')
+def render_partial_results(df, total_rows, update):
+    st.caption(f"⏳ Live results: {len(df):,} of {total_rows:,} feedback items analyzed")
+    display_metrics(df)
+    create_visualizations(df, key_prefix=f"live_{update}")
+    
+    # Highest-opportunity rows so far; the full styled table appears when done
+    preview_columns = [col for col in ['Feedback', 'AI_Category', 'AI_Summary', 'Product',
+                                       'Severity', 'Region', 'Opportunity_Score'] if col in df.columns]
+    if 'Opportunity_Score' in df.columns:
+        preview = df.nlargest(STREAM_PREVIEW_ROWS, 'Opportunity_Score')
+    else:
+        preview = df.head(STREAM_PREVIEW_ROWS)
+    st.dataframe(preview[preview_columns], use_container_width=True, height=300)
+
+@timed('app.create_filters')
 def create_filters():
     if st.session_state.processed_data is None:
         return {}
@@ -194,15 +346,36 @@ def create_filters():
         default=df['Region'].unique() if 'Region' in df.columns else []
     )
     
+    # Only shown for multilingual data; an all-English dataset has nothing to filter
+    languages = []
+    if 'Language' in df.columns and df['Language'].nunique() > 1:
+        language_options = df['Language'].value_counts().index.tolist()
+        languages = st.sidebar.multiselect(
+            "Language",
+            options=language_options,
+            default=language_options,
+            format_func=lambda code: f"{language_name(code)} ({code})"
+        )
+    
+    min_confidence = 0.0
+    if 'AI_Confidence' in df.columns:
+        min_confidence = st.sidebar.slider(
+            "Minimum AI Confidence", min_value=0.0, max_value=1.0, value=0.0, step=0.05,
+            help="Probability the model gave the assigned Strategic Priority"
+        )
+    
     st.sidebar.markdown('</div>', unsafe_allow_html=True)
     
     return {
         'categories': categories,
         'products': products,
         'severities': severities,
-        'regions': regions
+        'regions': regions,
+        'languages': languages,
+        'min_confidence': min_confidence
     }
 
+@timed('app.display_metrics')
 def display_metrics(df):
     data_processor = DataProcessor()
     stats = data_processor.get_summary_stats(df)
@@ -210,7 +383,12 @@ def display_metrics(df):
     # Use the new Robinhood-style metrics overview
     create_metrics_overview_section(stats)
 
-def create_visualizations(df):
+@timed('app.create_visualizations')
+def create_visualizations(df, key_prefix=None):
+    # Live updates redraw the charts several times per run and need unique keys
+    def chart_key(name):
+        return f"{key_prefix}_{name}" if key_prefix else None
+    
     if df.empty:
         st.warning("⚠️ No data to display.")
         return
@@ -228,11 +406,11 @@ def create_visualizations(df):
             'Count',
             'Category'
         )
-        render_chart_container(fig_bar)
+        render_chart_container(fig_bar, key=chart_key('category'))
     
     with col2:
         # Severity Donut Chart
-        severity_counts = df['Severity'].value_counts().reset_index()
+        severity_counts = df['Severity'].value_counts().loc[lambda counts: counts > 0].reset_index()
         severity_counts.columns = ['Severity', 'Count']
         
         fig_donut = create_robinhood_donut_chart(
@@ -241,15 +419,135 @@ def create_visualizations(df):
             'Severity',
             'Count'
         )
-        render_chart_container(fig_donut)
+        render_chart_container(fig_donut, key=chart_key('severity'))
     
     # Add opportunity score trend chart
     if 'Opportunity_Score' in df.columns:
         st.markdown('<div class="section-spacing">', unsafe_allow_html=True)
         trend_fig = create_opportunity_trend_chart(df)
-        render_chart_container(trend_fig, "📈 Opportunity Score Trends")
+        render_chart_container(trend_fig, "📈 Opportunity Score Trends", key=chart_key('trend'))
         st.markdown('</div>', unsafe_allow_html=True)
 
+# Sidebar filter keys -> rollup dimension columns
+TREND_FILTER_COLUMNS = {
+    'categories': 'AI_Category',
+    'products': 'Product',
+    'severities': 'Severity',
+    'regions': 'Region',
+    'languages': LANGUAGE_COLUMN,
+}
+
+TREND_BREAKDOWNS = {
+    'None': None,
+    'Strategic Priority': 'AI_Category',
+    'Product': 'Product',
+    'Severity': 'Severity',
+    'Region': 'Region',
+    'Language': LANGUAGE_COLUMN,
+}
+
+@timed('app.display_trends')
+def display_trends(rollups, filters):
+    # Reads only the precomputed rollups, never the row-level frame
+    st.markdown('<div class="section-spacing">', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        freq = st.radio("Trend interval", list(FREQUENCIES), format_func=FREQUENCIES.get,
+                        horizontal=True, key='trend_freq')
+    with col2:
+        breakdown = st.selectbox("Break down by", list(TREND_BREAKDOWNS), index=1, key='trend_dim')
+    with col3:
+        value = st.radio("Measure", ['count', 'avg_score'], horizontal=True, key='trend_value',
+                         format_func=lambda v: "Count" if v == 'count' else "Avg. Opportunity Score")
+    
+    rollup = rollups[freq]
+    by = TREND_BREAKDOWNS[breakdown]
+    if by is not None and by not in rollup.codes:
+        by = None
+    rollup_filters = {column: filters.get(key) for key, column in TREND_FILTER_COLUMNS.items()}
+    periods, labels, values = rollup.series(by=by, filters=rollup_filters, value=value)
+    if by == LANGUAGE_COLUMN:
+        labels = [language_name(code) for code in labels]
+    
+    fig = create_time_trend_chart(
+        periods, labels, values,
+        f"🗓️ {FREQUENCIES[freq]} Feedback Trends",
+        "Number of Items" if value == 'count' else "Avg. Opportunity Score"
+    )
+    render_chart_container(fig, key='time_trends')
+    if filters.get('min_confidence'):
+        # Rollups are keyed by dimension values only
+        st.caption("Trends include rows at every AI confidence level.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# View name -> x column; y is always the Opportunity Score
+POINT_VIEWS = {
+    'Opportunity Score over time': 'Timestamp',
+    'Opportunity Score vs. Severity': 'Severity_Score',
+}
+
+POINT_DETAIL_ROWS = 200
+
+@timed('app.display_point_explorer')
+def display_point_explorer(df):
+    views = [view for view, column in POINT_VIEWS.items() if column in df.columns]
+    if df.empty or not views or 'Opportunity_Score' not in df.columns:
+        return
+    
+    st.markdown('<div class="section-spacing">', unsafe_allow_html=True)
+    view = st.selectbox("Point explorer", views, key='point_view')
+    x_column = POINT_VIEWS[view]
+    ordered = x_column == 'Timestamp'
+    # Time series are drawn in time order; rows maps chart positions back to df.
+    # Sorting the int64 view is ~4x faster than sorting datetime64 (NaT sorts first)
+    rows = np.argsort(df[x_column].to_numpy().view(np.int64)) if ordered else np.arange(len(df))
+    fig = create_point_chart(
+        df[x_column].to_numpy()[rows],
+        df['Opportunity_Score'].to_numpy()[rows],
+        f"🔎 {view}",
+        x_column.replace('_', ' '),
+        "Opportunity Score",
+        ordered=ordered
+    )
+    event = render_chart_container(fig, key='point_explorer', on_select="rerun")
+    
+    # Row details are looked up only for the points the user selects
+    positions = [point['customdata'] for point in event.selection.points if 'customdata' in point]
+    positions = [p[0] if isinstance(p, list) else p for p in positions]
+    if positions:
+        detail_columns = [col for col in ['Feedback', 'AI_Category', 'Product', 'Severity', 'Region', 'Opportunity_Score']
+                          if col in df.columns]
+        selected = df.iloc[rows[np.asarray(positions[:POINT_DETAIL_ROWS], dtype=np.int64)]]
+        st.dataframe(selected[detail_columns], use_container_width=True, hide_index=True)
+    else:
+        st.caption("Select points (click, box or lasso) to see the feedback behind them.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+REVIEW_PREVIEW_ROWS = 200
+
+@timed('app.display_review_queue')
+def display_review_queue(df):
+    data_processor = DataProcessor()
+    review = data_processor.review_rows(df)
+    if review.empty:
+        return
+    
+    threshold = data_processor.REVIEW_CONFIDENCE_THRESHOLD
+    with st.expander(f"🔍 {len(review):,} rows for review (AI confidence below {threshold:.0%})"):
+        review_columns = [col for col in ['Feedback', 'AI_Category', 'AI_Confidence', *AIAnalyzer.PROBABILITY_COLUMNS,
+                                          'Product', 'Severity'] if col in review.columns]
+        st.dataframe(review[review_columns].head(REVIEW_PREVIEW_ROWS), use_container_width=True, hide_index=True)
+        if len(review) > REVIEW_PREVIEW_ROWS:
+            st.caption(f"Showing the {REVIEW_PREVIEW_ROWS} least confident rows.")
+        st.download_button(
+            label="📄 Download Review List",
+            data=review[review_columns].to_csv(index=False),
+            file_name="feedback_for_review.csv",
+            mime="text/csv",
+            key='download_review'
+        )
+
+@timed('app.display_data_table')
 def display_data_table(df):
     if df.empty:
         st.warning("⚠️ No data matches the current filters.")
@@ -259,15 +557,23 @@ def display_data_table(df):
     st.markdown('<h3 style="color: #111418; font-family: Inter, sans-serif; font-weight: 600; margin-bottom: 1rem;">📋 Detailed Feedback Analysis</h3>', unsafe_allow_html=True)
     
     display_columns = [
-        'Feedback', 'AI_Category', 'AI_Summary', 'Product', 
-        'Severity', 'Region', 'Opportunity_Score'
+        'Feedback', 'AI_Category', 'AI_Confidence', 'AI_Summary', 'Product', 
+        'Severity', 'Region', 'Language', 'Sentiment', 'Urgency', 'Opportunity_Score'
     ]
     
     available_columns = [col for col in display_columns if col in df.columns]
     
+    # Only the shown page is styled and sent to the browser
+    page_df = df
+    if len(df) > TABLE_PAGE_ROWS:
+        n_pages = -(-len(df) // TABLE_PAGE_ROWS)
+        # No key: a different page count (new data or filters) starts again at page 1
+        page = st.number_input(f"Page (of {n_pages:,}, {TABLE_PAGE_ROWS:,} rows each)",
+                               min_value=1, max_value=n_pages, value=1)
+        page_df = df.iloc[(page - 1) * TABLE_PAGE_ROWS:page * TABLE_PAGE_ROWS]
+    
     # Apply Robinhood-style dataframe styling
-    filtered_df = df[available_columns].copy()
-    styled_df = style_dataframe_robinhood(filtered_df)
+    styled_df = style_dataframe_robinhood(page_df[available_columns])
     
     st.dataframe(
         styled_df,
@@ -290,7 +596,111 @@ def display_data_table(df):
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+PERF_HISTORY_LENGTH = 10
+
 def main():
+    # Hidden performance panel: open the app with ?perf=1 or set FEEDBACK_PERF=1.
+    # The query parameter opts in this session only; instrumentation.run
+    # records spans on this session's thread without enabling them globally
+    if st.query_params.get('perf') == '1':
+        st.session_state.perf_enabled = True
+    if not (instrumentation.is_enabled() or st.session_state.get('perf_enabled')):
+        render_dashboard()
+        return
+    
+    if 'perf_history' not in st.session_state:
+        st.session_state.perf_history = []
+    
+    try:
+        with instrumentation.run('rerun') as record, \
+                instrumentation.profiled(st.session_state.get('perf_profiler')) as profile:
+            render_dashboard()
+    finally:
+        # Record failed reruns too; they are often the slow ones
+        st.session_state.perf_history = (st.session_state.perf_history + [record])[-PERF_HISTORY_LENGTH:]
+        if profile['report']:
+            st.session_state.perf_profile_report = profile['report']
+        
+        render_performance_panel(
+            st.session_state.perf_history,
+            st.session_state.get('perf_profile_report'),
+            instrumentation.available_profilers()
+        )
+
+# Static page fragments, minified once at import
+EXECUTIVE_DASHBOARD_HEADER_HTML = minify_html('''
+<div style="background: linear-gradient(90deg, rgba(0, 200, 83, 0.03) 0%, rgba(139, 92, 246, 0.03) 50%, rgba(30, 64, 175, 0.03) 100%);
+            padding: 1.5rem;
+            border-radius: 16px;
+            margin: 2rem 0 1.5rem 0;
+            border: 1px solid rgba(209, 213, 219, 0.2);">
+    <h2 style="color: #111418; font-family: Inter, sans-serif; font-weight: 800; margin: 0;">
+        <span style="font-size: 2rem;">📈</span> Executive Dashboard
+    </h2>
+    <p style="color: #6b7280; margin: 0.5rem 0 0 0; font-family: Inter, sans-serif;">Real-time strategic insights from customer feedback analysis</p>
+</div>
+''')
+
+STRATEGIC_ANALYTICS_HEADER_HTML = minify_html('''
+<div style="background: linear-gradient(90deg, rgba(139, 92, 246, 0.03) 0%, rgba(0, 200, 83, 0.03) 50%, rgba(245, 124, 0, 0.03) 100%);
+            padding: 1.5rem;
+            border-radius: 16px;
+            margin: 2rem 0 1.5rem 0;
+            border: 1px solid rgba(209, 213, 219, 0.2);">
+    <h2 style="color: #111418; font-family: Inter, sans-serif; font-weight: 800; margin: 0;">
+        <span style="font-size: 2rem;">📊</span> Strategic Analytics
+    </h2>
+    <p style="color: #6b7280; margin: 0.5rem 0 0 0; font-family: Inter, sans-serif;">Visual breakdown of feedback categories and opportunity distribution</p>
+</div>
+''')
+
+DATA_LOADED_HTML = minify_html('''
+<div style="background: linear-gradient(135deg, rgba(30, 64, 175, 0.05) 0%, rgba(139, 92, 246, 0.05) 100%); 
+            border-left: 4px solid #1E40AF; 
+            padding: 1.5rem; 
+            border-radius: 12px; 
+            margin: 2rem 0;">
+    <h4 style="color: #1E40AF; margin: 0 0 0.5rem 0; font-family: Inter, sans-serif;">📊 Data Loaded Successfully!</h4>
+    <p style="color: #374151; margin: 0; font-family: Inter, sans-serif;">Click <strong>'Process with AI'</strong> above to unlock the executive dashboard with strategic insights.</p>
+</div>
+''')
+
+WELCOME_HTML = minify_html('''
+<div style="background: linear-gradient(135deg, #f8f9fa 0%, #e5e7eb 100%); padding: 2rem; border-radius: 12px; border: 1px solid #d1d5db; margin: 2rem 0;">
+    <h3 style="color: #111418; font-family: Inter, sans-serif; font-weight: 600; margin: 0 0 1rem 0;">👈 Get Started</h3>
+    <p style="color: #6b7280; font-family: Inter, sans-serif; margin: 0;">Load data using the sidebar to unlock your AI-powered feedback analytics dashboard.</p>
+</div>
+''')
+
+QUICK_START_HTML = minify_html('''
+<div class="chart-container">
+    <h4 style="color: #111418; font-family: Inter, sans-serif; font-weight: 600;">🚀 Quick Start Guide</h4>
+    <ol style="color: #374151; font-family: Inter, sans-serif; line-height: 1.8;">
+        <li><strong>Load Data</strong>: Use sample data or upload your CSV file</li>
+        <li><strong>AI Processing</strong>: Let AI categorize and analyze feedback</li>
+        <li><strong>Explore Insights</strong>: Use filters for strategic analysis</li>
+        <li><strong>Export Results</strong>: Download insights for stakeholders</li>
+    </ol>
+</div>
+''')
+
+CSV_REQUIREMENTS_HTML = minify_html('''
+<div class="chart-container">
+    <h4 style="color: #111418; font-family: Inter, sans-serif; font-weight: 600;">📋 CSV Requirements</h4>
+    <div style="color: #374151; font-family: Inter, sans-serif; line-height: 1.6;">
+        <p><strong>Required columns:</strong></p>
+        <ul>
+            <li><code>Feedback</code>: Customer feedback text</li>
+            <li><code>Product</code>: Product or module name</li>
+            <li><code>Severity</code>: Critical, High, Medium, or Low</li>
+            <li><code>Region</code>: US, EU, APAC, or LATAM</li>
+        </ul>
+        <p><em>Optional:</em> <code>Category</code> for validation</p>
+    </div>
+</div>
+''')
+
+def render_dashboard():
     initialize_session_state()
     
     # Render the Robinhood-inspired header
@@ -302,96 +712,50 @@ def main():
         process_with_ai()
         
         if st.session_state.ai_processed and st.session_state.processed_data is not None:
+            if st.session_state.reprocess_queue is not None:
+                display_reprocessing_status()
+            elif st.session_state.reprocess_summary:
+                summary = st.session_state.reprocess_summary
+                kept = f"; {summary['abandoned']:,} kept their local estimates" if summary['abandoned'] else ""
+                st.caption(f"✅ Re-processed {summary['completed']:,} rows in the background{kept}")
+            
             filters = create_filters()
             
             data_processor = DataProcessor()
             filtered_df = data_processor.filter_data(st.session_state.processed_data, filters)
             
             # Executive Dashboard Header with enhanced styling
-            st.markdown('''
-            <div style="background: linear-gradient(90deg, rgba(0, 200, 83, 0.03) 0%, rgba(139, 92, 246, 0.03) 50%, rgba(30, 64, 175, 0.03) 100%);
-                        padding: 1.5rem;
-                        border-radius: 16px;
-                        margin: 2rem 0 1.5rem 0;
-                        border: 1px solid rgba(209, 213, 219, 0.2);">
-                <h2 style="color: #111418; font-family: Inter, sans-serif; font-weight: 800; margin: 0;">
-                    <span style="font-size: 2rem;">📈</span> Executive Dashboard
-                </h2>
-                <p style="color: #6b7280; margin: 0.5rem 0 0 0; font-family: Inter, sans-serif;">Real-time strategic insights from customer feedback analysis</p>
-            </div>
-            ''', unsafe_allow_html=True)
+            st.markdown(EXECUTIVE_DASHBOARD_HEADER_HTML, unsafe_allow_html=True)
             display_metrics(filtered_df)
             
             # Strategic Analytics Header with enhanced styling
-            st.markdown('''
-            <div style="background: linear-gradient(90deg, rgba(139, 92, 246, 0.03) 0%, rgba(0, 200, 83, 0.03) 50%, rgba(245, 124, 0, 0.03) 100%);
-                        padding: 1.5rem;
-                        border-radius: 16px;
-                        margin: 2rem 0 1.5rem 0;
-                        border: 1px solid rgba(209, 213, 219, 0.2);">
-                <h2 style="color: #111418; font-family: Inter, sans-serif; font-weight: 800; margin: 0;">
-                    <span style="font-size: 2rem;">📊</span> Strategic Analytics
-                </h2>
-                <p style="color: #6b7280; margin: 0.5rem 0 0 0; font-family: Inter, sans-serif;">Visual breakdown of feedback categories and opportunity distribution</p>
-            </div>
-            ''', unsafe_allow_html=True)
+            st.markdown(STRATEGIC_ANALYTICS_HEADER_HTML, unsafe_allow_html=True)
             create_visualizations(filtered_df)
             
+            if st.session_state.rollups is not None:
+                display_trends(st.session_state.rollups, filters)
+            
+            display_point_explorer(filtered_df)
+            
+            display_review_queue(filtered_df)
+            
             display_data_table(filtered_df)
         
         elif not st.session_state.ai_processed:
             # Enhanced info card with gradient background
-            st.markdown('''
-            <div style="background: linear-gradient(135deg, rgba(30, 64, 175, 0.05) 0%, rgba(139, 92, 246, 0.05) 100%); 
-                        border-left: 4px solid #1E40AF; 
-                        padding: 1.5rem; 
-                        border-radius: 12px; 
-                        margin: 2rem 0;">
-                <h4 style="color: #1E40AF; margin: 0 0 0.5rem 0; font-family: Inter, sans-serif;">📊 Data Loaded Successfully!</h4>
-                <p style="color: #374151; margin: 0; font-family: Inter, sans-serif;">Click <strong>'Process with AI'</strong> above to unlock the executive dashboard with strategic insights.</p>
-            </div>
-            ''', unsafe_allow_html=True)
+            st.markdown(DATA_LOADED_HTML, unsafe_allow_html=True)
     
     else:
         # Welcome section with Robinhood styling
-        st.markdown('''
-        <div style="background: linear-gradient(135deg, #f8f9fa 0%, #e5e7eb 100%); padding: 2rem; border-radius: 12px; border: 1px solid #d1d5db; margin: 2rem 0;">
-            <h3 style="color: #111418; font-family: Inter, sans-serif; font-weight: 600; margin: 0 0 1rem 0;">👈 Get Started</h3>
-            <p style="color: #6b7280; font-family: Inter, sans-serif; margin: 0;">Load data using the sidebar to unlock your AI-powered feedback analytics dashboard.</p>
-        </div>
-        ''', unsafe_allow_html=True)
+        st.markdown(WELCOME_HTML, unsafe_allow_html=True)
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown('''
-            <div class="chart-container">
-                <h4 style="color: #111418; font-family: Inter, sans-serif; font-weight: 600;">🚀 Quick Start Guide</h4>
-                <ol style="color: #374151; font-family: Inter, sans-serif; line-height: 1.8;">
-                    <li><strong>Load Data</strong>: Use sample data or upload your CSV file</li>
-                    <li><strong>AI Processing</strong>: Let AI categorize and analyze feedback</li>
-                    <li><strong>Explore Insights</strong>: Use filters for strategic analysis</li>
-                    <li><strong>Export Results</strong>: Download insights for stakeholders</li>
-                </ol>
-            </div>
-            ''', unsafe_allow_html=True)
+            st.markdown(QUICK_START_HTML, unsafe_allow_html=True)
         
         with col2:
-            st.markdown('''
-            <div class="chart-container">
-                <h4 style="color: #111418; font-family: Inter, sans-serif; font-weight: 600;">📋 CSV Requirements</h4>
-                <div style="color: #374151; font-family: Inter, sans-serif; line-height: 1.6;">
-                    <p><strong>Required columns:</strong></p>
-                    <ul>
-                        <li><code>Feedback</code>: Customer feedback text</li>
-                        <li><code>Product</code>: Product or module name</li>
-                        <li><code>Severity</code>: Critical, High, Medium, or Low</li>
-                        <li><code>Region</code>: US, EU, APAC, or LATAM</li>
-                    </ul>
-                    <p><em>Optional:</em> <code>Category</code> for validation</p>
-                </div>
-            </div>
-            ''', unsafe_allow_html=True)
+            st.markdown(CSV_REQUIREMENTS_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""Bulk AI analysis through the OpenAI Batch API.
+
+For backfills that don't need interactive latency. Instead of two
+synchronous calls per row, each unique feedback text that is not already
+cached becomes a categorize and a summarize request in a JSONL file (at
+most ``max_requests_per_batch`` requests per file). The files are uploaded
+and submitted as batch jobs, polled until they finish, and the results are
+merged back into AI_Category, AI_Summary and AI_Status. Batch requests are
+billed at half the synchronous price.
+
+Everything needed to pick a job up again lives in ``work_dir``: the
+request files, ``state.json`` with the file and batch ids, and the
+downloaded results. Running the same job again with the same directory
+resumes where it stopped, whether that was before upload, while a batch
+was running or after download. Nothing is submitted twice. Requests the
+batch could not answer get local estimates and AI_Status 'failed', like
+synchronous failures, so ReprocessingQueue can retry them.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from reporters import Reporter
+from result_cache import ResultCache
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+COMPLETION_WINDOW = '24h'
+# Batch API limit on requests per input file
+MAX_REQUESTS_PER_BATCH = 50_000
+TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+DEFAULT_POLL_SECONDS = 60.0
+TASKS = ('categorize', 'summarize')
+
+
+class BatchTimeoutError(Exception):
+    """Raised by BatchJob.wait while batches are still running; run the job again to resume"""
+
+
+class BatchJob:
+    def __init__(self, analyzer, work_dir: str, model: Optional[str] = None,
+                 max_requests_per_batch: int = MAX_REQUESTS_PER_BATCH,
+                 poll_seconds: float = DEFAULT_POLL_SECONDS, reporter: Optional[Reporter] = None):
+        self.analyzer = analyzer
+        self.work_dir = work_dir
+        self.model = model or analyzer.MODEL
+        # Both requests for a text go in the same file
+        self.max_requests_per_batch = max(len(TASKS), max_requests_per_batch)
+        self.poll_seconds = poll_seconds
+        self.reporter = reporter if reporter is not None else analyzer.reporter
+        self.state_path = os.path.join(work_dir, 'state.json')
+        self.state: Optional[dict] = None
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    @staticmethod
+    def custom_id(task: str, feedback_text: str) -> str:
+        # Keyed by text, so duplicate rows share one request
+        return f"{task}-{ResultCache.key(feedback_text)[:32]}"
+
+    @property
+    def parts(self) -> List[dict]:
+        return self.state['parts'] if self.state is not None else []
+
+    def run(self, df: pd.DataFrame, timeout: Optional[float] = None, show_progress: bool = True) -> pd.DataFrame:
+        """Prepare, submit, wait for and merge the batch for ``df``.
+
+        Raises BatchTimeoutError if batches are still running after
+        ``timeout`` seconds; calling run again resumes the same job.
+        """
+        if not self.analyzer.is_configured():
+            raise ValueError("The Batch API needs an OpenAI API key")
+        self.prepare(df)
+        self.submit()
+        self.wait(timeout, show_progress)
+        self.download()
+        return self.merge(df)
+
+    def prepare(self, df: pd.DataFrame) -> int:
+        """Write request files for texts without a cached result; returns the request count"""
+        texts = sorted({text for text in df['Feedback'].tolist() if isinstance(text, str)})
+        fingerprint = hashlib.sha256('\n'.join(ResultCache.key(text) for text in texts).encode('ascii')).hexdigest()
+        if self.state is not None:
+            if self.state['fingerprint'] != fingerprint or self.state['model'] != self.model:
+                raise ValueError(f"{self.work_dir} holds a batch job for different feedback or another model; "
+                                 "use a new directory")
+            return sum(part['requests'] for part in self.parts)
+
+        cache = self.analyzer.cache
+        languages = self._text_languages(df)
+        pending = [text for text in texts if cache is None or cache.get(text, languages.get(text)) is None]
+        # Grouped by language, so requests in a file share their prompt prefix
+        pending.sort(key=lambda text: languages.get(text) or '')
+        os.makedirs(self.work_dir, exist_ok=True)
+        texts_per_file = self.max_requests_per_batch // len(TASKS)
+        parts = []
+        for start in range(0, len(pending), texts_per_file):
+            name = f"requests-{len(parts):03d}.jsonl"
+            chunk = pending[start:start + texts_per_file]
+            with open(os.path.join(self.work_dir, name), 'w', encoding='utf-8') as f:
+                for text in chunk:
+                    for task in TASKS:
+                        f.write(json.dumps({
+                            'custom_id': self.custom_id(task, text),
+                            'method': 'POST',
+                            'url': BATCH_ENDPOINT,
+                            'body': self.analyzer.request_body(task, text, self.model, languages.get(text)),
+                        }) + '\n')
+            parts.append({'input': name, 'requests': len(chunk) * len(TASKS), 'file_id': None,
+                          'batch_id': None, 'status': None, 'output_file_id': None,
+                          'error_file_id': None, 'downloaded': False, 'request_counts': None})
+        self.state = {'fingerprint': fingerprint, 'model': self.model, 'parts': parts}
+        self._save_state()
+        self.reporter.info(f"Batch job: {len(pending)} of {len(texts)} unique feedback texts need analysis, "
+                           f"{len(parts)} batch file(s)")
+        return sum(part['requests'] for part in parts)
+
+    def submit(self):
+        """Upload and submit every part that has no batch yet"""
+        client = self.analyzer.client
+        for part in self.parts:
+            if part['batch_id'] is not None:
+                continue
+            if part['file_id'] is None:
+                with open(os.path.join(self.work_dir, part['input']), 'rb') as f:
+                    part['file_id'] = client.files.create(file=f, purpose='batch').id
+                # Saved between steps so a crash here doesn't upload twice
+                self._save_state()
+            batch = client.batches.create(input_file_id=part['file_id'], endpoint=BATCH_ENDPOINT,
+                                          completion_window=COMPLETION_WINDOW,
+                                          metadata={'source': 'feedback-analyzer', 'input': part['input']})
+            part['batch_id'] = batch.id
+            self._update_part(part, batch)
+            self._save_state()
+
+    def poll(self) -> bool:
+        """Refresh every unfinished batch; True once all of them are finished"""
+        client = self.analyzer.client
+        for part in self.parts:
+            if part['batch_id'] is not None and part['status'] not in TERMINAL_STATUSES:
+                self._update_part(part, client.batches.retrieve(part['batch_id']))
+        self._save_state()
+        return all(part['status'] in TERMINAL_STATUSES for part in self.parts)
+
+    def wait(self, timeout: Optional[float] = None, show_progress: bool = True):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        total = sum(part['requests'] for part in self.parts)
+        while not self.poll():
+            done = sum((part['request_counts'] or {}).get('completed', 0)
+                       + (part['request_counts'] or {}).get('failed', 0) for part in self.parts)
+            if show_progress:
+                self.reporter.progress(done / total, f'Batch job: {done} of {total} requests finished...')
+            if deadline is not None and time.monotonic() + self.poll_seconds > deadline:
+                running = [part['batch_id'] for part in self.parts if part['status'] not in TERMINAL_STATUSES]
+                raise BatchTimeoutError(f"Batches still running: {', '.join(running)}. "
+                                        f"Run again with {self.work_dir} to resume.")
+            time.sleep(self.poll_seconds)
+        if show_progress and total:
+            self.reporter.progress_done('Batch job finished')
+
+    def download(self):
+        """Save the output and error files of finished batches next to the state"""
+        client = self.analyzer.client
+        for part in self.parts:
+            if part['downloaded'] or part['status'] not in TERMINAL_STATUSES:
+                continue
+            if part['status'] != 'completed':
+                # Expired and cancelled batches still return what they finished
+                self.reporter.warning(f"Batch {part['batch_id']} ended as {part['status']}; "
+                                      "unanswered rows are marked as failed.")
+            for key in ('output_file_id', 'error_file_id'):
+                if part[key] is not None:
+                    path = os.path.join(self.work_dir, self._result_name(part, key))
+                    with open(path + '.tmp', 'wb') as f:
+                        f.write(client.files.content(part[key]).content)
+                    os.replace(path + '.tmp', path)
+            part['downloaded'] = True
+            self._save_state()
+
+    def merge(self, df: pd.DataFrame) -> pd.DataFrame:
+        """``df`` with AI columns from the downloaded results and the cache"""
+        replies = self._read_replies()
+        analyzer = self.analyzer
+        cache = analyzer.cache
+        languages = self._text_languages(df)
+        by_text: Dict[str, tuple] = {}
+        for text in set(df['Feedback'].tolist()):
+            if not isinstance(text, str):
+                continue
+            cached = cache.get(text, languages.get(text)) if cache is not None else None
+            if cached is not None:
+                by_text[text] = analyzer.result_from_cache(cached)
+                continue
+            category_reply, top_logprobs = replies.get(self.custom_id('categorize', text), (None, None))
+            summary_reply, _ = replies.get(self.custom_id('summarize', text), (None, None))
+            result = analyzer.result_from_replies(text, category_reply, summary_reply, top_logprobs)
+            if cache is not None and result[2] == analyzer.STATUS_OK:
+                cache.put(text, result[0], result[1], result[3], languages.get(text))
+            by_text[text] = result
+        if cache is not None:
+            cache.save()
+
+        # Rows without feedback text have nothing to send or re-process
+        empty = (analyzer.DEFAULT_CATEGORY, '', analyzer.STATUS_OK, analyzer.spread_probabilities(None, 0.0))
+        results = [by_text.get(text, empty) for text in df['Feedback'].tolist()]
+        out = df.copy()
+        analyzer.assign_results(out, results)
+        failed = sum(r[2] != analyzer.STATUS_OK for r in results)
+        if failed:
+            self.reporter.warning(f"{failed} of {len(results)} rows got no batch result and hold local estimates. "
+                                  f"They are marked in AI_Status for re-processing.")
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            'work_dir': self.work_dir,
+            'model': self.model,
+            'batches': [{key: part[key] for key in ('batch_id', 'status', 'requests', 'request_counts')}
+                        for part in self.parts],
+        }
+
+    def _text_languages(self, df: pd.DataFrame) -> Dict[str, str]:
+        # Non-English texts only; the rest use the plain prompts and cache keys
+        languages = self.analyzer.row_languages(df)
+        if languages is None:
+            return {}
+        return {text: language for text, language in zip(df['Feedback'].tolist(), languages)
+                if isinstance(text, str) and language is not None}
+
+    def _read_replies(self) -> Dict[str, Tuple[str, Optional[List[Tuple[str, float]]]]]:
+        # custom_id -> (reply text, first-token top logprobs), for successful requests only
+        metrics = self.analyzer.metrics
+        replies = {}
+        for part in self.parts:
+            for key in ('output_file_id', 'error_file_id'):
+                path = os.path.join(self.work_dir, self._result_name(part, key))
+                if part[key] is None or not os.path.exists(path):
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        result = json.loads(line)
+                        task = result['custom_id'].split('-', 1)[0]
+                        response = result.get('response') or {}
+                        body = response.get('body') or {}
+                        if response.get('status_code') != 200 or not body.get('choices'):
+                            metrics.requests.inc(model=self.model, task=task, outcome='batch_error')
+                            continue
+                        metrics.requests.inc(model=self.model, task=task, outcome='batch_success')
+                        usage = body.get('usage') or {}
+                        metrics.observe_usage(self.model, task, usage.get('prompt_tokens', 0),
+                                              usage.get('completion_tokens', 0), batch=True)
+                        choice = body['choices'][0]
+                        content = (choice.get('logprobs') or {}).get('content') or [{}]
+                        top_logprobs = [(alternative['token'], alternative['logprob'])
+                                        for alternative in content[0].get('top_logprobs') or []]
+                        replies[result['custom_id']] = (choice['message']['content'] or '', top_logprobs or None)
+        return replies
+
+    @staticmethod
+    def _result_name(part: dict, key: str) -> str:
+        kind = 'output' if key == 'output_file_id' else 'errors'
+        return part['input'].replace('requests-', f'{kind}-')
+
+    @staticmethod
+    def _update_part(part: dict, batch):
+        part['status'] = batch.status
+        part['output_file_id'] = batch.output_file_id
+        part['error_file_id'] = batch.error_file_id
+        counts = getattr(batch, 'request_counts', None)
+        if counts is not None:
+            part['request_counts'] = {'total': counts.total, 'completed': counts.completed, 'failed': counts.failed}
+
+    def _save_state(self):
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,171 @@
+"""AIAnalyzer.process_batch throughput against the local mock LLM server.
+
+Reports rows/sec, per-call p50/p99 latency, retries and token usage for
+each dataset size, and compares against a stored baseline so performance
+changes can be judged run over run.
+
+    python benchmarks/ai_throughput.py                       # 1k/10k/100k rows
+    python benchmarks/ai_throughput.py --sizes 1000 --compare
+    python benchmarks/ai_throughput.py --save-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd  # noqa: E402
+
+from ai_analyzer import AIAnalyzer  # noqa: E402
+from mock_llm_server import start_mock_server  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from synthetic_data import generate_feedback  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'baselines', 'ai_throughput.json')
+
+
+class _TimedCompletions:
+    """Wraps client.chat.completions to record per-call latency and usage"""
+
+    def __init__(self, completions):
+        self._completions = completions
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.attempts = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def create(self, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self._completions.create(**kwargs)
+        except Exception:
+            with self._lock:
+                self.attempts += 1
+                self.failures += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.attempts += 1
+            self.latencies.append(elapsed)
+            if response.usage is not None:
+                self.prompt_tokens += response.usage.prompt_tokens
+                self.completion_tokens += response.usage.completion_tokens
+        return response
+
+
+def make_dataset(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    # Every row gets unique text so no layer can short-circuit on duplicates
+    df = generate_feedback(n_rows, seed=seed, duplicate_rate=0, invalid_rate=0, missing_rate=0)
+    df['Feedback'] = df['Feedback'] + ' (ticket ' + pd.Series(range(n_rows)).astype(str) + ')'
+    return df
+
+
+def _percentile_ms(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 3)
+
+
+def run_size(server, n_rows: int, workers: int) -> dict:
+    analyzer = AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url)
+    analyzer.RETRY_BACKOFF_BASE = 0.01
+    timed = _TimedCompletions(analyzer.client.chat.completions)
+    analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=timed))
+
+    df = make_dataset(n_rows)
+    server.reset_stats()
+    start = time.perf_counter()
+    analyzer.process_batch(df, show_progress=False, max_workers=workers, request_interval=0)
+    elapsed = time.perf_counter() - start
+
+    logical_calls = n_rows * 2
+    return {
+        'rows': n_rows,
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(n_rows / elapsed, 1),
+        'call_p50_ms': _percentile_ms(timed.latencies, 50),
+        'call_p99_ms': _percentile_ms(timed.latencies, 99),
+        'api_attempts': timed.attempts,
+        'retries': timed.attempts - logical_calls,
+        'failed_attempts': timed.failures,
+        'prompt_tokens': timed.prompt_tokens,
+        'completion_tokens': timed.completion_tokens,
+        'prompt_tokens_per_row': round(timed.prompt_tokens / n_rows, 1),
+        'server': server.stats(),
+    }
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    by_rows = {entry['rows']: entry for entry in baseline.get('results', [])}
+    for result in results:
+        previous = by_rows.get(result['rows'])
+        if previous is None:
+            continue
+        ratio = result['rows_per_sec'] / previous['rows_per_sec']
+        result['vs_baseline'] = {
+            'rows_per_sec_ratio': round(ratio, 3),
+            'prompt_tokens_per_row_delta': round(result['prompt_tokens_per_row'] - previous['prompt_tokens_per_row'], 1),
+        }
+        if ratio < 1 - tolerance:
+            regressions.append(f"{result['rows']} rows: {result['rows_per_sec']} rows/s "
+                               f"vs baseline {previous['rows_per_sec']} rows/s")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help="Comma-separated row counts")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0, help="Mock latency per call, seconds")
+    parser.add_argument('--latency-jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--response-shape', default='exact')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="Overwrite the baseline with this run")
+    parser.add_argument('--compare', action='store_true', help="Fail if rows/sec regresses past --tolerance")
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args()
+
+    config = {
+        'latency': args.latency, 'latency_jitter': args.latency_jitter,
+        'error_rate': args.error_rate, 'rate_limit_rate': args.rate_limit_rate,
+        'response_shape': args.response_shape, 'seed': args.seed,
+    }
+    server = start_mock_server(**config)
+    try:
+        results = [run_size(server, int(size), args.workers) for size in args.sizes.split(',')]
+    finally:
+        server.shutdown()
+
+    report = {'config': dict(config, workers=args.workers), 'results': results}
+    regressions = []
+    if args.compare and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Batch wall time during an OpenAI outage, with and without the circuit breaker.
+
+Points AIAnalyzer.process_batch at the mock LLM server answering every
+request with a 500 and times the batch with the breaker disabled (every
+row retries both calls with backoff, then writes defaults) and enabled
+(calls fail fast to the local fallback after a few failures). With
+``--recover-after`` the mock starts answering again after that many
+seconds, so the breaker's probe can close it mid-batch.
+
+    python benchmarks/api_outage.py --rows 400 --workers 8
+    python benchmarks/api_outage.py --rows 5000 --recover-after 0.1 --reset-seconds 0.05
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ai_analyzer import AIAnalyzer  # noqa: E402
+from circuit_breaker import DEFAULT_FAILURE_THRESHOLD, CircuitBreaker  # noqa: E402
+from metrics import MetricsRegistry  # noqa: E402
+from mock_llm_server import start_mock_server  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from synthetic_data import generate_feedback  # noqa: E402
+
+
+def run(server, df, failure_threshold: int, args) -> dict:
+    analyzer = AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url,
+                          metrics_registry=MetricsRegistry(),
+                          circuit_breaker=CircuitBreaker(failure_threshold, args.reset_seconds))
+    analyzer.RETRY_BACKOFF_BASE = args.backoff_base
+    server.error_rate = 1.0
+    server.reset_stats()
+    recovery = None
+    if args.recover_after is not None:
+        recovery = threading.Timer(args.recover_after, setattr, (server, 'error_rate', 0.0))
+        recovery.start()
+
+    start = time.perf_counter()
+    out = analyzer.process_batch(df, show_progress=False, max_workers=args.workers, request_interval=0)
+    elapsed = time.perf_counter() - start
+    if recovery is not None:
+        recovery.cancel()
+
+    return {
+        'breaker': 'off' if failure_threshold <= 0 else f'{failure_threshold} failures',
+        'rows': len(df),
+        'seconds': round(elapsed, 3),
+        'api_requests': server.stats()['requests'],
+        'status_counts': out['AI_Status'].value_counts().to_dict(),
+        'default_category_rows': int((out['AI_Category'] == AIAnalyzer.DEFAULT_CATEGORY).sum()),
+        'circuit': analyzer.circuit_breaker.to_dict(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help="Mock latency per call, seconds")
+    parser.add_argument('--backoff-base', type=float, default=0.05,
+                        help="AIAnalyzer.RETRY_BACKOFF_BASE for the run (production: 1.0)")
+    parser.add_argument('--failures', type=int, default=DEFAULT_FAILURE_THRESHOLD, help="Breaker threshold")
+    parser.add_argument('--reset-seconds', type=float, default=30.0, help="Seconds before the breaker probes")
+    parser.add_argument('--recover-after', type=float, help="Seconds until the mock stops failing")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency, seed=args.seed)
+    df = generate_feedback(args.rows, seed=args.seed, duplicate_rate=0)
+    try:
+        results = [run(server, df, 0, args), run(server, df, args.failures, args)]
+    finally:
+        server.shutdown()
+
+    print(json.dumps({'config': vars(args), 'results': results,
+                      'speedup': round(results[0]['seconds'] / results[1]['seconds'], 1)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Synchronous process_batch vs Batch API mode against the local mock server.
+
+Runs the same frame through AIAnalyzer.process_batch and through a
+BatchJob (prepare, upload, submit, poll, download, merge) and reports
+synchronous calls, batch requests, wall time, token usage and estimated cost for each. The
+mock answers a batch after ``--batch-latency`` seconds; the real Batch
+API takes minutes to hours, so wall time here only covers local
+overhead. Then it shows the resume path: a job interrupted with a
+timeout is picked up by a second BatchJob on the same directory without
+resubmitting.
+
+    python benchmarks/batch_api_mode.py --rows 2000 --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ai_analyzer import AIAnalyzer  # noqa: E402
+from batch_api import BatchJob, BatchTimeoutError  # noqa: E402
+from metrics import MetricsRegistry, estimate_cost  # noqa: E402
+from mock_llm_server import start_mock_server  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from synthetic_data import generate_feedback  # noqa: E402
+
+
+def summarize(server, seconds: float, out, batch: bool) -> dict:
+    stats = server.stats()
+    return {
+        'seconds': round(seconds, 3),
+        'synchronous_calls': stats['requests'],
+        'batches_created': stats['batches_created'],
+        'batch_requests': stats['batch_requests'],
+        'prompt_tokens': stats['prompt_tokens'],
+        'completion_tokens': stats['completion_tokens'],
+        'cost_usd': round(estimate_cost(AIAnalyzer.MODEL, stats['prompt_tokens'], stats['completion_tokens'],
+                                        batch), 4),
+        'status_counts': out['AI_Status'].value_counts().to_dict(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help="Mock latency per synchronous call, seconds")
+    parser.add_argument('--batch-latency', type=float, default=0.5, help="Seconds before the mock answers a batch")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency, batch_latency=args.batch_latency, seed=args.seed)
+    df = generate_feedback(args.rows, seed=args.seed)
+
+    def analyzer():
+        return AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url,
+                          metrics_registry=MetricsRegistry())
+
+    try:
+        start = time.perf_counter()
+        out = analyzer().process_batch(df, show_progress=False, max_workers=args.workers, request_interval=0)
+        synchronous = summarize(server, time.perf_counter() - start, out, batch=False)
+
+        server.reset_stats()
+        with tempfile.TemporaryDirectory() as work_dir:
+            start = time.perf_counter()
+            out = BatchJob(analyzer(), work_dir, poll_seconds=0.1).run(df, show_progress=False)
+            batch = summarize(server, time.perf_counter() - start, out, batch=True)
+
+        server.reset_stats()
+        with tempfile.TemporaryDirectory() as work_dir:
+            try:
+                BatchJob(analyzer(), work_dir, poll_seconds=0.1).run(df, timeout=0, show_progress=False)
+            except BatchTimeoutError:
+                pass
+            out = BatchJob(analyzer(), work_dir, poll_seconds=0.1).run(df, show_progress=False)
+            resumed = {'batches_created': server.stats()['batches_created'],
+                       'status_counts': out['AI_Status'].value_counts().to_dict()}
+    finally:
+        server.shutdown()
+
+    print(json.dumps({'config': vars(args), 'synchronous': synchronous, 'batch_api': batch,
+                      'resumed_after_timeout': resumed}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Per-request latency saved by reusing the pooled OpenAI client.
+
+Runs chat completions against the local mock endpoint in two modes:
+
+* ``fresh``  - a new client (and connection) per request, which is what
+  constructing AIAnalyzer on every Streamlit rerun used to cost
+* ``shared`` - the process-wide pooled client from get_openai_client()
+
+    python benchmarks/connection_reuse.py [--requests 200] [--latency 0.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai  # noqa: E402
+
+from ai_analyzer import AIAnalyzer, _build_http_client, get_openai_client  # noqa: E402
+from mock_llm_server import start_mock_server  # noqa: E402
+from reporters import Reporter  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "Dashboard loading times are unacceptable"}]
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(latencies, connections):
+    return {
+        'requests': len(latencies),
+        'connections_opened': connections,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_fresh(server, n_requests):
+    latencies = []
+    before = server.connections
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        client = openai.OpenAI(api_key='mock', base_url=server.base_url, http_client=_build_http_client())
+        client.chat.completions.create(model='gpt-3.5-turbo', messages=MESSAGES, max_tokens=50)
+        latencies.append(time.perf_counter() - start)
+        client.close()
+    return _summarize(latencies, server.connections - before)
+
+
+def run_shared(server, n_requests):
+    client = get_openai_client('mock', server.base_url)
+    # Warm the pool so the one-off connect isn't attributed to request 1
+    client.chat.completions.create(model='gpt-3.5-turbo', messages=MESSAGES, max_tokens=50)
+    latencies = []
+    before = server.connections
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        client.chat.completions.create(model='gpt-3.5-turbo', messages=MESSAGES, max_tokens=50)
+        latencies.append(time.perf_counter() - start)
+    return _summarize(latencies, server.connections - before)
+
+
+def run_analyzer_construction(server, n_constructions):
+    timings = []
+    for _ in range(n_constructions):
+        start = time.perf_counter()
+        AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url)
+        timings.append(time.perf_counter() - start)
+    return {
+        'constructions': n_constructions,
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.0, help="Mock server latency per request, seconds")
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency)
+    try:
+        fresh = run_fresh(server, args.requests)
+        shared = run_shared(server, args.requests)
+        construction = run_analyzer_construction(server, 50)
+    finally:
+        server.shutdown()
+
+    print(json.dumps({
+        'fresh_client_per_request': fresh,
+        'shared_pooled_client': shared,
+        'saved_per_request_ms': round(fresh['mean_ms'] - shared['mean_ms'], 3),
+        'analyzer_construction': construction,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""End-to-end dashboard benchmark driven headlessly through Streamlit AppTest.
+
+For each dataset size it runs the real ``app.py`` script through the
+load -> process (mock AI) -> filter change reruns, then times the
+individual building blocks on the same data: filter_data,
+get_summary_stats, the components.py chart builders (including the JSON
+serialization st.plotly_chart does, cold and again on an unchanged
+rerun) and style_dataframe_robinhood (computed the way st.dataframe
+marshals a Styler). Each stage records
+wall time and tracemalloc peak memory (``--no-memory`` for undistorted
+timings); results are printed as JSON.
+
+    python benchmarks/dashboard_render.py --sizes 1000,10000,100000
+    python benchmarks/dashboard_render.py --ai stub --sizes 1000 -o render.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+APP_PATH = os.path.join(REPO_ROOT, 'app.py')
+
+
+class StageRecorder:
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.track_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        record = {}
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 4)
+            if self.track_memory:
+                record['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            self.stages[name] = record
+
+
+def _app_errors(at) -> list:
+    return [exception.message for exception in at.exception]
+
+
+def _find(elements, label_prefix: str):
+    return next(element for element in elements if element.label.startswith(label_prefix))
+
+
+def run_app_stages(recorder: StageRecorder, n_rows: int, seed: int, timeout: float):
+    from streamlit.testing.v1 import AppTest
+    from data_processor import DataProcessor
+    from reporters import Reporter
+
+    with recorder.stage('load') as record:
+        df = DataProcessor(reporter=Reporter()).create_synthetic_data(n_rows, seed=seed)
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        at.session_state.data = df
+        at.session_state.processed_data = None
+        at.session_state.ai_processed = False
+        at.run()
+        record['rows'] = len(df)
+        record['errors'] = _app_errors(at)
+
+    with recorder.stage('process') as record:
+        _find(at.checkbox, 'Force use sample AI').check()
+        _find(at.button, '🚀 Process with AI').click()
+        at.run()
+        record['errors'] = _app_errors(at)
+
+    with recorder.stage('filter_change') as record:
+        severity_filter = _find(at.sidebar.multiselect, 'Severity Level')
+        severity_filter.set_value(list(severity_filter.value)[:-1])
+        at.run()
+        record['errors'] = _app_errors(at)
+
+    return at.session_state.processed_data
+
+
+def run_stub_process(recorder: StageRecorder, df, workers: int):
+    # Real client path against the local stub instead of the sample data
+    from ai_analyzer import AIAnalyzer
+    from mock_llm_server import start_mock_server
+    from reporters import Reporter
+
+    server = start_mock_server()
+    try:
+        with recorder.stage('process_stub_ai') as record:
+            analyzer = AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url)
+            start = time.perf_counter()
+            chunks = 0
+            for _ in analyzer.iter_batch(df.drop(columns=['AI_Category', 'AI_Summary']), show_progress=False,
+                                         max_workers=workers, request_interval=0):
+                if chunks == 0:
+                    # When the dashboard can first show partial results
+                    record['first_chunk_seconds'] = round(time.perf_counter() - start, 4)
+                chunks += 1
+            record['chunks'] = chunks
+            record['api_requests'] = server.stats()['requests']
+    finally:
+        server.shutdown()
+
+
+def run_component_stages(recorder: StageRecorder, processed_df):
+    import pandas as pd
+    import plotly.io
+    from components import (
+        TABLE_PAGE_ROWS, clear_figure_cache, create_opportunity_trend_chart, create_robinhood_bar_chart,
+        create_robinhood_donut_chart, style_dataframe_robinhood
+    )
+    from data_processor import DataProcessor
+    from reporters import Reporter
+
+    data_processor = DataProcessor(reporter=Reporter())
+    filters = {
+        'categories': list(processed_df['AI_Category'].unique()),
+        'products': list(processed_df['Product'].unique()),
+        'severities': list(processed_df['Severity'].unique())[:-1],
+        'regions': list(processed_df['Region'].unique()),
+    }
+
+    with recorder.stage('filter') as record:
+        filtered_df = data_processor.filter_data(processed_df, filters)
+        record['rows'] = len(filtered_df)
+
+    with recorder.stage('stats'):
+        data_processor.get_summary_stats(filtered_df)
+
+    def render_charts(record):
+        category_counts = filtered_df['AI_Category'].value_counts().reset_index()
+        category_counts.columns = ['Category', 'Count']
+        severity_counts = filtered_df['Severity'].value_counts().loc[lambda counts: counts > 0].reset_index()
+        severity_counts.columns = ['Severity', 'Count']
+        figures = [
+            create_robinhood_bar_chart(category_counts, "Feedback by Strategic Priority", 'Count', 'Category'),
+            create_robinhood_donut_chart(severity_counts, "Severity Distribution", 'Severity', 'Count'),
+            create_opportunity_trend_chart(filtered_df),
+        ]
+        # Mirrors st.plotly_chart's serialization
+        record['json_bytes'] = sum(len(plotly.io.to_json(fig.to_dict(), validate=False)) for fig in figures)
+
+    clear_figure_cache()
+    with recorder.stage('chart_render') as record:
+        render_charts(record)
+
+    # A rerun with unchanged data (widget interaction elsewhere on the page)
+    with recorder.stage('chart_rerender') as record:
+        render_charts(record)
+
+    with recorder.stage('table_render') as record:
+        display_columns = ['Feedback', 'AI_Category', 'AI_Summary', 'Product',
+                           'Severity', 'Region', 'Opportunity_Score']
+        # Mirrors display_data_table: only the first page is styled
+        table_df = filtered_df[[c for c in display_columns if c in filtered_df.columns]].iloc[:TABLE_PAGE_ROWS]
+        try:
+            styled = style_dataframe_robinhood(table_df)
+            if isinstance(styled, pd.io.formats.style.Styler):
+                # Mirrors streamlit's marshall_styler
+                styled._compute()
+                styled._translate(False, False)
+            record['cells'] = int(table_df.size)
+        except Exception as e:
+            record['errors'] = [f"{type(e).__name__}: {e}"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help="Comma-separated row counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ai', choices=['sample', 'stub'], default='sample',
+                        help="'stub' also times streamed AI processing (total and first chunk) against the local mock LLM server")
+    parser.add_argument('--workers', type=int, default=8, help="Workers for --ai stub")
+    parser.add_argument('--timeout', type=float, default=600.0, help="AppTest per-run timeout, seconds")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="Skip tracemalloc, which slows Python-heavy stages several-fold")
+    parser.add_argument('-o', '--output', help="Write JSON here as well as stdout")
+    args = parser.parse_args()
+
+    os.environ.pop('OPENAI_API_KEY', None)
+    if not args.no_memory:
+        tracemalloc.start()
+    results = []
+    for size in [int(s) for s in args.sizes.split(',')]:
+        recorder = StageRecorder(track_memory=not args.no_memory)
+        processed_df = run_app_stages(recorder, size, args.seed, args.timeout)
+        if processed_df is not None:
+            if args.ai == 'stub':
+                run_stub_process(recorder, processed_df, args.workers)
+            run_component_stages(recorder, processed_df)
+        results.append({'rows': size, 'stages': recorder.stages})
+    if not args.no_memory:
+        tracemalloc.stop()
+
+    report = json.dumps({'config': vars(args), 'results': results}, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Cost of fixing a few failed AI rows: re-processing queue vs a full re-run.
+
+API side: a processed frame with ``--failure-rate`` of its rows marked
+AI_Status='failed' is fixed once by re-running process_batch over every
+row and once by ReprocessingQueue, which retries only the failed rows,
+both against the local mock LLM server. Aggregate side: the repaired rows
+are applied to a ``--agg-rows`` frame with DataProcessor.apply_ai_updates
+(patch the rows, update rollups from the changed rows) and, for
+comparison, by patching the rows and rebuilding the rollups; the rollup
+step is also timed on its own.
+
+    python benchmarks/failed_row_retry.py --rows 2000 --agg-rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from ai_analyzer import AIAnalyzer  # noqa: E402
+from data_processor import DataProcessor  # noqa: E402
+from metrics import MetricsRegistry  # noqa: E402
+from mock_llm_server import start_mock_server  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from reprocessing import ReprocessingQueue  # noqa: E402
+from rollups import update_rollups  # noqa: E402
+from synthetic_data import CATEGORIES  # noqa: E402
+
+
+def with_ai_columns(df: pd.DataFrame, failure_rate: float, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    df['AI_Category'] = np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), len(df))]
+    df['AI_Summary'] = 'Summary'
+    failed = rng.random(len(df)) < failure_rate
+    df['AI_Status'] = np.where(failed, AIAnalyzer.STATUS_FAILED, AIAnalyzer.STATUS_OK)
+    return df
+
+
+def api_side(server, df: pd.DataFrame, workers: int) -> dict:
+    def analyzer():
+        return AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url,
+                          metrics_registry=MetricsRegistry())
+
+    server.reset_stats()
+    start = time.perf_counter()
+    analyzer().process_batch(df, show_progress=False, max_workers=workers, request_interval=0)
+    full = {'seconds': round(time.perf_counter() - start, 3), 'api_requests': server.stats()['requests']}
+
+    server.reset_stats()
+    start = time.perf_counter()
+    queue = ReprocessingQueue(analyzer(), base_delay=0.01)
+    queued = queue.enqueue(df)
+    queue.wait()
+    updates = queue.drain()
+    retry = {'seconds': round(time.perf_counter() - start, 3), 'api_requests': server.stats()['requests'],
+             'rows': queued, 'repaired': int((updates['AI_Status'] == AIAnalyzer.STATUS_OK).sum())}
+    return {'rows': len(df), 'full_rerun': full, 'queue': retry,
+            'speedup': round(full['seconds'] / retry['seconds'], 1)}
+
+
+def aggregate_side(processor: DataProcessor, df: pd.DataFrame, seed: int) -> dict:
+    rollups = processor.create_rollups(df)
+    failed = df[df['AI_Status'] == AIAnalyzer.STATUS_FAILED]
+    rng = np.random.default_rng(seed + 1)
+    updates = pd.DataFrame({
+        'AI_Category': np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), len(failed))],
+        'AI_Summary': 'Repaired summary',
+        'AI_Status': AIAnalyzer.STATUS_OK,
+    }, index=failed.index)
+
+    start = time.perf_counter()
+    patched, _ = processor.apply_ai_updates(df, updates, rollups)
+    incremental = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rebuilt = df.copy()
+    rebuilt.loc[updates.index, updates.columns] = updates
+    processor.create_rollups(rebuilt)
+    rebuild = time.perf_counter() - start
+
+    # The rollup step alone; the row patch above is a copy of the touched columns either way
+    start = time.perf_counter()
+    update_rollups(rollups, df.loc[updates.index], patched.loc[updates.index])
+    rollups_incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    processor.create_rollups(patched)
+    rollups_rebuild = time.perf_counter() - start
+    return {'rows': len(df), 'updated_rows': len(updates),
+            'incremental_seconds': round(incremental, 4), 'rebuild_seconds': round(rebuild, 4),
+            'speedup': round(rebuild / incremental, 1),
+            'rollups_incremental_seconds': round(rollups_incremental, 4),
+            'rollups_rebuild_seconds': round(rollups_rebuild, 4),
+            'rollups_speedup': round(rollups_rebuild / rollups_incremental, 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000, help="Rows for the API comparison")
+    parser.add_argument('--agg-rows', type=int, default=1_000_000, help="Rows for the aggregate comparison")
+    parser.add_argument('--failure-rate', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=8, help="process_batch workers for the full re-run")
+    parser.add_argument('--latency', type=float, default=0.02, help="Mock latency per call, seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    processor = DataProcessor(reporter=Reporter())
+    server = start_mock_server(latency=args.latency, seed=args.seed)
+    try:
+        api = api_side(server, with_ai_columns(processor.create_synthetic_data(args.rows, seed=args.seed),
+                                               args.failure_rate, args.seed), args.workers)
+    finally:
+        server.shutdown()
+    aggregates = aggregate_side(processor, with_ai_columns(
+        processor.create_synthetic_data(args.agg_rows, seed=args.seed), args.failure_rate, args.seed), args.seed)
+
+    print(json.dumps({'config': vars(args), 'api': api, 'aggregates': aggregates}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Measure cold import time of the core (UI-agnostic) modules.
+
+Each module is imported in a fresh interpreter with ``-X importtime``. The
+script fails if a module exceeds its budget or drags in one of the heavy
+UI/API packages that are supposed to be imported lazily.
+
+    python benchmarks/import_time.py [--budget-ms 800] [--json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_MODULES = ['reporters', 'result_cache', 'instrumentation', 'metrics', 'normalization', 'scoring', 'rollups', 'downsampling', 'prompt_compaction', 'model_routing', 'circuit_breaker', 'data_processor', 'ai_analyzer', 'reprocessing', 'batch_api', 'sentiment', 'language_detection', 'pii_redaction', 'cli']
+
+# Must not be loaded as a side effect of importing a core module
+FORBIDDEN_IMPORTS = ['streamlit', 'plotly', 'openai', 'dotenv']
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module: str) -> dict:
+    code = (
+        f"import sys; import {module}; "
+        f"print('LOADED=' + ','.join(m for m in {FORBIDDEN_IMPORTS!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+
+    cumulative_us = {}
+    self_us_total = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative, _, name = match.groups()
+        cumulative_us[name] = int(cumulative)
+        self_us_total += int(self_us)
+
+    loaded = proc.stdout.strip().split('LOADED=', 1)[-1]
+    return {
+        'module': module,
+        'import_ms': round(cumulative_us.get(module, 0) / 1000, 1),
+        'pandas_ms': round(cumulative_us.get('pandas', 0) / 1000, 1),
+        'total_ms': round(self_us_total / 1000, 1),
+        'forbidden_loaded': [m for m in loaded.split(',') if m],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=800.0,
+                        help="Max cold import time per module, including pandas (default: 800)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = [measure(module) for module in CORE_MODULES]
+    failures = []
+    for result in results:
+        result['within_budget'] = result['import_ms'] <= args.budget_ms
+        if not result['within_budget']:
+            failures.append(f"{result['module']}: {result['import_ms']}ms > {args.budget_ms}ms budget")
+        if result['forbidden_loaded']:
+            failures.append(f"{result['module']}: imports {', '.join(result['forbidden_loaded'])} eagerly")
+
+    if args.json:
+        print(json.dumps({'budget_ms': args.budget_ms, 'results': results, 'failures': failures}, indent=2))
+    else:
+        for result in results:
+            print(f"{result['module']:<16} {result['import_ms']:>8.1f} ms "
+                  f"(pandas {result['pandas_ms']:.1f} ms)  "
+                  f"{'OK' if result['within_budget'] and not result['forbidden_loaded'] else 'FAIL'}")
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Language identification cost on English-only and multilingual data.
+
+English-only: times the load-side stages (validation, sentiment, scoring)
+on ``--rows`` synthetic rows with and without the language stage and
+reports its share. Multilingual: generates the same rows with
+``--non-english-rate`` of APAC and LATAM feedback in a local language,
+times detection and checks it against the language each row was written
+in.
+
+    python benchmarks/language_detection.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd  # noqa: E402
+
+from data_processor import DataProcessor  # noqa: E402
+from language_detection import DEFAULT_LANGUAGE  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from synthetic_data import NON_ENGLISH_FEEDBACK, generate_feedback  # noqa: E402
+
+
+def load_stages(processor: DataProcessor, raw: pd.DataFrame, detect: bool) -> float:
+    start = time.perf_counter()
+    df = processor._validate_and_clean_data(raw)
+    if detect:
+        df = processor.detect_language(df)
+    processor.calculate_opportunity_score(processor.analyze_sentiment(df))
+    return time.perf_counter() - start
+
+
+def written_language(feedback: pd.Series) -> pd.Series:
+    # Localized rows are a template plus " (<seats> <users>)"
+    templates = {text: language for by_language in NON_ENGLISH_FEEDBACK.values()
+                 for language, texts in by_language.items() for text in texts}
+    return feedback.str.rsplit(' (', n=1).str[0].map(templates).fillna(DEFAULT_LANGUAGE)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--non-english-rate', type=float, default=0.3)
+    parser.add_argument('--repeats', type=int, default=3, help="Best of N for the English-only timings")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    processor = DataProcessor(reporter=Reporter())
+    raw = generate_feedback(args.rows, seed=args.seed)
+    without = min(load_stages(processor, raw, detect=False) for _ in range(args.repeats))
+    with_language = min(load_stages(processor, raw, detect=True) for _ in range(args.repeats))
+    cleaned = processor._validate_and_clean_data(raw)
+    start = time.perf_counter()
+    detected = processor.detect_language(cleaned)['Language']
+    english_only = {
+        'rows': len(cleaned),
+        'load_stages_seconds': round(without, 3),
+        'load_stages_with_language_seconds': round(with_language, 3),
+        'language_seconds': round(time.perf_counter() - start, 3),
+        'overhead_pct': round(100 * (with_language - without) / without, 1),
+        'non_english_rows': int((detected != DEFAULT_LANGUAGE).sum()),
+    }
+
+    mixed = processor._validate_and_clean_data(
+        generate_feedback(args.rows, seed=args.seed, non_english_rate=args.non_english_rate))
+    start = time.perf_counter()
+    detected = processor.detect_language(mixed)['Language'].astype(object)
+    seconds = time.perf_counter() - start
+    truth = written_language(mixed['Feedback'])
+    multilingual = {
+        'rows': len(mixed),
+        'language_seconds': round(seconds, 3),
+        'rows_per_second': round(len(mixed) / seconds),
+        'accuracy': round(float((detected == truth).mean()), 5),
+        'languages': detected.value_counts().to_dict(),
+    }
+
+    print(json.dumps({'config': vars(args), 'english_only': english_only, 'multilingual': multilingual}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
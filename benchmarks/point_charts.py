@@ -0,0 +1,74 @@
+"""Build + serialization time and payload size of large point-level charts.
+
+Compares create_point_chart's large-data mode (Scattergl, downsampled to a
+point budget, row positions instead of hover text) against plotting every
+row with go.Scatter and per-row hover text, for a time series (LTTB) and a
+point cloud (grid aggregation).
+
+    python benchmarks/point_charts.py --sizes 100000,1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+import plotly.io as pio  # noqa: E402
+
+from components import clear_figure_cache, create_point_chart  # noqa: E402
+from data_processor import DataProcessor  # noqa: E402
+from reporters import Reporter  # noqa: E402
+
+VIEWS = {'time_series': ('Timestamp', True), 'point_cloud': ('Severity_Score', False)}
+
+
+def naive_point_chart(x, y, hover_text) -> go.Figure:
+    # Every row as an SVG point with its own hover text
+    return go.Figure(go.Scatter(x=x, y=y, mode='markers', text=hover_text, hoverinfo='text'))
+
+
+def _serialized(build) -> dict:
+    start = time.perf_counter()
+    fig = build()
+    spec = pio.to_json(fig.to_dict(), validate=False)
+    return {'seconds': round(time.perf_counter() - start, 3), 'json_kib': round(len(spec) / 1024)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='100000,1000000', help="Comma-separated row counts")
+    parser.add_argument('--budget', type=int, default=5_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-naive', action='store_true', help="Only time the large-data mode")
+    args = parser.parse_args()
+
+    processor = DataProcessor(reporter=Reporter())
+    results = []
+    for n_rows in [int(size) for size in args.sizes.split(',')]:
+        df = processor.create_synthetic_data(n_rows, seed=args.seed)
+        for view, (column, ordered) in VIEWS.items():
+            rows = np.argsort(df[column].to_numpy().view(np.int64)) if ordered else np.arange(len(df))
+            x = df[column].to_numpy()[rows]
+            y = df['Opportunity_Score'].to_numpy()[rows]
+            clear_figure_cache()
+            entry = {'rows': n_rows, 'view': view,
+                     'large_data_mode': _serialized(lambda: create_point_chart(
+                         x, y, view, column, 'Opportunity_Score', ordered=ordered, point_budget=args.budget))}
+            if not args.skip_naive:
+                hover_text = df['Feedback'].to_numpy()[rows]
+                entry['naive'] = _serialized(lambda: naive_point_chart(x, y, hover_text))
+                entry['speedup'] = round(entry['naive']['seconds'] / entry['large_data_mode']['seconds'], 1)
+            results.append(entry)
+            print(json.dumps(entry), file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Average input tokens per row before and after prompt compaction.
+
+Builds the categorize + summarize messages for a synthetic dataset twice:
+once with the original inline prompt templates and raw feedback text, and
+once the way AIAnalyzer builds them now (static system prefix, compacted
+feedback). Token counts use tiktoken when installed, ~4 chars/token
+otherwise.
+
+    python benchmarks/prompt_tokens.py --rows 10000 --long-text-rate 0.2
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ai_analyzer import AIAnalyzer, CATEGORIZE_SYSTEM_PROMPT, SUMMARIZE_SYSTEM_PROMPT  # noqa: E402
+from prompt_compaction import DEFAULT_MAX_FEEDBACK_TOKENS, _get_encoding, count_tokens  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from synthetic_data import generate_feedback  # noqa: E402
+
+# The prompts as they were before compaction, for comparison
+LEGACY_CATEGORIZE = (
+    "You are a business analyst specializing in product feedback categorization.",
+    """Categorize this customer feedback into exactly one of these three categories:
+
+1. Win Enterprise Deals
+2. Ensure Regulatory & Data Compliance
+3. Improve Platform Usability & Performance
+
+Feedback: "{feedback}"
+
+Respond with only the category name, nothing else:""",
+)
+LEGACY_SUMMARIZE = (
+    "You are a product management assistant specializing in concise business communication.",
+    """
+You are an AI assistant helping Product Managers quickly understand customer feedback.
+
+Your task: Create a concise, one-sentence executive summary that captures the core problem or request.
+
+Requirements:
+- Maximum 25 words
+- Focus on the specific issue or need, not generic descriptions
+- Use business-friendly language suitable for executive dashboards
+- Highlight the impact or urgency if mentioned
+- Be specific about what the customer needs or what's broken
+
+Feedback: "{feedback}"
+
+Executive Summary:""",
+)
+
+# Per-message overhead of the chat format (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _messages_tokens(messages) -> int:
+    return sum(count_tokens(m['content']) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def legacy_tokens(text: str) -> int:
+    total = 0
+    for system, template in (LEGACY_CATEGORIZE, LEGACY_SUMMARIZE):
+        total += _messages_tokens([{'content': system}, {'content': template.format(feedback=text)}])
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--long-text-rate', type=float, default=0.03,
+                        help="Share of rows with a pasted signature, quoted reply or stack trace")
+    parser.add_argument('--max-feedback-tokens', type=int, default=DEFAULT_MAX_FEEDBACK_TOKENS)
+    args = parser.parse_args()
+
+    df = generate_feedback(args.rows, seed=args.seed, long_text_rate=args.long_text_rate, missing_rate=0)
+    texts = df['Feedback'].tolist()
+    analyzer = AIAnalyzer(reporter=Reporter(), max_feedback_tokens=args.max_feedback_tokens)
+
+    before = sum(legacy_tokens(text) for text in texts)
+    start = time.perf_counter()
+    after = sum(_messages_tokens(analyzer._build_messages(CATEGORIZE_SYSTEM_PROMPT, text))
+                + _messages_tokens(analyzer._build_messages(SUMMARIZE_SYSTEM_PROMPT, text))
+                for text in texts)
+    build_seconds = time.perf_counter() - start
+    static_prefix = count_tokens(CATEGORIZE_SYSTEM_PROMPT) + count_tokens(SUMMARIZE_SYSTEM_PROMPT)
+
+    print(json.dumps({
+        'rows': len(texts),
+        'tokenizer': 'tiktoken' if _get_encoding() is not None else 'approx_4_chars',
+        'max_feedback_tokens': args.max_feedback_tokens,
+        'long_text_rate': args.long_text_rate,
+        'input_tokens_per_row_before': round(before / len(texts), 1),
+        'input_tokens_per_row_after': round(after / len(texts), 1),
+        'reduction_pct': round(100 * (1 - after / before), 1),
+        'static_prefix_tokens_per_row': static_prefix,
+        'prompt_build_us_per_row': round(build_seconds / len(texts) * 1e6, 2),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Bytes sent to the browser per dashboard rerun.
+
+Drives ``app.py`` headlessly with Streamlit's AppTest (welcome page, load
+sample data, process, an idle rerun, a filter change) and records every
+ForwardMsg the script enqueues. Streamlit replaces a cacheable message the
+browser already holds (same hash, at least ``global.minCachedMessageSize``
+bytes) with a short reference; the benchmark models a browser that keeps
+every cacheable message it was sent, so the totals are what goes over the
+websocket. Markdown/HTML element bytes are reported separately.
+
+    python benchmarks/rerun_payload.py
+    python benchmarks/rerun_payload.py --min-cached-bytes 10000   # Streamlit's default
+"""
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+APP_PATH = os.path.join(REPO_ROOT, 'app.py')
+
+
+class PayloadRecorder:
+    """Wraps ScriptRunContext.enqueue and tallies what would be sent"""
+
+    def __init__(self):
+        self.browser_hashes = set()
+        self.pending_hashes = set()
+        self.current = None
+
+    def install(self):
+        from streamlit.runtime.forward_msg_cache import create_reference_msg, populate_hash_if_needed
+        from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+
+        recorder = self
+        original = ScriptRunContext.enqueue
+
+        def enqueue(ctx, msg):
+            populate_hash_if_needed(msg)
+            if recorder.current is not None:
+                recorder.record(msg, create_reference_msg)
+            return original(ctx, msg)
+
+        ScriptRunContext.enqueue = enqueue
+
+    def record(self, msg, create_reference_msg):
+        stats = self.current
+        cached = msg.metadata.cacheable and msg.hash in self.browser_hashes
+        size = create_reference_msg(msg).ByteSize() if cached else msg.ByteSize()
+        stats['messages'] += 1
+        stats['bytes'] += size
+        stats['cached_refs'] += int(cached)
+        if msg.WhichOneof('type') == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+            element = msg.delta.new_element.WhichOneof('type')
+            if element == 'markdown' or element == 'html':
+                stats['markdown_bytes'] += size
+        if msg.metadata.cacheable:
+            self.pending_hashes.add(msg.hash)
+
+    def rerun(self, label, action):
+        self.current = {'messages': 0, 'bytes': 0, 'markdown_bytes': 0, 'cached_refs': 0}
+        try:
+            at = action()
+        finally:
+            stats, self.current = self.current, None
+            # The browser reports what it holds at the start of the next rerun
+            self.browser_hashes |= self.pending_hashes
+            self.pending_hashes = set()
+        errors = [e.message for e in at.exception]
+        return at, {'rerun': label, **stats, **({'errors': errors} if errors else {})}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--min-cached-bytes', type=int,
+                        help="Override global.minCachedMessageSize (default: .streamlit/config.toml)")
+    parser.add_argument('--timeout', type=float, default=120.0, help="AppTest per-run timeout, seconds")
+    args = parser.parse_args()
+
+    os.environ.pop('OPENAI_API_KEY', None)
+    # AppTest reads .streamlit/config.toml relative to the working directory
+    os.chdir(REPO_ROOT)
+    from streamlit import config
+    from streamlit.testing.v1 import AppTest
+    if args.min_cached_bytes is not None:
+        config.set_option('global.minCachedMessageSize', args.min_cached_bytes)
+
+    recorder = PayloadRecorder()
+    recorder.install()
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+
+    results = []
+    at, stats = recorder.rerun('welcome', at.run)
+    results.append(stats)
+    at, stats = recorder.rerun('load_sample', lambda: at.sidebar.button[1].click().run())
+    results.append(stats)
+    at, stats = recorder.rerun('process', lambda: [b for b in at.button if 'Process' in b.label][0].click().run())
+    results.append(stats)
+    at, stats = recorder.rerun('idle_rerun', at.run)
+    results.append(stats)
+    at, stats = recorder.rerun('filter_change', lambda: at.sidebar.multiselect[0].set_value(
+        at.sidebar.multiselect[0].value[:1]).run())
+    results.append(stats)
+
+    print(json.dumps({
+        'min_cached_message_size': int(config.get_option('global.minCachedMessageSize')),
+        'reruns': results,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Throughput and cost per 1k rows of each AI routing policy.
+
+Runs AIAnalyzer.process_batch over the same rows once per policy against
+the local mock LLM server, with a slower large model, and reports rows/sec,
+calls and estimated cost per model, plus the router's per-tier breakdown
+(rows settled, escalation reasons, latency). The mock's category replies
+are hash-based rather than real classifications, so this measures cost
+and speed, not accuracy; ``--response-shape mixed`` makes a quarter of
+the replies unusable so escalation paths get exercised.
+
+    python benchmarks/routing_policies.py --rows 2000 --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd  # noqa: E402
+
+from ai_analyzer import AIAnalyzer  # noqa: E402
+from metrics import MetricsRegistry, estimate_cost  # noqa: E402
+from mock_llm_server import RESPONSE_SHAPES, start_mock_server  # noqa: E402
+from model_routing import DEFAULT_CONFIDENCE_THRESHOLD, LARGE_MODEL, ROUTING_POLICIES, SMALL_MODEL, ModelRouter  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from synthetic_data import generate_feedback  # noqa: E402
+
+
+class _UsageByModel:
+    """Wraps client.chat.completions to tally calls, latency and tokens per model"""
+
+    def __init__(self, completions):
+        self._completions = completions
+        self._lock = threading.Lock()
+        self.models = {}
+
+    def create(self, **kwargs):
+        start = time.perf_counter()
+        response = self._completions.create(**kwargs)
+        elapsed = time.perf_counter() - start
+        usage = response.usage
+        with self._lock:
+            entry = self.models.setdefault(kwargs['model'], {'calls': 0, 'seconds': 0.0,
+                                                             'prompt_tokens': 0, 'completion_tokens': 0})
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+            if usage is not None:
+                entry['prompt_tokens'] += usage.prompt_tokens
+                entry['completion_tokens'] += usage.completion_tokens
+        return response
+
+    def summary(self, n_rows: int) -> dict:
+        result = {}
+        for model, entry in sorted(self.models.items()):
+            cost = estimate_cost(model, entry['prompt_tokens'], entry['completion_tokens'])
+            result[model] = {
+                'calls': entry['calls'],
+                'mean_latency_ms': round(entry['seconds'] / entry['calls'] * 1000, 2),
+                'cost_per_1k_rows_usd': round(cost / n_rows * 1000, 5),
+            }
+        return result
+
+
+def make_dataset(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    # Unique text per row so the result cache can't short-circuit anything
+    df = generate_feedback(n_rows, seed=seed, duplicate_rate=0, invalid_rate=0, variant_rate=0, missing_rate=0)
+    df['Feedback'] = df['Feedback'] + ' (ticket ' + pd.Series(range(n_rows)).astype(str) + ')'
+    return df
+
+
+def run_policy(server, df: pd.DataFrame, policy: str, workers: int, args) -> dict:
+    router = None
+    if ROUTING_POLICIES[policy]:
+        router = ModelRouter(policy, small_model=args.small_model, large_model=args.large_model,
+                             confidence_threshold=args.confidence)
+    analyzer = AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url,
+                          metrics_registry=MetricsRegistry(), router=router)
+    analyzer.RETRY_BACKOFF_BASE = 0.01
+    usage = _UsageByModel(analyzer.client.chat.completions)
+    analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=usage))
+
+    start = time.perf_counter()
+    analyzer.process_batch(df, show_progress=False, max_workers=workers, request_interval=0)
+    elapsed = time.perf_counter() - start
+
+    n_rows = len(df)
+    models = usage.summary(n_rows)
+    result = {
+        'policy': policy,
+        'rows': n_rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(n_rows / elapsed, 1),
+        'api_calls_per_row': round(sum(m['calls'] for m in models.values()) / n_rows, 3),
+        'cost_per_1k_rows_usd': round(sum(m['cost_per_1k_rows_usd'] for m in models.values()), 5),
+        'models': models,
+    }
+    if router is not None:
+        result['routing'] = router.to_dict()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--policies', default=','.join(ROUTING_POLICIES), help="Comma-separated policies")
+    parser.add_argument('--small-model', default=SMALL_MODEL)
+    parser.add_argument('--large-model', default=LARGE_MODEL)
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE_THRESHOLD,
+                        help="Escalation threshold")
+    parser.add_argument('--latency', type=float, default=0.05, help="Mock latency of AIAnalyzer.MODEL, seconds")
+    parser.add_argument('--small-latency', type=float, default=0.04)
+    parser.add_argument('--large-latency', type=float, default=0.15)
+    parser.add_argument('--response-shape', choices=RESPONSE_SHAPES, default='mixed')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency, response_shape=args.response_shape, seed=args.seed,
+                               model_latency={args.small_model: args.small_latency,
+                                              args.large_model: args.large_latency})
+    df = make_dataset(args.rows, args.seed)
+    try:
+        results = [run_policy(server, df, policy, args.workers, args) for policy in args.policies.split(',')]
+    finally:
+        server.shutdown()
+
+    print(json.dumps({'config': vars(args), 'results': results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
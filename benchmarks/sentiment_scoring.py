@@ -0,0 +1,103 @@
+"""Lexicon sentiment and urgency throughput on a large synthetic frame.
+
+Times SentimentScorer over ``--rows`` validated synthetic rows (the
+``sentiment`` stage of cli.py), then scoring with the sentiment and
+urgency factors switched on, and a pure-Python ``re`` loop over the same
+texts for comparison (on ``--python-rows`` rows, scaled up). Exits with 1
+if the stage takes longer than ``--budget-seconds``. Optionally rates the
+rows the lexicon found nothing in through the local mock LLM server.
+
+    python benchmarks/sentiment_scoring.py --rows 1000000 --refine 200
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+
+from ai_analyzer import AIAnalyzer  # noqa: E402
+from data_processor import DataProcessor  # noqa: E402
+from metrics import MetricsRegistry  # noqa: E402
+from mock_llm_server import start_mock_server  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from scoring import ScoringEngine  # noqa: E402
+from sentiment import SENTIMENT_LEXICON, URGENCY_LEXICON, unscored_rows  # noqa: E402
+from synthetic_data import generate_feedback  # noqa: E402
+
+WEIGHTS = {'sentiment': {'weight': -2}, 'urgency': {'weight': 3}}
+
+
+def python_loop(texts) -> float:
+    # One compiled alternation per lexicon, matched row by row
+    patterns = [(re.compile(r'\b(?:' + '|'.join(map(re.escape, lexicon)) + ')', re.IGNORECASE), lexicon)
+                for lexicon in (SENTIMENT_LEXICON, URGENCY_LEXICON)]
+    start = time.perf_counter()
+    for text in texts:
+        if isinstance(text, str):
+            for pattern, lexicon in patterns:
+                sum(lexicon.get(match.lower(), 0) for match in pattern.findall(text))
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--python-rows', type=int, default=100_000, help="Rows for the pure-Python comparison")
+    parser.add_argument('--budget-seconds', type=float, default=60.0)
+    parser.add_argument('--refine', type=int, default=0, help="Texts to rate through the mock LLM server")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    processor = DataProcessor(reporter=Reporter(), scoring=ScoringEngine().with_weights(**WEIGHTS))
+    df = processor._validate_and_clean_data(generate_feedback(args.rows, seed=args.seed))
+
+    start = time.perf_counter()
+    scored = processor.analyze_sentiment(df)
+    seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    scored = processor.calculate_opportunity_score(scored)
+    score_seconds = time.perf_counter() - start
+
+    python_rows = min(args.python_rows, len(df))
+    python_seconds = python_loop(df['Feedback'].iloc[:python_rows].tolist()) * len(df) / max(python_rows, 1)
+
+    unscored = unscored_rows(scored)
+    results = {
+        'rows': len(df),
+        'sentiment_seconds': round(seconds, 3),
+        'rows_per_second': round(len(df) / seconds),
+        'score_with_sentiment_seconds': round(score_seconds, 3),
+        'python_re_seconds_estimate': round(python_seconds, 1),
+        'speedup': round(python_seconds / seconds, 1),
+        'within_budget': seconds <= args.budget_seconds,
+        'sentiment_mean': round(float(scored['Sentiment'].mean()), 3),
+        'urgency_mean': round(float(scored['Urgency'].mean()), 3),
+        'unscored_rows': int(unscored.sum()),
+        'score_corr_urgency': round(float(np.corrcoef(scored['Urgency'], scored['Opportunity_Score'])[0, 1]), 3),
+    }
+
+    if args.refine:
+        server = start_mock_server(seed=args.seed)
+        try:
+            analyzer = AIAnalyzer(reporter=Reporter(), api_key='mock', base_url=server.base_url,
+                                  metrics_registry=MetricsRegistry())
+            start = time.perf_counter()
+            refined = analyzer.refine_sentiment(scored, args.refine, max_workers=8, show_progress=False)
+            results['refine'] = {'seconds': round(time.perf_counter() - start, 3),
+                                 'api_requests': server.stats()['requests'],
+                                 'unscored_rows_after': int(unscored_rows(refined).sum())}
+        finally:
+            server.shutdown()
+
+    print(json.dumps({'config': vars(args), 'results': results}, indent=2))
+    return 0 if results['within_budget'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Time to style the feedback table: vectorized CSS vs per-cell applymap.
+
+Styles a processed synthetic frame with the previous implementation
+(three cell-wise passes; ``Styler.applymap`` was removed in pandas 3, so
+it runs through its replacement ``Styler.map``) and with the current
+vectorized one, on the full frame and on the single page the dashboard
+shows. ``--marshal`` also renders the Styler the way st.dataframe does,
+which costs the same per styled cell for both implementations.
+
+    python benchmarks/table_styling.py --rows 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+
+from components import TABLE_PAGE_ROWS, style_dataframe_robinhood  # noqa: E402
+from data_processor import DataProcessor  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from styles import get_chart_colors, get_opportunity_score_color, get_severity_color  # noqa: E402
+from synthetic_data import CATEGORIES  # noqa: E402
+
+DISPLAY_COLUMNS = ['Feedback', 'AI_Category', 'Product', 'Severity', 'Region', 'Opportunity_Score']
+
+
+def legacy_style(df):
+    # The implementation before vectorized styling, for comparison
+    def severity_styler(val):
+        color = get_severity_color(val)
+        return f'background-color: {color}15; color: {color}; font-weight: 600;'
+
+    def score_styler(val):
+        color = get_opportunity_score_color(val)
+        return f'background-color: {color}15; color: {color}; font-weight: 600;'
+
+    def category_styler(val):
+        colors = get_chart_colors()
+        if "Enterprise" in val:
+            color = colors['primary']
+        elif "Compliance" in val:
+            color = colors['secondary']
+        else:
+            color = colors['tertiary']
+        return f'background-color: {color}15; color: {color}; font-weight: 500;'
+
+    styled_df = df.style
+    styled_df = styled_df.map(severity_styler, subset=['Severity'])
+    styled_df = styled_df.map(score_styler, subset=['Opportunity_Score'])
+    styled_df = styled_df.map(category_styler, subset=['AI_Category'])
+    return styled_df
+
+
+def _timed(style, df, marshal: bool) -> dict:
+    start = time.perf_counter()
+    styler = style(df)
+    # Styler is lazy; _compute runs the styling functions
+    styler._compute()
+    seconds = time.perf_counter() - start
+    result = {'rows': len(df), 'style_seconds': round(seconds, 4)}
+    if marshal:
+        start = time.perf_counter()
+        styler._translate(False, False)
+        result['marshal_seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--marshal', action='store_true', help="Also time Styler rendering (slow)")
+    args = parser.parse_args()
+
+    df = DataProcessor(reporter=Reporter()).create_synthetic_data(args.rows, seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    df['AI_Category'] = np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), len(df))]
+    table = df[DISPLAY_COLUMNS]
+
+    current = style_dataframe_robinhood
+    results = {
+        'legacy_full': _timed(legacy_style, table, args.marshal),
+        'current_full': _timed(current, table, args.marshal),
+        'current_page': _timed(current, table.iloc[:TABLE_PAGE_ROWS], args.marshal),
+    }
+    results['speedup_full'] = round(results['legacy_full']['style_seconds'] / results['current_full']['style_seconds'], 1)
+    results['speedup_page'] = round(results['legacy_full']['style_seconds'] / results['current_page']['style_seconds'], 1)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
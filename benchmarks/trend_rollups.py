@@ -0,0 +1,103 @@
+"""Build time and query latency of the daily/weekly trend rollups.
+
+Builds rollups once from a scored synthetic frame with a year of
+timestamps, then times trend queries (each breakdown, with and without
+filters, count and average score) against the same query answered by a
+groupby over the row-level frame.
+
+    python benchmarks/trend_rollups.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from data_processor import DataProcessor  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from rollups import build_rollups  # noqa: E402
+from synthetic_data import CATEGORIES, generate_feedback  # noqa: E402
+
+QUERIES = [
+    {'by': None, 'filters': {}, 'value': 'count'},
+    {'by': 'AI_Category', 'filters': {}, 'value': 'count'},
+    {'by': 'Product', 'filters': {'Region': ['US', 'EU']}, 'value': 'count'},
+    {'by': 'Region', 'filters': {'Severity': ['Critical']}, 'value': 'avg_score'},
+]
+
+
+def make_frame(n_rows: int, block_rows: int, seed: int) -> pd.DataFrame:
+    processor = DataProcessor(reporter=Reporter())
+    block = processor._validate_and_clean_data(generate_feedback(min(n_rows, block_rows), seed=seed))
+    repeats = -(-n_rows // len(block))
+    df = pd.concat([block] * repeats, ignore_index=True).iloc[:n_rows]
+    rng = np.random.default_rng(seed)
+    df['AI_Category'] = pd.Categorical.from_codes(rng.integers(0, len(CATEGORIES), len(df)), CATEGORIES)
+    return processor.calculate_opportunity_score(df)
+
+
+def frame_query(df: pd.DataFrame, freq: str, by, filters: dict, value: str) -> pd.DataFrame:
+    # The same trend computed from the rows, as a chart without rollups would
+    mask = np.ones(len(df), dtype=bool)
+    for column, allowed in filters.items():
+        mask &= df[column].isin(allowed).to_numpy()
+    rows = df.loc[mask]
+    keys = [rows['Timestamp'].dt.to_period(freq)] + ([rows[by]] if by else [])
+    grouped = rows.groupby(keys, observed=True)['Opportunity_Score']
+    result = grouped.size() if value == 'count' else grouped.mean()
+    return result.unstack(fill_value=0) if by else result
+
+
+def _best_of(repeats: int, func, *args, **kwargs) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--block-rows', type=int, default=1_000_000,
+                        help="Rows generated before tiling up to --rows")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-frame', action='store_true', help="Only time the rollup queries")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.block_rows, args.seed)
+
+    start = time.perf_counter()
+    rollups = build_rollups(df)
+    build_seconds = time.perf_counter() - start
+
+    results = {
+        'rows': len(df),
+        'build_seconds': round(build_seconds, 3),
+        'rollups': {freq: {'periods': r.n_periods, 'cells': r.n_cells, 'kib': round(r.nbytes / 1024, 1)}
+                    for freq, r in rollups.items()},
+        'queries': [],
+    }
+    for query in QUERIES:
+        for freq, period_freq in [('D', 'D'), ('W', 'W')]:
+            entry = {'freq': freq, **query}
+            entry['rollup_ms'] = round(_best_of(args.repeats, rollups[freq].series, **query) * 1000, 2)
+            if not args.skip_frame:
+                entry['frame_ms'] = round(_best_of(args.repeats, frame_query, df, period_freq, **query) * 1000, 1)
+                entry['speedup'] = round(entry['frame_ms'] / entry['rollup_ms'])
+            results['queries'].append(entry)
+
+    print(json.dumps(results, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
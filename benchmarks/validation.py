@@ -0,0 +1,80 @@
+"""Rows/sec of DataProcessor._validate_and_clean_data on large raw inputs.
+
+Builds a messy synthetic frame (aliases, variant spellings, invalid and
+missing values) by tiling a generated block, then times the lookup-table
+normalizer against the previous dropna + .str + isin implementation.
+Timestamp parsing and PII redaction, which the loaders also run in
+``_validate_and_clean_data``, are left out on both sides: the frame has no
+Timestamp column and the processor's redactor has no rules.
+
+    python benchmarks/validation.py --rows 10000000
+    python benchmarks/validation.py --rows 1000000 --skip-legacy
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd  # noqa: E402
+
+from data_processor import DataProcessor  # noqa: E402
+from pii_redaction import DEFAULT_PATTERNS, PIIRedactor  # noqa: E402
+from reporters import Reporter  # noqa: E402
+from synthetic_data import generate_feedback  # noqa: E402
+
+
+def legacy_validate(df: pd.DataFrame, processor: DataProcessor) -> pd.DataFrame:
+    # The implementation before lookup-table normalization, for comparison
+    df = df.dropna(subset=processor.REQUIRED_COLUMNS)
+    df['Severity'] = df['Severity'].str.strip().str.title()
+    df['Region'] = df['Region'].str.strip().str.upper()
+    invalid_severities = df[~df['Severity'].isin(processor.SEVERITY_SCORES.keys())]
+    if not invalid_severities.empty:
+        df.loc[~df['Severity'].isin(processor.SEVERITY_SCORES.keys()), 'Severity'] = 'Medium'
+    invalid_regions = df[~df['Region'].isin(processor.REGION_SCORES.keys())]
+    if not invalid_regions.empty:
+        df.loc[~df['Region'].isin(processor.REGION_SCORES.keys()), 'Region'] = 'APAC'
+    return df
+
+
+def make_raw_frame(n_rows: int, block_rows: int, seed: int) -> pd.DataFrame:
+    block = generate_feedback(min(n_rows, block_rows), seed=seed, days=0)
+    repeats = -(-n_rows // len(block))
+    return pd.concat([block] * repeats, ignore_index=True).iloc[:n_rows]
+
+
+def _timed(func, *args) -> dict:
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    return {'seconds': round(seconds, 3), 'rows_per_sec': round(len(args[0]) / seconds), 'rows_out': len(result)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--block-rows', type=int, default=1_000_000,
+                        help="Rows generated before tiling up to --rows")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-legacy', action='store_true', help="Only time the current implementation")
+    args = parser.parse_args()
+
+    raw = make_raw_frame(args.rows, args.block_rows, args.seed)
+    processor = DataProcessor(reporter=Reporter(), redactor=PIIRedactor(patterns=dict.fromkeys(DEFAULT_PATTERNS)))
+
+    results = {'rows': len(raw), 'current': _timed(processor._validate_and_clean_data, raw)}
+    results['report'] = processor.validation_report.to_dict()
+    if not args.skip_legacy:
+        results['legacy'] = _timed(legacy_validate, raw, processor)
+        results['speedup'] = round(results['legacy']['seconds'] / results['current']['seconds'], 1)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
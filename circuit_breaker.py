@@ -0,0 +1,109 @@
+"""Consecutive-failure circuit breaker for the OpenAI path.
+
+While the API is down, retrying every row with exponential backoff turns a
+batch into hours of sleeping. After ``failure_threshold`` consecutive
+failed calls the breaker opens and calls fail immediately with
+``CircuitOpenError``. Callers use a local fallback instead. Once
+``reset_timeout`` seconds have passed, a single probe call is let through
+(half-open). If it succeeds the breaker closes; if it fails the breaker
+stays open for another ``reset_timeout``.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+
+# Gauge values for feedback_ai_circuit_state
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the breaker is open"""
+
+
+class CircuitBreaker:
+    """Thread-safe; one instance is shared by every call through an analyzer"""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        # A threshold of 0 disables the breaker
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may go out now; counts the ones that may not"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failed call; True if this one opened the breaker"""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN:
+                # Failed probe: wait another reset_timeout before the next one
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+                return False
+            if (self._state == CLOSED and self.failure_threshold > 0
+                    and self._consecutive_failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self.times_opened += 1
+                return True
+            return False
+
+    @property
+    def probe_in_flight(self) -> bool:
+        """Half-open with the probe call taken; other calls short-circuit until it reports"""
+        with self._lock:
+            return self._state == HALF_OPEN and self._probe_in_flight
+
+    def seconds_until_probe(self) -> Optional[float]:
+        with self._lock:
+            if self._state != OPEN:
+                return None
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'times_opened': self.times_opened,
+                'short_circuited': self.short_circuited,
+            }
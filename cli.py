@@ -0,0 +1,231 @@
+"""Headless batch pipeline: load CSV -> redact PII -> language -> sentiment -> score -> AI analysis -> export.
+
+Runs the same DataProcessor/AIAnalyzer code as the dashboard without
+importing Streamlit or Plotly. Progress and per-stage timings are written
+to stderr as JSON lines so a scheduler can parse them.
+
+    python cli.py feedback.csv -o results.parquet --workers 8 --cache .ai_cache.json
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+import instrumentation
+from ai_analyzer import AIAnalyzer
+from batch_api import DEFAULT_POLL_SECONDS, BatchJob, BatchTimeoutError
+from circuit_breaker import DEFAULT_FAILURE_THRESHOLD, DEFAULT_RESET_TIMEOUT, CircuitBreaker
+from data_processor import DataProcessor
+from metrics import REGISTRY, start_metrics_server
+from model_routing import DEFAULT_CONFIDENCE_THRESHOLD, LARGE_MODEL, ROUTING_POLICIES, SMALL_MODEL, ModelRouter
+from pii_redaction import PIIRedactor
+from prompt_compaction import DEFAULT_MAX_FEEDBACK_TOKENS
+from reporters import JsonLinesReporter, Reporter
+from reprocessing import ReprocessingQueue
+from result_cache import ResultCache
+from scoring import ScoringEngine
+
+OUTPUT_FORMATS = ['csv', 'jsonl', 'parquet']
+
+# Exit code while a Batch API job is still running (EX_TEMPFAIL); rerun to resume
+BATCH_PENDING_EXIT_CODE = 75
+
+
+def _infer_format(output_path: str) -> str:
+    for fmt in OUTPUT_FORMATS:
+        if output_path.endswith('.' + fmt):
+            return fmt
+    if output_path.endswith('.json'):
+        return 'jsonl'
+    return 'csv'
+
+
+def export(df, output_path: str, fmt: str):
+    if fmt == 'csv':
+        df.to_csv(output_path, index=False)
+    elif fmt == 'jsonl':
+        df.to_json(output_path, orient='records', lines=True, force_ascii=False)
+    elif fmt == 'parquet':
+        df.to_parquet(output_path, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the feedback analysis pipeline without the dashboard.")
+    parser.add_argument('input', help="Input CSV with Feedback, Product, Severity and Region columns")
+    parser.add_argument('-o', '--output', required=True, help="Output file path")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="Output format (default: inferred from extension)")
+    parser.add_argument('--workers', type=int, default=1, help="Concurrent AI requests (default: 1)")
+    parser.add_argument('--request-interval', type=float, default=0.5,
+                        help="Seconds each worker waits between rows (default: 0.5)")
+    parser.add_argument('--max-feedback-tokens', type=int, default=DEFAULT_MAX_FEEDBACK_TOKENS,
+                        help="Token budget for each feedback text after boilerplate stripping; 0 disables truncation "
+                             f"(default: {DEFAULT_MAX_FEEDBACK_TOKENS})")
+    parser.add_argument('--scoring-config', help="JSON file with opportunity-score weights and factors "
+                                                 "(default: $FEEDBACK_SCORING_CONFIG or built-in weights)")
+    parser.add_argument('--pii-config', help="JSON file with PII dictionaries and pattern overrides "
+                                              "(default: $FEEDBACK_PII_CONFIG or built-in patterns)")
+    parser.add_argument('--routing', choices=list(ROUTING_POLICIES), default='single',
+                        help="'single' sends every call to one model; 'cascade' tries the local keyword "
+                             "classifier, then the small model, then the large one (default: single)")
+    parser.add_argument('--small-model', default=SMALL_MODEL, help=f"Small routing tier (default: {SMALL_MODEL})")
+    parser.add_argument('--large-model', default=LARGE_MODEL, help=f"Large routing tier (default: {LARGE_MODEL})")
+    parser.add_argument('--escalation-confidence', type=float, default=DEFAULT_CONFIDENCE_THRESHOLD,
+                        help="Escalate to the next tier below this category confidence "
+                             f"(default: {DEFAULT_CONFIDENCE_THRESHOLD})")
+    parser.add_argument('--breaker-failures', type=int, default=DEFAULT_FAILURE_THRESHOLD,
+                        help="Consecutive API failures before falling back to local analysis; 0 disables "
+                             f"(default: {DEFAULT_FAILURE_THRESHOLD})")
+    parser.add_argument('--breaker-reset-seconds', type=float, default=DEFAULT_RESET_TIMEOUT,
+                        help=f"Seconds before probing the API again (default: {DEFAULT_RESET_TIMEOUT:g})")
+    parser.add_argument('--reprocess-timeout', type=float, default=0.0,
+                        help="Seconds to keep retrying rows that fell back or failed before exporting (default: 0)")
+    parser.add_argument('--batch-dir', help="Send AI requests through the OpenAI Batch API, keeping the job's "
+                                            "files and state in this directory; rerun with it to resume")
+    parser.add_argument('--batch-poll-seconds', type=float, default=DEFAULT_POLL_SECONDS,
+                        help=f"Seconds between Batch API status checks (default: {DEFAULT_POLL_SECONDS:g})")
+    parser.add_argument('--batch-timeout', type=float,
+                        help=f"Stop waiting for the Batch API after this many seconds and exit with "
+                             f"{BATCH_PENDING_EXIT_CODE} (default: wait until done)")
+    parser.add_argument('--refine-sentiment', type=int, default=0, metavar='N',
+                        help="Ask the model to rate up to N distinct texts the sentiment lexicon found no terms in "
+                             "(default: 0)")
+    parser.add_argument('--cache', help="JSON file used to cache AI results between runs")
+    parser.add_argument('--sample-ai', action='store_true', help="Skip the OpenAI API and use sample AI data")
+    parser.add_argument('--no-progress', action='store_true', help="Don't emit per-row progress events")
+    parser.add_argument('--metrics-port', type=int, help="Serve Prometheus metrics on this port while running")
+    parser.add_argument('--metrics-file', help="Write Prometheus metrics to this file when done")
+    parser.add_argument('--perf', action='store_true', help="Emit a per-method timing breakdown when done")
+    parser.add_argument('--profile', choices=instrumentation.PROFILERS, help="Print a profiler report to stderr")
+    return parser
+
+
+def run(args: argparse.Namespace, reporter: Reporter) -> int:
+    timings = {}
+    started = time.perf_counter()
+
+    stage_start = time.perf_counter()
+    scoring = ScoringEngine.from_file(args.scoring_config) if args.scoring_config else None
+    redactor = PIIRedactor.from_file(args.pii_config) if args.pii_config else None
+    data_processor = DataProcessor(reporter=reporter, scoring=scoring, redactor=redactor)
+    df = data_processor.load_csv(args.input)
+    timings['load'] = time.perf_counter() - stage_start
+    reporter.event('stage', stage='load', seconds=round(timings['load'], 4), rows=len(df))
+    if data_processor.validation_report is not None:
+        reporter.event('validation', **data_processor.validation_report.to_dict())
+    if data_processor.redaction_report is not None:
+        reporter.event('redaction', **data_processor.redaction_report.to_dict())
+    if df.empty:
+        reporter.error("No valid rows loaded; nothing to process.")
+        return 1
+
+    stage_start = time.perf_counter()
+    df = data_processor.detect_language(df)
+    timings['language'] = time.perf_counter() - stage_start
+    reporter.event('stage', stage='language', seconds=round(timings['language'], 4), rows=len(df),
+                   languages=df['Language'].value_counts().to_dict())
+    
+    stage_start = time.perf_counter()
+    df = data_processor.analyze_sentiment(df)
+    timings['sentiment'] = time.perf_counter() - stage_start
+    reporter.event('stage', stage='sentiment', seconds=round(timings['sentiment'], 4), rows=len(df))
+    
+    stage_start = time.perf_counter()
+    df = data_processor.calculate_opportunity_score(df)
+    timings['score'] = time.perf_counter() - stage_start
+    reporter.event('stage', stage='score', seconds=round(timings['score'], 4), rows=len(df))
+
+    stage_start = time.perf_counter()
+    cache = ResultCache(args.cache) if args.cache else None
+    router = None
+    if args.routing != 'single':
+        router = ModelRouter(args.routing, small_model=args.small_model, large_model=args.large_model,
+                             confidence_threshold=args.escalation_confidence)
+    ai_analyzer = AIAnalyzer(reporter=reporter, cache=cache,
+                             max_feedback_tokens=args.max_feedback_tokens or None, router=router,
+                             circuit_breaker=CircuitBreaker(args.breaker_failures, args.breaker_reset_seconds),
+                             redactor=data_processor.redactor)
+    if args.batch_dir and ai_analyzer.is_configured() and not args.sample_ai:
+        batch_job = BatchJob(ai_analyzer, args.batch_dir, poll_seconds=args.batch_poll_seconds)
+        try:
+            df = batch_job.run(df, timeout=args.batch_timeout, show_progress=not args.no_progress)
+        except BatchTimeoutError as e:
+            reporter.event('batch', state='pending', **batch_job.to_dict())
+            reporter.warning(str(e))
+            return BATCH_PENDING_EXIT_CODE
+        reporter.event('batch', state='merged', **batch_job.to_dict())
+    else:
+        df = ai_analyzer.process_batch(df, show_progress=not args.no_progress,
+                                       max_workers=args.workers,
+                                       request_interval=args.request_interval,
+                                       use_sample_data=args.sample_ai)
+    refined = args.refine_sentiment > 0 and ai_analyzer.is_configured() and not args.sample_ai
+    if refined:
+        df = ai_analyzer.refine_sentiment(df, args.refine_sentiment, max_workers=args.workers,
+                                          show_progress=not args.no_progress)
+    if data_processor.scoring.uses_column('AI_Category') or refined:
+        # Category weights can only apply once the AI columns exist
+        df = data_processor.calculate_opportunity_score(df)
+    if args.reprocess_timeout > 0 and ai_analyzer.is_configured() and not args.sample_ai:
+        queue = ReprocessingQueue(ai_analyzer)
+        if queue.enqueue(df):
+            queue.wait(args.reprocess_timeout)
+            queue.stop()
+            df, _ = data_processor.apply_ai_updates(df, queue.drain())
+            reporter.event('reprocess', **queue.to_dict())
+    timings['ai'] = time.perf_counter() - stage_start
+    ai_fields = {'seconds': round(timings['ai'], 4), 'rows': len(df)}
+    if cache is not None:
+        ai_fields.update(cache_hits=cache.hits, cache_misses=cache.misses)
+    if 'AI_Status' in df.columns:
+        status_counts = df['AI_Status'].value_counts()
+        ai_fields.update(fallback_rows=int(status_counts.get(AIAnalyzer.STATUS_FALLBACK, 0)),
+                         failed_rows=int(status_counts.get(AIAnalyzer.STATUS_FAILED, 0)),
+                         circuit=ai_analyzer.circuit_breaker.to_dict())
+    reporter.event('stage', stage='ai', **ai_fields)
+    if router is not None:
+        reporter.event('routing', **router.to_dict())
+
+    stage_start = time.perf_counter()
+    fmt = args.format or _infer_format(args.output)
+    export(df, args.output, fmt)
+    timings['export'] = time.perf_counter() - stage_start
+    reporter.event('stage', stage='export', seconds=round(timings['export'], 4), rows=len(df), format=fmt)
+
+    reporter.event('done', seconds=round(time.perf_counter() - started, 4), rows=len(df), output=args.output)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch_dir and args.routing != 'single':
+        parser.error("--batch-dir sends every row to one model and cannot be combined with --routing")
+    reporter = JsonLinesReporter(sys.stderr)
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+        reporter.event('metrics', url=f"http://127.0.0.1:{args.metrics_port}/metrics")
+    try:
+        return _run_instrumented(args, reporter)
+    finally:
+        if args.metrics_file:
+            REGISTRY.write(args.metrics_file)
+
+
+def _run_instrumented(args: argparse.Namespace, reporter: Reporter) -> int:
+    if not (args.perf or args.profile):
+        return run(args, reporter)
+
+    instrumentation.enable()
+    with instrumentation.run('cli') as record, instrumentation.profiled(args.profile) as profile:
+        exit_code = run(args, reporter)
+    # Worker-thread spans (per-row AI calls) are collected separately
+    reporter.event('spans', run=record.to_dict(), workers=instrumentation.background.to_dict())
+    if profile['report']:
+        sys.stderr.write(profile['report'])
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,15 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
-from styles import RobinhoodColors, get_severity_color, get_opportunity_score_color, get_chart_colors
+from downsampling import DEFAULT_POINT_BUDGET, downsample_points
+from instrumentation import timed
+from styles import minify_html, RobinhoodColors, get_severity_color, get_opportunity_score_color, get_chart_colors
 
-def render_robinhood_header():
-    """Render the main header with Robinhood-inspired design"""
-    st.markdown("""
+_ROBINHOOD_HEADER_HTML = minify_html("""
     <div class="robinhood-header">
         <div style="position: relative; z-index: 1;">
             <h1 class="header-title">
@@ -21,7 +23,11 @@ def render_robinhood_header():
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """)
+
+def render_robinhood_header():
+    """Render the main header with Robinhood-inspired design"""
+    st.markdown(_ROBINHOOD_HEADER_HTML, unsafe_allow_html=True)
 
 def render_metric_card(label, value, delta=None, delta_type="neutral", help_text=None, icon="📊"):
     """Render a financial-style metric card using Streamlit native components"""
@@ -50,8 +56,106 @@ def render_metric_card(label, value, delta=None, delta_type="neutral", help_text
                 help=help_text
             )
 
+# Figures are memoized on their aggregated inputs (a few dozen counts), so a
+# rerun with unchanged data reuses both the figure and its serialized spec
+FIGURE_CACHE_SIZE = 64
+_figure_cache = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+def _input_signature(value):
+    """Hashable, content-based stand-in for a chart input"""
+    if isinstance(value, pd.DataFrame):
+        return ('DataFrame', tuple(value.columns), tuple(value.itertuples(index=False, name=None)))
+    if isinstance(value, pd.Series):
+        return ('Series', value.name, tuple(value.index), tuple(value.to_numpy()))
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        if data.dtype.kind != 'O' and data.size > 1024:
+            # Point-level inputs: a digest rather than megabytes of key
+            return ('ndarray', data.dtype.str, data.shape, hashlib.blake2b(data.view(np.uint8), digest_size=16).digest())
+        return ('ndarray', data.dtype.str, data.shape, data.tobytes() if data.dtype.kind != 'O' else tuple(data))
+    if isinstance(value, (list, tuple)):
+        return tuple(_input_signature(item) for item in value)
+    return value
+
+@functools.lru_cache(maxsize=None)
+def _frozen_figure_class():
+    """go.Figure whose to_dict decodes the JSON spec taken when it was cached"""
+    import json
+    import plotly.graph_objects as go
+
+    class FrozenFigure(go.Figure):
+        def to_dict(self):
+            # A fresh dict per call: st.plotly_chart strips trace uids from
+            # the dict in place, and the figure is shared across sessions
+            return json.loads(self._frozen_spec)
+
+    return FrozenFigure
+
+def _freeze_figure(fig):
+    # Serialize once; each render then decodes the spec instead of walking
+    # and deep-copying the figure's properties. st.plotly_chart still
+    # re-encodes the decoded dict, which is cheap for plain lists and dicts
+    import plotly.io
+    spec = plotly.io.to_json(fig.to_dict(), validate=False)
+    fig.__class__ = _frozen_figure_class()
+    fig._frozen_spec = spec
+    return fig
+
+def memoized_figure(builder):
+    """Cache a figure builder's result on the content of its arguments"""
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        key = (builder.__name__, _input_signature(args), _input_signature(sorted(kwargs.items())))
+        with _figure_cache_lock:
+            fig = _figure_cache.get(key)
+            if fig is not None:
+                _figure_cache.move_to_end(key)
+                return fig
+        fig = _freeze_figure(builder(*args, **kwargs))
+        with _figure_cache_lock:
+            _figure_cache[key] = fig
+            while len(_figure_cache) > FIGURE_CACHE_SIZE:
+                _figure_cache.popitem(last=False)
+        return fig
+    return wrapper
+
+def clear_figure_cache():
+    with _figure_cache_lock:
+        _figure_cache.clear()
+
+@functools.lru_cache(maxsize=None)
+def robinhood_chart_template():
+    """The active default template plus the styling every chart shares, built once"""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    # Importing streamlit registers and selects its own 'streamlit' template
+    template = go.layout.Template(pio.templates[pio.templates.default])
+    axis = dict(
+        gridcolor=RobinhoodColors.MEDIUM_GRAY,
+        gridwidth=1,
+        zeroline=False,
+        tickfont=dict(family="Inter, sans-serif", color=RobinhoodColors.PRIMARY_TEXT)
+    )
+    template.layout.update(
+        title=dict(
+            font=dict(family="Inter, sans-serif", size=16, color=RobinhoodColors.PRIMARY_TEXT),
+            x=0.5
+        ),
+        font=dict(family="Inter, sans-serif", color=RobinhoodColors.PRIMARY_TEXT),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=50, b=50, l=50, r=50),
+        xaxis=axis,
+        yaxis=axis
+    )
+    return template
+
+@timed()
+@memoized_figure
 def create_robinhood_donut_chart(data, title, names_col, values_col):
     """Create a Robinhood-style donut chart"""
+    import plotly.graph_objects as go
     colors = get_chart_colors()
     
     # Create color palette based on data
@@ -87,15 +191,8 @@ def create_robinhood_donut_chart(data, title, names_col, values_col):
     )
     
     fig.update_layout(
-        title=dict(
-            text=title,
-            font=dict(
-                family="Inter, sans-serif",
-                size=16,
-                color=RobinhoodColors.PRIMARY_TEXT
-            ),
-            x=0.5
-        ),
+        template=robinhood_chart_template(),
+        title_text=title,
         showlegend=True,
         legend=dict(
             orientation="h",
@@ -110,15 +207,16 @@ def create_robinhood_donut_chart(data, title, names_col, values_col):
             )
         ),
         margin=dict(t=50, b=80, l=20, r=20),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
         height=400
     )
     
     return fig
 
+@timed()
+@memoized_figure
 def create_robinhood_bar_chart(data, title, x_col, y_col, orientation='h'):
     """Create a Robinhood-style bar chart"""
+    import plotly.express as px
     colors = get_chart_colors()
     
     if orientation == 'h':
@@ -150,34 +248,12 @@ def create_robinhood_bar_chart(data, title, x_col, y_col, orientation='h'):
         )
     
     fig.update_layout(
-        title=dict(
-            text=title,
-            font=dict(
-                family="Inter, sans-serif",
-                size=16,
-                color=RobinhoodColors.PRIMARY_TEXT
-            ),
-            x=0.5
-        ),
+        template=robinhood_chart_template(),
+        title_text=title,
         showlegend=False,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
+        # px sets its own top margin, which would override the template's
         margin=dict(t=50, b=50, l=50, r=50),
-        height=400,
-        font=dict(
-            family="Inter, sans-serif",
-            color=RobinhoodColors.PRIMARY_TEXT
-        ),
-        xaxis=dict(
-            gridcolor=RobinhoodColors.MEDIUM_GRAY,
-            gridwidth=1,
-            zeroline=False
-        ),
-        yaxis=dict(
-            gridcolor=RobinhoodColors.MEDIUM_GRAY,
-            gridwidth=1,
-            zeroline=False
-        )
+        height=400
     )
     
     # Update bar styling
@@ -189,18 +265,23 @@ def create_robinhood_bar_chart(data, title, x_col, y_col, orientation='h'):
     
     return fig
 
+@timed()
 def create_opportunity_trend_chart(data):
     """Create a trend chart for opportunity scores"""
-    colors = get_chart_colors()
-    
-    # Group by opportunity score and count
+    # Group by opportunity score and count; the figure is cached on the counts
     score_counts = data['Opportunity_Score'].value_counts().sort_index()
+    return _opportunity_distribution_figure(score_counts.index.to_numpy(), score_counts.to_numpy())
+
+@memoized_figure
+def _opportunity_distribution_figure(scores, counts):
+    import plotly.graph_objects as go
+    colors = get_chart_colors()
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=score_counts.index,
-        y=score_counts.values,
+        x=scores,
+        y=counts,
         mode='lines+markers',
         line=dict(
             color=colors['primary'],
@@ -218,38 +299,101 @@ def create_opportunity_trend_chart(data):
     ))
     
     fig.update_layout(
-        title=dict(
-            text="Opportunity Score Distribution",
-            font=dict(
-                family="Inter, sans-serif",
-                size=16,
-                color=RobinhoodColors.PRIMARY_TEXT
-            ),
-            x=0.5
-        ),
-        xaxis=dict(
-            title="Opportunity Score",
-            gridcolor=RobinhoodColors.MEDIUM_GRAY,
-            gridwidth=1,
-            zeroline=False,
-            tickfont=dict(family="Inter, sans-serif", color=RobinhoodColors.PRIMARY_TEXT)
-        ),
-        yaxis=dict(
-            title="Number of Items",
-            gridcolor=RobinhoodColors.MEDIUM_GRAY,
-            gridwidth=1,
-            zeroline=False,
-            tickfont=dict(family="Inter, sans-serif", color=RobinhoodColors.PRIMARY_TEXT)
-        ),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin=dict(t=50, b=50, l=50, r=50),
+        template=robinhood_chart_template(),
+        title_text="Opportunity Score Distribution",
+        xaxis_title="Opportunity Score",
+        yaxis_title="Number of Items",
         height=300,
+        showlegend=False
+    )
+    
+    return fig
+
+@timed()
+@memoized_figure
+def create_time_trend_chart(periods, labels, values, title, y_title="Number of Items"):
+    """Line per group over time, from a rollup series (values[period, group])"""
+    import plotly.graph_objects as go
+    colors = get_chart_colors()
+    palette = [colors['primary'], colors['tertiary'], colors['quaternary'], colors['secondary'],
+               '#1E40AF', colors['neutral']]
+    
+    fig = go.Figure()
+    for i, label in enumerate(labels):
+        fig.add_trace(go.Scatter(
+            x=periods,
+            y=values[:, i],
+            mode='lines',
+            name=label,
+            line=dict(color=palette[i % len(palette)], width=2),
+            connectgaps=False
+        ))
+    
+    fig.update_layout(
+        template=robinhood_chart_template(),
+        title_text=title,
+        yaxis_title=y_title,
+        height=350,
+        hovermode='x unified',
+        showlegend=len(labels) > 1
+    )
+    
+    return fig
+
+# Above this many points charts switch to WebGL and a server-side point budget
+WEBGL_POINT_THRESHOLD = 5_000
+
+@timed()
+@memoized_figure
+def create_point_chart(x, y, title, x_title, y_title, ordered=False, point_budget=DEFAULT_POINT_BUDGET):
+    """Point-level chart that stays responsive at any row count.
+    
+    Large inputs render with Scattergl after downsampling to
+    ``point_budget`` points (LTTB for ``ordered`` series, grid cells for
+    point clouds, marker size showing how many rows a point stands for).
+    Points carry only their row position in ``customdata``; look rows up
+    from the selection event instead of shipping hover text for every row.
+    """
+    import plotly.graph_objects as go
+    colors = get_chart_colors()
+    x = np.asarray(x)
+    y = np.asarray(y)
+    
+    large = len(x) > WEBGL_POINT_THRESHOLD
+    if large:
+        positions, counts = downsample_points(x, y, point_budget, ordered=ordered)
+    else:
+        positions, counts = np.arange(len(x)), None
+    
+    if counts is not None:
+        # Area grows with the rows a point stands for
+        size = np.clip(4 + 2 * np.log2(counts), 4, 18)
+        hovertemplate = '%{x}<br>%{y}<br>%{text} rows here · row %{customdata}<extra></extra>'
+        text = [f"{count:,}" for count in counts]
+    else:
+        size, hovertemplate, text = 6, '%{x}<br>%{y}<br>row %{customdata}<extra></extra>', None
+    
+    trace_type = go.Scattergl if large else go.Scatter
+    fig = go.Figure(trace_type(
+        x=x[positions],
+        y=y[positions],
+        mode='lines+markers' if ordered else 'markers',
+        marker=dict(color=colors['primary'], size=size, opacity=0.7),
+        line=dict(color=colors['primary'], width=1),
+        customdata=positions,
+        text=text,
+        hovertemplate=hovertemplate
+    ))
+    
+    shown = f"{len(positions):,} of {len(x):,} points" if large else f"{len(x):,} points"
+    fig.update_layout(
+        template=robinhood_chart_template(),
+        title_text=f"{title}<br><sup>{shown}</sup>",
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        height=400,
         showlegend=False,
-        font=dict(
-            family="Inter, sans-serif",
-            color=RobinhoodColors.PRIMARY_TEXT
-        )
+        dragmode='select'
     )
     
     return fig
@@ -271,9 +415,7 @@ def render_opportunity_score(score):
     score_html = f'<span class="opportunity-score {score_class}"><strong>{score}</strong></span>'
     return score_html
 
-def render_sidebar_header(title, icon="🔧"):
-    """Render enhanced sidebar section header with icon and modern styling"""
-    st.markdown(f'''
+_SIDEBAR_HEADER_HTML = minify_html(f'''
     <div class="sidebar-header">
         <div style="display: flex; align-items: center; gap: 0.75rem;">
             <div style="width: 32px; height: 32px; 
@@ -285,18 +427,20 @@ def render_sidebar_header(title, icon="🔧"):
                        font-size: 1rem;
                        color: white;
                        box-shadow: 0 2px 4px rgba(0, 200, 83, 0.3);">
-                {icon}
+                {{icon}}
             </div>
-            <span style="flex: 1;">{title}</span>
+            <span style="flex: 1;">{{title}}</span>
         </div>
     </div>
-    ''', unsafe_allow_html=True)
+    ''')
 
-def render_sidebar_info_card(title, description, icon="💡", bg_color="rgba(30, 64, 175, 0.05)", border_color="#1E40AF"):
-    """Render an info card in the sidebar"""
-    st.markdown(f'''
-    <div style="background: {bg_color}; 
-                border-left: 3px solid {border_color}; 
+def render_sidebar_header(title, icon="🔧"):
+    """Render enhanced sidebar section header with icon and modern styling"""
+    st.markdown(_SIDEBAR_HEADER_HTML.format(icon=icon, title=title), unsafe_allow_html=True)
+
+_SIDEBAR_INFO_CARD_HTML = minify_html(f'''
+    <div style="background: {{bg_color}}; 
+                border-left: 3px solid {{border_color}}; 
                 padding: 1rem; 
                 border-radius: 12px; 
                 margin: 1rem 0;
@@ -304,46 +448,57 @@ def render_sidebar_info_card(title, description, icon="💡", bg_color="rgba(30,
                 color: #374151;
                 box-shadow: 0 2px 4px rgba(0, 0, 0, 0.04);">
         <div style="display: flex; align-items: flex-start; gap: 0.5rem;">
-            <span style="font-size: 1.25rem;">{icon}</span>
+            <span style="font-size: 1.25rem;">{{icon}}</span>
             <div>
-                <div style="font-weight: 600; color: {RobinhoodColors.PRIMARY_TEXT}; margin-bottom: 0.25rem;">{title}</div>
-                <div>{description}</div>
+                <div style="font-weight: 600; color: {RobinhoodColors.PRIMARY_TEXT}; margin-bottom: 0.25rem;">{{title}}</div>
+                <div>{{description}}</div>
             </div>
         </div>
     </div>
-    ''', unsafe_allow_html=True)
+    ''')
+
+def render_sidebar_info_card(title, description, icon="💡", bg_color="rgba(30, 64, 175, 0.05)", border_color="#1E40AF"):
+    """Render an info card in the sidebar"""
+    st.markdown(_SIDEBAR_INFO_CARD_HTML.format(title=title, description=description, icon=icon,
+                                               bg_color=bg_color, border_color=border_color),
+                unsafe_allow_html=True)
 
-def render_chart_container(chart_fig, title=None):
-    """Render a chart within a styled container"""
+def render_chart_container(chart_fig, title=None, key=None, on_select="ignore"):
+    """Render a chart within a styled container; returns the selection event when ``on_select`` is set"""
     container_html = '<div class="chart-container">'
     if title:
         container_html += f'<h3 class="chart-title">{title}</h3>'
     
     st.markdown(container_html, unsafe_allow_html=True)
-    st.plotly_chart(chart_fig, use_container_width=True)
+    event = st.plotly_chart(chart_fig, use_container_width=True, key=key, on_select=on_select)
     st.markdown('</div>', unsafe_allow_html=True)
+    return event
 
-def render_loading_spinner(text="Processing..."):
-    """Render a Robinhood-style loading spinner"""
-    loading_html = f"""
+_LOADING_SPINNER_HTML = minify_html(f"""
     <div class="loading-container">
         <div class="loading-spinner"></div>
-        <span style="margin-left: 1rem; color: {RobinhoodColors.SECONDARY_TEXT};">{text}</span>
+        <span style="margin-left: 1rem; color: {RobinhoodColors.SECONDARY_TEXT};">{{text}}</span>
     </div>
-    """
-    return st.markdown(loading_html, unsafe_allow_html=True)
+    """)
 
+def render_loading_spinner(text="Processing..."):
+    """Render a Robinhood-style loading spinner"""
+    return st.markdown(_LOADING_SPINNER_HTML.format(text=text), unsafe_allow_html=True)
+
+_KPI_HEADER_HTML = minify_html('''
+    <div style="background: linear-gradient(135deg, rgba(0, 200, 83, 0.02) 0%, rgba(139, 92, 246, 0.02) 100%); 
+                border-radius: 20px; padding: 1.5rem; margin-bottom: 1.5rem;">
+        <h4 style="color: #374151; font-family: Inter, sans-serif; font-weight: 600; margin: 0 0 1rem 0; font-size: 0.875rem; text-transform: uppercase; letter-spacing: 0.1em; opacity: 0.7;">KEY PERFORMANCE INDICATORS</h4>
+    </div>
+    ''')
+
+@timed()
 def create_metrics_overview_section(stats):
     """Create the complete metrics overview section with Robinhood styling"""
     st.markdown('<div class="section-spacing">', unsafe_allow_html=True)
     
     # Add a subtle gradient background for the metrics section
-    st.markdown('''
-    <div style="background: linear-gradient(135deg, rgba(0, 200, 83, 0.02) 0%, rgba(139, 92, 246, 0.02) 100%); 
-                border-radius: 20px; padding: 1.5rem; margin-bottom: 1.5rem;">
-        <h4 style="color: #374151; font-family: Inter, sans-serif; font-weight: 600; margin: 0 0 1rem 0; font-size: 0.875rem; text-transform: uppercase; letter-spacing: 0.1em; opacity: 0.7;">KEY PERFORMANCE INDICATORS</h4>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_KPI_HEADER_HTML, unsafe_allow_html=True)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -390,36 +545,103 @@ def create_metrics_overview_section(stats):
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+# The table styles one page of rows; st.dataframe marshals every styled cell
+TABLE_PAGE_ROWS = 1_000
+
+# Cell styles depend only on the value, so they are cached by value and
+# shared across sessions and datasets
+STYLE_CACHE_VALUES = 1024
+
+def _cell_css(color, weight=600):
+    return f'background-color: {color}15; color: {color}; font-weight: {weight};'
+
+@functools.lru_cache(maxsize=STYLE_CACHE_VALUES)
+def _severity_css(value):
+    return _cell_css(get_severity_color(value))
+
+@functools.lru_cache(maxsize=STYLE_CACHE_VALUES)
+def _category_css(value):
+    colors = get_chart_colors()
+    if "Enterprise" in value:
+        color = colors['primary']
+    elif "Compliance" in value:
+        color = colors['secondary']
+    else:
+        color = colors['tertiary']
+    return _cell_css(color, 500)
+
+# Score thresholds and styles, mirroring get_opportunity_score_color
+SCORE_CSS_THRESHOLDS = [5, 7]
+SCORE_CSS = [_cell_css(get_opportunity_score_color(score)) for score in [0] + SCORE_CSS_THRESHOLDS]
+
+def _lookup_css(values, css_for_value):
+    """CSS per cell via one style per distinct value and a take over the codes"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    # Trailing entry for missing values (code -1)
+    return np.array([css_for_value(value) for value in uniques] + [''], dtype=object)[codes]
+
+def _score_css(values):
+    scores = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+    css = np.array(SCORE_CSS, dtype=object)[np.searchsorted(SCORE_CSS_THRESHOLDS, scores, side='right')]
+    css[np.isnan(scores)] = ''
+    return css
+
+@timed()
 def style_dataframe_robinhood(df):
-    """Apply Robinhood-inspired styling to a dataframe"""
-    
-    def severity_styler(val):
-        color = get_severity_color(val)
-        return f'background-color: {color}15; color: {color}; font-weight: 600;'
-    
-    def score_styler(val):
-        color = get_opportunity_score_color(val)
-        return f'background-color: {color}15; color: {color}; font-weight: 600;'
+    """Apply Robinhood-inspired styling to a dataframe
     
-    def category_styler(val):
-        colors = get_chart_colors()
-        if "Enterprise" in val:
-            color = colors['primary']
-        elif "Compliance" in val:
-            color = colors['secondary']
-        else:
-            color = colors['tertiary']
-        return f'background-color: {color}15; color: {color}; font-weight: 500;'
-    
-    styled_df = df.style
+    CSS is computed per column in one vectorized pass, with one style
+    lookup per distinct value. Style only the rows actually shown (see
+    TABLE_PAGE_ROWS).
+    """
+    css_columns = {}
     
     if 'Severity' in df.columns:
-        styled_df = styled_df.applymap(severity_styler, subset=['Severity'])
+        css_columns['Severity'] = _lookup_css(df['Severity'], _severity_css)
     
     if 'Opportunity_Score' in df.columns:
-        styled_df = styled_df.applymap(score_styler, subset=['Opportunity_Score'])
+        css_columns['Opportunity_Score'] = _score_css(df['Opportunity_Score'])
     
     if 'AI_Category' in df.columns:
-        styled_df = styled_df.applymap(category_styler, subset=['AI_Category'])
+        css_columns['AI_Category'] = _lookup_css(df['AI_Category'], _category_css)
     
-    return styled_df
\ No newline at end of file
+    # A fixed uuid (pandas picks a random one) keeps an unchanged table
+    # byte-identical across reruns, so Streamlit can send it by reference
+    styler = df.style.set_uuid('feedback')
+    if not css_columns:
+        return styler
+    
+    css = pd.DataFrame(css_columns, index=df.index)
+    # One apply over the styled columns instead of a Python call per cell
+    return styler.apply(lambda _: css, axis=None, subset=list(css_columns))
+
+def render_performance_panel(history, profile_report=None, profilers=()):
+    """Render the hidden sidebar panel with per-stage timings of recent reruns"""
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        if not history:
+            st.caption("No instrumented reruns yet.")
+            return
+        
+        latest = history[-1]
+        st.caption(f"Last rerun: {latest.total_seconds * 1000:.0f} ms · showing {len(history)} reruns")
+        
+        # One column per rerun (newest first), one row per stage, in ms
+        breakdown = {}
+        for i, record in enumerate(reversed(history)):
+            column = "latest" if i == 0 else f"-{i}"
+            breakdown[column] = {name: seconds * 1000 for name, seconds, _ in record.breakdown()}
+            breakdown[column]["total"] = record.total_seconds * 1000
+        table = pd.DataFrame(breakdown).fillna(0.0).sort_values("latest", ascending=False)
+        st.dataframe(table.round(1), use_container_width=True)
+        
+        st.selectbox(
+            "Profile next rerun",
+            options=[None] + list(profilers),
+            format_func=lambda kind: "Off" if kind is None else kind,
+            key="perf_profiler"
+        )
+        if profile_report:
+            st.code(profile_report, language=None)
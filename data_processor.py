@@ -1,74 +1,212 @@
+import numpy as np
 import pandas as pd
-import streamlit as st
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from instrumentation import timed
+from language_detection import LANGUAGE_COLUMN, LanguageDetector
+from normalization import ColumnNormalizer, ValidationReport
+from pii_redaction import PIIRedactor, RedactionReport
+from reporters import Reporter, default_reporter
+from rollups import build_rollups, update_rollups, TimeRollup
+from scoring import DEFAULT_SCORING_CONFIG, ScoringEngine, ScoringInputs
+from sentiment import SentimentScorer
+
+# pandas' default missing-value markers minus 'NA', which is North America
+# in the Region column rather than a missing value
+CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
 
 class DataProcessor:
     
-    SEVERITY_SCORES = {
-        'Critical': 5,
-        'High': 4, 
-        'Medium': 3,
-        'Low': 2
+    # Scores come from the scoring engine's config; these default tables
+    # also define the valid Severity and Region values
+    SEVERITY_SCORES = DEFAULT_SCORING_CONFIG['severity']['weights']
+    
+    REGION_SCORES = DEFAULT_SCORING_CONFIG['region']['weights']
+    
+    # Common spellings seen in exports, matched case- and whitespace-insensitively
+    SEVERITY_ALIASES = {
+        'crit': 'Critical', 'blocker': 'Critical', 'sev1': 'Critical', 'sev 1': 'Critical', 'p1': 'Critical',
+        'hi': 'High', 'major': 'High', 'sev2': 'High', 'sev 2': 'High', 'p2': 'High',
+        'med': 'Medium', 'moderate': 'Medium', 'normal': 'Medium', 'sev3': 'Medium', 'sev 3': 'Medium', 'p3': 'Medium',
+        'lo': 'Low', 'minor': 'Low', 'trivial': 'Low', 'sev4': 'Low', 'sev 4': 'Low', 'p4': 'Low',
     }
     
-    REGION_SCORES = {
-        'US': 3,
-        'EU': 2,
-        'APAC': 1,
-        'LATAM': 1
+    REGION_ALIASES = {
+        'na': 'US', 'usa': 'US', 'u.s.': 'US', 'united states': 'US', 'north america': 'US', 'amer': 'US',
+        'europe': 'EU', 'emea': 'EU', 'eur': 'EU',
+        'apj': 'APAC', 'asia': 'APAC', 'asia pacific': 'APAC', 'asia-pacific': 'APAC',
+        'latam': 'LATAM', 'latin america': 'LATAM', 'south america': 'LATAM',
     }
     
+    DEFAULT_SEVERITY = 'Medium'
+    DEFAULT_REGION = 'APAC'
+    
+    # Rows whose top category probability (AI_Confidence) is below this go
+    # to the review list
+    REVIEW_CONFIDENCE_THRESHOLD = 0.6
+    
     REQUIRED_COLUMNS = ['Feedback', 'Product', 'Severity', 'Region']
     
-    def __init__(self):
-        pass
+    # Optional; the first column found is parsed and renamed to 'Timestamp'
+    TIMESTAMP_COLUMNS = ['Timestamp', 'timestamp', 'Date', 'date', 'Created_At', 'created_at']
     
+    def __init__(self, reporter: Optional[Reporter] = None, scoring: Optional[ScoringEngine] = None,
+                 sentiment: Optional[SentimentScorer] = None, language: Optional[LanguageDetector] = None,
+                 redactor: Optional[PIIRedactor] = None):
+        self.reporter = reporter if reporter is not None else default_reporter()
+        self.scoring = scoring if scoring is not None else ScoringEngine.from_env()
+        self.sentiment = sentiment if sentiment is not None else SentimentScorer()
+        self.language = language if language is not None else LanguageDetector()
+        self.redactor = redactor if redactor is not None else PIIRedactor.from_env()
+        self.normalizers = {
+            'Severity': ColumnNormalizer(list(self.SEVERITY_SCORES), self.SEVERITY_ALIASES, self.DEFAULT_SEVERITY),
+            'Region': ColumnNormalizer(list(self.REGION_SCORES), self.REGION_ALIASES, self.DEFAULT_REGION),
+        }
+        # Report from the most recent _validate_and_clean_data call
+        self.validation_report: Optional[ValidationReport] = None
+        # Report from the most recent redact_pii call
+        self.redaction_report: Optional[RedactionReport] = None
+    
+    @timed()
     def load_csv(self, file_path: str) -> pd.DataFrame:
         try:
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, keep_default_na=False, na_values=CSV_NA_VALUES)
             return self._validate_and_clean_data(df)
         except Exception as e:
-            st.error(f"Error loading CSV file: {str(e)}")
+            self.reporter.error(f"Error loading CSV file: {str(e)}")
             return pd.DataFrame()
     
+    @timed()
     def load_uploaded_file(self, uploaded_file) -> pd.DataFrame:
         try:
-            df = pd.read_csv(uploaded_file)
+            df = pd.read_csv(uploaded_file, keep_default_na=False, na_values=CSV_NA_VALUES)
             return self._validate_and_clean_data(df)
         except Exception as e:
-            st.error(f"Error processing uploaded file: {str(e)}")
+            self.reporter.error(f"Error processing uploaded file: {str(e)}")
             return pd.DataFrame()
     
+    @timed()
     def _validate_and_clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         missing_cols = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
         if missing_cols:
-            st.error(f"Missing required columns: {missing_cols}")
+            self.reporter.error(f"Missing required columns: {missing_cols}")
             return pd.DataFrame()
         
-        df = df.dropna(subset=self.REQUIRED_COLUMNS)
+        report = ValidationReport(rows_in=len(df))
+        keep = np.ones(len(df), dtype=bool)
+        for column in self.REQUIRED_COLUMNS:
+            missing = df[column].isna().to_numpy()
+            report.missing[column] = int(missing.sum())
+            keep &= ~missing
         
-        df['Severity'] = df['Severity'].str.strip().str.title()
-        df['Region'] = df['Region'].str.strip().str.upper()
+        all_kept = bool(keep.all())
         
-        invalid_severities = df[~df['Severity'].isin(self.SEVERITY_SCORES.keys())]
-        if not invalid_severities.empty:
-            st.warning(f"Found {len(invalid_severities)} rows with invalid severity values. Using 'Medium' as default.")
-            df.loc[~df['Severity'].isin(self.SEVERITY_SCORES.keys()), 'Severity'] = 'Medium'
+        # One factorize per column; aliases and defaults resolve per distinct value
+        codes = {}
+        for column, normalizer in self.normalizers.items():
+            codes[column], report.columns[column] = normalizer.normalize(df[column], None if all_kept else keep)
         
-        invalid_regions = df[~df['Region'].isin(self.REGION_SCORES.keys())]
-        if not invalid_regions.empty:
-            st.warning(f"Found {len(invalid_regions)} rows with invalid region values. Using 'APAC' as default.")
-            df.loc[~df['Region'].isin(self.REGION_SCORES.keys()), 'Region'] = 'APAC'
+        # Normalized columns are rebuilt from codes, so only the rest are filtered
+        cleaned = df.copy(deep=False) if all_kept else df.drop(columns=list(codes)).loc[keep]
+        for column, normalizer in self.normalizers.items():
+            cleaned[column] = normalizer.to_categorical(codes[column])
+        cleaned = cleaned[list(df.columns)]
+        cleaned = self._parse_timestamps(cleaned, report)
+        # Every loader comes through here, so no later stage (prompts, cache
+        # keys, exports) ever sees the raw text
+        cleaned = self.redact_pii(cleaned)
         
-        return df
+        report.rows_out = len(cleaned)
+        self.validation_report = report
+        
+        for column, normalizer in self.normalizers.items():
+            column_report = report.columns[column]
+            if column_report.invalid:
+                examples = ', '.join(f"'{value}' x{count}" for value, count in column_report.top_invalid())
+                self.reporter.warning(f"Found {column_report.invalid_rows} rows with invalid {column.lower()} values "
+                                      f"({examples}). Using '{normalizer.default}' as default.")
+        if report.unparsed_timestamps:
+            self.reporter.warning(f"Found {report.unparsed_timestamps} rows with unparseable timestamps. "
+                                  f"They are kept but left out of trend charts.")
+        
+        return cleaned
+    
+    def _parse_timestamps(self, df: pd.DataFrame, report: ValidationReport) -> pd.DataFrame:
+        source = next((column for column in self.TIMESTAMP_COLUMNS if column in df.columns), None)
+        if source is None:
+            return df
+        values = df[source]
+        if not pd.api.types.is_datetime64_any_dtype(values):
+            raw = values
+            # ISO 8601 is the common export format and parses twice as fast as format inference
+            values = pd.to_datetime(raw, errors='coerce', utc=True, format='ISO8601')
+            retry = values.isna() & raw.notna()
+            if retry.any():
+                values[retry] = pd.to_datetime(raw[retry], errors='coerce', utc=True, format='mixed')
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            # Naive UTC; rollups bucket by calendar day
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        report.unparsed_timestamps = int(values.isna().sum() - df[source].isna().sum())
+        df = df.assign(**{source: values})
+        return df.rename(columns={source: 'Timestamp'}) if source != 'Timestamp' else df
     
-    def calculate_opportunity_score(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        df['Severity_Score'] = df['Severity'].map(self.SEVERITY_SCORES)
-        df['Region_Score'] = df['Region'].map(self.REGION_SCORES)
-        df['Opportunity_Score'] = df['Severity_Score'] + df['Region_Score']
+    @timed()
+    def create_rollups(self, df: pd.DataFrame) -> Optional[Dict[str, TimeRollup]]:
+        """Daily and weekly trend rollups, or None without a Timestamp column"""
+        return build_rollups(df)
+    
+    @timed()
+    def apply_ai_updates(self, df: pd.DataFrame, updates: pd.DataFrame,
+                         rollups: Optional[Dict[str, TimeRollup]] = None
+                         ) -> Tuple[pd.DataFrame, Optional[Dict[str, TimeRollup]]]:
+        """Write re-processed AI results for a few rows into ``df``.
+        
+        ``updates`` is indexed like ``df`` and holds AI_Category, AI_Summary,
+        AI_Status and the probability columns; every AI_ column in it is
+        written. The frame is only re-scored when the scoring uses
+        AI_Category, and rollups are patched with the changed rows instead
+        of being rebuilt.
+        """
+        updates = updates[updates.index.isin(df.index)]
+        if updates.empty:
+            return df, rollups
+        before = df.loc[updates.index]
+        # Shallow copy: only the columns written below are copied
+        df = df.copy(deep=False)
+        for column in updates.columns:
+            if column.startswith('AI_'):
+                df.loc[updates.index, column] = updates[column]
+        if self.scoring.uses_column('AI_Category'):
+            df = self.calculate_opportunity_score(df)
+        if rollups is not None:
+            rollups = update_rollups(rollups, before, df.loc[updates.index]) or self.create_rollups(df)
+        return df, rollups
+    
+    @timed()
+    def redact_pii(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Replace PII in Feedback with [TYPE] placeholders; counts go to redaction_report"""
+        df, self.redaction_report = self.redactor.apply(df)
         return df
     
+    @timed()
+    def detect_language(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add the Language column (ISO 639-1 codes) from Feedback"""
+        return self.language.apply(df)
+    
+    @timed()
+    def analyze_sentiment(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add the lexicon Sentiment and Urgency columns from Feedback"""
+        return self.sentiment.apply(df)
+    
+    @timed()
+    def calculate_opportunity_score(self, df: pd.DataFrame,
+                                    inputs: Optional[ScoringInputs] = None) -> pd.DataFrame:
+        """Score with self.scoring; pass ``inputs`` from scoring.prepare(df) to re-score cheaply"""
+        return self.scoring.apply(df, inputs)
+    
+    @timed()
     def filter_data(self, df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
         filtered_df = df.copy()
         
@@ -84,8 +222,24 @@ class DataProcessor:
         if filters.get('regions') and len(filters['regions']) > 0:
             filtered_df = filtered_df[filtered_df['Region'].isin(filters['regions'])]
         
+        if filters.get('languages') and LANGUAGE_COLUMN in filtered_df.columns:
+            filtered_df = filtered_df[filtered_df[LANGUAGE_COLUMN].isin(filters['languages'])]
+        
+        if filters.get('min_confidence') and 'AI_Confidence' in filtered_df.columns:
+            filtered_df = filtered_df[filtered_df['AI_Confidence'] >= filters['min_confidence']]
+        
         return filtered_df
     
+    @timed()
+    def review_rows(self, df: pd.DataFrame, threshold: Optional[float] = None) -> pd.DataFrame:
+        """Rows with an uncertain category, least confident first"""
+        if 'AI_Confidence' not in df.columns:
+            return df.iloc[:0]
+        threshold = self.REVIEW_CONFIDENCE_THRESHOLD if threshold is None else threshold
+        uncertain = df[df['AI_Confidence'] < threshold]
+        return uncertain.sort_values('AI_Confidence', kind='stable')
+    
+    @timed()
     def get_summary_stats(self, df: pd.DataFrame) -> Dict:
         stats = {
             'total_feedback': len(df),
@@ -93,7 +247,8 @@ class DataProcessor:
             'compliance_issues': 0,
             'avg_opportunity_score': df['Opportunity_Score'].mean() if 'Opportunity_Score' in df.columns else 0,
             'top_product': df['Product'].value_counts().index[0] if not df.empty else 'N/A',
-            'regional_distribution': df['Region'].value_counts().to_dict() if not df.empty else {}
+            # observed: categorical columns would also list zero-count regions
+            'regional_distribution': df['Region'].value_counts().loc[lambda counts: counts > 0].to_dict() if not df.empty else {}
         }
         
         if 'AI_Category' in df.columns:
@@ -101,6 +256,7 @@ class DataProcessor:
         
         return stats
     
+    @timed()
     def create_sample_data(self) -> pd.DataFrame:
         sample_data = {
             'Feedback': [
@@ -131,4 +287,15 @@ class DataProcessor:
         }
         
         df = pd.DataFrame(sample_data)
-        return self.calculate_opportunity_score(df)
\ No newline at end of file
+        # Spread over the last two months so the trend charts have something to show
+        df['Timestamp'] = pd.Timestamp.now().normalize() - pd.to_timedelta(np.arange(len(df))[::-1] * 6, unit='D')
+        df = self.redact_pii(df)
+        return self.calculate_opportunity_score(self.analyze_sentiment(self.detect_language(df)))
+    
+    @timed()
+    def create_synthetic_data(self, n_rows: int, seed: int = 0) -> pd.DataFrame:
+        from synthetic_data import generate_feedback
+        # Ending today keeps the demo's recency scores and trend charts current
+        df = generate_feedback(n_rows, seed=seed, end=str(np.datetime64('today', 'D')))
+        df = self._validate_and_clean_data(df)
+        return self.calculate_opportunity_score(self.analyze_sentiment(self.detect_language(df)))
@@ -0,0 +1,108 @@
+"""Server-side point reduction for large point-level charts.
+
+Browsers and Plotly's JSON path both slow to a crawl past a few tens of
+thousands of points. Before a point chart is built its points are reduced
+to a fixed budget: series ordered by x use Largest-Triangle-Three-Buckets
+(LTTB), which keeps the peaks and troughs a line chart needs, and
+unordered point clouds keep one representative per occupied grid cell
+together with how many points it stands for. Both return row positions,
+so the chart can carry positions instead of hover text and details are
+looked up on demand.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_POINT_BUDGET = 5_000
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64) or np.issubdtype(values.dtype, np.timedelta64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the ``n_out`` points LTTB keeps; ``x`` must be sorted"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # First and last points are always kept; the rest split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Bucket means from prefix sums, so each step below only scans its own bucket
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = np.maximum(edges[1:] - edges[:-1], 1)
+    mean_x = np.append((cum_x[edges[1:]] - cum_x[edges[:-1]]) / sizes, x[-1])
+    mean_y = np.append((cum_y[edges[1:]] - cum_y[edges[:-1]]) / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if end <= start:
+            end = start + 1
+        # Keep the point forming the largest triangle with the last kept point
+        # and the next bucket's mean
+        next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+
+def grid_sample(x: np.ndarray, y: np.ndarray, budget: int,
+                priority: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """One representative per occupied cell of a ~budget-cell grid, plus cell counts.
+
+    The representative is the point with the highest ``priority`` (default:
+    the highest y) in its cell.
+    """
+    n = len(x)
+    if n <= budget:
+        return np.arange(n), np.ones(n, dtype=np.int64)
+    x = _as_float(x)
+    y = _as_float(y)
+    side = max(1, int(np.sqrt(budget)))
+
+    def cell_index(values):
+        low, high = values.min(), values.max()
+        if high <= low:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.minimum(((values - low) / (high - low) * side).astype(np.int64), side - 1)
+
+    cells = cell_index(x) * side + cell_index(y)
+    # Highest priority first, then a stable sort by cell: each cell's run
+    # starts with its representative
+    order = np.argsort(-(y if priority is None else _as_float(priority)))
+    order = order[np.argsort(cells[order], kind='stable')]
+    sorted_cells = cells[order]
+    first = np.flatnonzero(np.concatenate(([True], sorted_cells[1:] != sorted_cells[:-1])))
+    counts = np.diff(np.append(first, n))
+    return order[first], counts
+
+
+def downsample_points(x: np.ndarray, y: np.ndarray, budget: int = DEFAULT_POINT_BUDGET,
+                      ordered: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """(positions kept, points each one stands for or None) within ``budget``.
+
+    ``ordered=True`` treats the points as a series sorted by x (LTTB);
+    otherwise they are a point cloud (grid_sample). NaN/NaT points are dropped.
+    """
+    x_values = np.asarray(x)
+    y_values = np.asarray(y)
+    valid = ~(np.isnan(_as_float(x_values)) | np.isnan(_as_float(y_values)))
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        valid &= ~np.isnat(x_values)
+    positions = np.flatnonzero(valid)
+    if len(positions) <= budget:
+        return positions, None
+    if ordered:
+        return positions[lttb_indices(x_values[positions], y_values[positions], budget)], None
+    kept, counts = grid_sample(x_values[positions], y_values[positions], budget)
+    return positions[kept], counts
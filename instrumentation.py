@@ -0,0 +1,169 @@
+"""Lightweight timing spans for finding where a rerun or batch spends time.
+
+Wrap functions with ``@timed()`` or blocks with ``span(name)``. Timings are
+collected into the RunRecord opened by ``run()`` on the current thread;
+spans from threads without an open run (e.g. process_batch workers) go to
+a process-wide background record.
+
+Spans are recorded when instrumentation is enabled process-wide, with
+``FEEDBACK_PERF=1`` or ``enable()``, and on any thread inside ``run()``,
+so the dashboard can time only the sessions that asked for it. Otherwise,
+which is the default, a timed call costs a flag check and a thread-local
+lookup.
+"""
+import functools
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_enabled = os.getenv('FEEDBACK_PERF', '').lower() not in ('', '0', 'false', 'no')
+_local = threading.local()
+
+PROFILERS = ['cprofile', 'pyinstrument']
+
+
+def enable(flag: bool = True):
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class RunRecord:
+    """Inclusive wall time and call count per span name for one run"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = time.time()
+        self.total_seconds = 0.0
+        self.stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                self.stages[name] = [seconds, 1]
+            else:
+                stage[0] += seconds
+                stage[1] += 1
+
+    def breakdown(self) -> List[Tuple[str, float, int]]:
+        """(name, seconds, calls), slowest first"""
+        with self._lock:
+            rows = [(name, seconds, int(calls)) for name, (seconds, calls) in self.stages.items()]
+        return sorted(rows, key=lambda row: row[1], reverse=True)
+
+    def to_dict(self) -> dict:
+        return {
+            'label': self.label,
+            'started_at': self.started_at,
+            'total_seconds': round(self.total_seconds, 6),
+            'stages': {name: {'seconds': round(seconds, 6), 'calls': calls}
+                       for name, seconds, calls in self.breakdown()},
+        }
+
+
+background = RunRecord('background')
+
+
+def _active() -> bool:
+    return _enabled or getattr(_local, 'run', None) is not None
+
+
+def _record(name: str, seconds: float):
+    record = getattr(_local, 'run', None)
+    (record if record is not None else background).add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    if not _active():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator recording each call as a span (default: module.qualname)"""
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _active():
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(span_name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def run(label: str = 'run') -> Iterator[RunRecord]:
+    """Collect spans on this thread into a fresh RunRecord, enabled or not"""
+    record = RunRecord(label)
+    previous = getattr(_local, 'run', None)
+    _local.run = record
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.total_seconds = time.perf_counter() - start
+        _local.run = previous
+
+
+@contextmanager
+def profiled(kind: Optional[str] = None, limit: int = 30) -> Iterator[dict]:
+    """Optionally profile the block; the text report lands in result['report']"""
+    result = {'kind': kind, 'report': None}
+    if not kind:
+        yield result
+        return
+
+    if kind == 'cprofile':
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+            result['report'] = out.getvalue()
+    elif kind == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield result
+        finally:
+            profiler.stop()
+            result['report'] = profiler.output_text(unicode=True, color=False)
+    else:
+        raise ValueError(f"Unknown profiler {kind!r}; expected one of {PROFILERS}")
+
+
+def available_profilers() -> List[str]:
+    kinds = ['cprofile']
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        kinds.append('pyinstrument')
+    return kinds
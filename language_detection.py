@@ -0,0 +1,181 @@
+"""Local language identification for feedback text.
+
+``LanguageDetector`` adds a ``Language`` column of ISO 639-1 codes in
+three steps, cheapest first:
+
+1. Gate: ASCII-only text containing a common English function word is
+   English. Two whole-column string checks, native passes on pandas'
+   pyarrow string dtype, settle all-English datasets without a Python
+   loop per row.
+2. Script: Hangul, kana, Han and Thai characters identify Korean,
+   Japanese, Chinese and Thai outright.
+3. Character trigrams: the remaining distinct texts are scored against
+   per-language trigram log-probabilities built from the small corpora
+   below. All texts are scored together with one ``np.add.reduceat``.
+   Texts that are too short, or that score too close to English, stay
+   English.
+"""
+import math
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+LANGUAGE_COLUMN = 'Language'
+DEFAULT_LANGUAGE = 'en'
+
+LANGUAGE_NAMES = {
+    'en': 'English', 'es': 'Spanish', 'pt': 'Portuguese', 'fr': 'French', 'de': 'German',
+    'id': 'Indonesian', 'vi': 'Vietnamese', 'ja': 'Japanese', 'zh': 'Chinese', 'ko': 'Korean', 'th': 'Thai',
+}
+
+_ENGLISH_HINT = r'(?i)\b(?:the|and|is|are|for|our|with|not|this|to|of|we)\b'
+
+# Checked in order: kana before Han, since Japanese mixes both
+SCRIPT_LANGUAGES = [
+    ('ko', re.compile('[\uac00-\ud7af\u1100-\u11ff]')),
+    ('ja', re.compile('[\u3040-\u30ff]')),
+    ('zh', re.compile('[\u4e00-\u9fff]')),
+    ('th', re.compile('[\u0e00-\u0e7f]')),
+]
+
+# Feedback-flavoured text per Latin-script language; trigram counts come from these
+TRIGRAM_CORPORA = {
+    'en': "The dashboard is very slow and the export keeps failing for our team. We need this fixed as soon "
+          "as possible because it is blocking our rollout. Please add support for single sign-on and improve "
+          "the performance of the reports. It would be great if the mobile app did not crash when we open "
+          "large files. Thanks for the help with the integration, our users are happy with the new features. "
+          "Several teams across the company are affected and our auditors flagged the missing controls.",
+    'es': "El panel es muy lento y la exportación de datos sigue fallando para nuestro equipo. Necesitamos "
+          "que lo solucionen lo antes posible porque está bloqueando el lanzamiento. Por favor agreguen "
+          "soporte para inicio de sesión único y mejoren el rendimiento de los informes. La aplicación móvil "
+          "se cierra cuando abrimos archivos grandes. Gracias por la ayuda con la integración, los usuarios "
+          "están contentos con las nuevas funciones. Varios equipos de la empresa están afectados.",
+    'pt': "O painel está muito lento e a exportação de dados continua falhando para a nossa equipe. "
+          "Precisamos que isso seja corrigido o mais rápido possível porque está bloqueando o lançamento. "
+          "Por favor adicionem suporte para login único e melhorem o desempenho dos relatórios. O aplicativo "
+          "móvel trava quando abrimos arquivos grandes. Obrigado pela ajuda com a integração, os usuários "
+          "estão satisfeitos com as novas funções. Várias equipes da empresa foram afetadas.",
+    'fr': "Le tableau de bord est très lent et l'exportation des données échoue toujours pour notre équipe. "
+          "Nous avons besoin d'une correction dès que possible car cela bloque notre déploiement. Merci "
+          "d'ajouter la prise en charge de l'authentification unique et d'améliorer les performances des "
+          "rapports. L'application mobile plante quand nous ouvrons de gros fichiers. Merci pour votre aide "
+          "avec l'intégration, nos utilisateurs sont contents des nouvelles fonctionnalités.",
+    'de': "Das Dashboard ist sehr langsam und der Datenexport schlägt für unser Team immer wieder fehl. Wir "
+          "brauchen so schnell wie möglich eine Lösung, weil das unsere Einführung blockiert. Bitte fügen Sie "
+          "Unterstützung für Single Sign-On hinzu und verbessern Sie die Leistung der Berichte. Die mobile App "
+          "stürzt ab, wenn wir große Dateien öffnen. Danke für die Hilfe bei der Integration, unsere Benutzer "
+          "sind mit den neuen Funktionen zufrieden.",
+    'id': "Dasbor sangat lambat dan ekspor data terus gagal untuk tim kami. Kami perlu ini diperbaiki "
+          "secepatnya karena menghambat peluncuran kami. Tolong tambahkan dukungan untuk masuk tunggal dan "
+          "tingkatkan kinerja laporan. Aplikasi seluler sering macet ketika kami membuka file yang besar. "
+          "Terima kasih atas bantuan dengan integrasi, pengguna kami senang dengan fitur baru. Beberapa tim "
+          "di perusahaan terkena dampaknya dan auditor kami sudah menandainya.",
+    'vi': "Bảng điều khiển rất chậm và việc xuất dữ liệu liên tục bị lỗi cho nhóm của chúng tôi. Chúng tôi "
+          "cần sửa lỗi này càng sớm càng tốt vì nó đang chặn việc triển khai. Vui lòng thêm hỗ trợ đăng nhập "
+          "một lần và cải thiện hiệu suất của báo cáo. Ứng dụng di động bị treo khi chúng tôi mở tệp lớn. "
+          "Cảm ơn sự giúp đỡ với việc tích hợp, người dùng của chúng tôi hài lòng với các tính năng mới.",
+}
+
+# Characters scored per text; the opening of a message identifies its language
+MAX_SCORED_CHARS = 200
+# Below this many trigrams a text is too short to call
+MIN_TRIGRAMS = 12
+# Mean log-probability advantage per trigram a language needs over English
+ENGLISH_MARGIN = 0.15
+
+_NON_LETTERS = re.compile(r"[^\w']+|[\d_]+")
+
+
+def _trigrams(text: str) -> List[str]:
+    text = ' ' + _NON_LETTERS.sub(' ', text[:MAX_SCORED_CHARS].lower()).strip() + ' '
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+
+def _is_ascii(texts: pd.Series) -> np.ndarray:
+    # pyarrow's byte-level kernel is ~5x faster than Series.str.isascii on 1M rows
+    if isinstance(texts.array, pd.arrays.ArrowStringArray):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        return pc.fill_null(pc.string_is_ascii(pa.array(texts.array)), False).to_numpy(zero_copy_only=False)
+    return texts.str.isascii().fillna(False).to_numpy(dtype=bool)
+
+
+class LanguageDetector:
+    def __init__(self, corpora: Optional[Dict[str, str]] = None):
+        corpora = corpora if corpora is not None else TRIGRAM_CORPORA
+        self.languages = list(corpora)
+        counts = [self._count(text) for text in corpora.values()]
+        vocabulary = sorted(set().union(*counts))
+        self._index = {gram: i for i, gram in enumerate(vocabulary)}
+        # Add-one smoothed log-probabilities; the last row is for unseen trigrams
+        table = np.empty((len(vocabulary) + 1, len(self.languages)), dtype=np.float32)
+        for column, language_counts in enumerate(counts):
+            total = sum(language_counts.values()) + len(vocabulary) + 1
+            table[:-1, column] = [math.log((language_counts.get(gram, 0) + 1) / total) for gram in vocabulary]
+            table[-1, column] = math.log(1 / total)
+        self._table = table
+        self._english = self.languages.index(DEFAULT_LANGUAGE) if DEFAULT_LANGUAGE in self.languages else None
+
+    @staticmethod
+    def _count(text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for gram in _trigrams(text):
+            counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    def detect(self, texts: pd.Series) -> pd.Categorical:
+        """Language code per text; missing text gets DEFAULT_LANGUAGE"""
+        texts = texts.astype('str') if texts.dtype == object else texts
+        english = _is_ascii(texts) & texts.str.contains(_ENGLISH_HINT, na=False).to_numpy(dtype=bool)
+        # Built from codes: an object array of 'en' per row would cost more than the checks
+        codes = np.zeros(len(texts), dtype=np.int8)
+        categories = [DEFAULT_LANGUAGE]
+        rest = np.flatnonzero(~english & texts.notna().to_numpy())
+        if len(rest):
+            text_codes, uniques = pd.factorize(texts.iloc[rest])
+            detected = self.classify(list(uniques))
+            categories += sorted(set(detected) - {DEFAULT_LANGUAGE})
+            lookup = np.array([categories.index(language) for language in detected], dtype=np.int8)
+            codes[rest] = lookup[text_codes]
+        return pd.Categorical.from_codes(codes, categories)
+
+    def classify(self, texts: List[str]) -> List[str]:
+        """Language code per text, by script and then by trigram score"""
+        result = [DEFAULT_LANGUAGE] * len(texts)
+        gram_ids: List[int] = []
+        starts: List[int] = []
+        scored: List[int] = []
+        unseen = len(self._index)
+        for i, text in enumerate(texts):
+            language = next((code for code, pattern in SCRIPT_LANGUAGES if pattern.search(text)), None)
+            if language is not None:
+                result[i] = language
+                continue
+            grams = _trigrams(text)
+            if len(grams) < MIN_TRIGRAMS:
+                continue
+            starts.append(len(gram_ids))
+            gram_ids.extend(self._index.get(gram, unseen) for gram in grams)
+            scored.append(i)
+        if not scored:
+            return result
+
+        scores = np.add.reduceat(self._table[np.asarray(gram_ids)], np.asarray(starts), axis=0)
+        lengths = np.diff(np.append(starts, len(gram_ids)))
+        best = scores.argmax(axis=1)
+        if self._english is not None:
+            # Only a clear lead over English changes the prompt
+            lead = (scores[np.arange(len(best)), best] - scores[:, self._english]) / lengths
+            best = np.where(lead >= ENGLISH_MARGIN, best, self._english)
+        for i, column in zip(scored, best):
+            result[i] = self.languages[column]
+        return result
+
+    def apply(self, df: pd.DataFrame, column: str = 'Feedback') -> pd.DataFrame:
+        return df.assign(**{LANGUAGE_COLUMN: self.detect(df[column])})
+
+
+def language_name(code: Optional[str]) -> str:
+    return LANGUAGE_NAMES.get(code, code or LANGUAGE_NAMES[DEFAULT_LANGUAGE])
@@ -0,0 +1,234 @@
+"""Minimal Prometheus-style metrics registry for AI throughput and cost.
+
+Counters, gauges and histograms with labels, rendered in the Prometheus
+text exposition format. Metrics can be served from a local HTTP endpoint
+(``start_metrics_server``) or dumped to a file for the node_exporter
+textfile collector (``MetricsRegistry.write``). No third-party dependency.
+"""
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# USD per 1M tokens (input, output). Unknown models are counted at zero cost.
+MODEL_PRICING_PER_1M_TOKENS = {
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+}
+
+# Requests sent through the Batch API are billed at half the list price
+BATCH_PRICE_FACTOR = 0.5
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, batch: bool = False) -> float:
+    """USD for one call at list prices, or Batch API prices with ``batch``"""
+    input_price, output_price = MODEL_PRICING_PER_1M_TOKENS.get(model, (0.0, 0.0))
+    cost = (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+    return cost * BATCH_PRICE_FACTOR if batch else cost
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    bucket_labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total[0]:g}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Atomically dump the registry, e.g. for the textfile collector"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class AIMetrics:
+    """The AIAnalyzer metric families, labelled by model and task"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        registry = registry if registry is not None else REGISTRY
+        labels = ('model', 'task')
+        self.requests = registry.counter(
+            'feedback_ai_requests_total', "OpenAI API requests by outcome (success, error, rate_limited, batch_success, batch_error)",
+            labels + ('outcome',))
+        self.retries = registry.counter(
+            'feedback_ai_retries_total', "Retried OpenAI API requests", labels)
+        self.failures = registry.counter(
+            'feedback_ai_failures_total', "Calls that failed after all retries and fell back to a default", labels)
+        self.latency = registry.histogram(
+            'feedback_ai_request_duration_seconds', "OpenAI API request latency", labels)
+        self.tokens = registry.counter(
+            'feedback_ai_tokens_total', "Tokens sent and received", labels + ('direction',))
+        self.cost = registry.counter(
+            'feedback_ai_cost_usd_total', "Estimated spend from token usage and list prices (Batch API at its discount)", labels)
+        self.in_flight = registry.gauge(
+            'feedback_ai_in_flight_requests', "OpenAI API requests currently in flight", ('model',))
+        self.short_circuited = registry.counter(
+            'feedback_ai_short_circuited_total', "Calls skipped for a local fallback while the circuit breaker was open",
+            labels)
+        self.circuit_state = registry.gauge(
+            'feedback_ai_circuit_state', "OpenAI circuit breaker state (0 closed, 1 half-open, 2 open)")
+        self.routed = registry.counter(
+            'feedback_ai_routed_rows_total', "Rows by the routing tier that settled their category and why",
+            ('tier', 'reason'))
+
+    def observe_usage(self, model: str, task: str, prompt_tokens: int, completion_tokens: int,
+                      batch: bool = False):
+        self.tokens.inc(prompt_tokens, model=model, task=task, direction='input')
+        self.tokens.inc(completion_tokens, model=model, task=task, direction='output')
+        cost = estimate_cost(model, prompt_tokens, completion_tokens, batch)
+        if cost:
+            self.cost.inc(cost, model=model, task=task)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0].rstrip('/') not in ('', '/metrics'):
+            self.send_error(404)
+            return
+        data = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1',
+                         registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """Serve ``registry`` at http://host:port/metrics from a daemon thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry if registry is not None else REGISTRY
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
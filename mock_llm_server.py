@@ -0,0 +1,448 @@
+"""Local OpenAI-compatible stub server for benchmarks.
+
+Serves ``POST /v1/chat/completions`` over keep-alive HTTP/1.1 with
+configurable (optionally per-model) latency, injected 500/429 failures and reply shapes, so
+AIAnalyzer throughput can be measured without spending API credits.
+Replies are deterministic for a given prompt and seed. Requests with
+``logprobs`` get first-token alternatives; for the one-letter category
+prompt they follow a per-prompt distribution over the labels.
+
+    python mock_llm_server.py --port 8001 --latency 0.2 --rate-limit-rate 0.05
+    OPENAI_API_KEY=mock OPENAI_BASE_URL=http://127.0.0.1:8001/v1 python cli.py ...
+
+The Batch API endpoints are stubbed too: ``POST /v1/files`` (JSONL
+upload), ``POST /v1/batches``, ``GET /v1/batches/{id}``, ``POST
+/v1/batches/{id}/cancel`` and ``GET /v1/files/{id}/content``. A batch
+stays in progress for ``batch_latency`` seconds and is then answered line
+by line like the synchronous endpoint, with injected failures going to the
+error file.
+
+``GET /v1/mock/stats`` returns request, status and token counters.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+MOCK_CATEGORIES = [
+    "Win Enterprise Deals",
+    "Ensure Regulatory & Data Compliance",
+    "Improve Platform Usability & Performance",
+]
+
+# Single-token labels, when the prompt asks for the category's letter
+MOCK_LABELS = ['A', 'B', 'C']
+
+# How the category reply is worded; AIAnalyzer has to cope with all of them
+RESPONSE_SHAPES = ['exact', 'verbose', 'lowercase', 'invalid', 'mixed']
+
+
+def approx_tokens(text: str) -> int:
+    """Rough GPT token count (~4 characters per token)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 0.0,
+                 response_shape: str = 'exact', seed: int = 0, reply: Optional[str] = None,
+                 model_latency: Optional[Dict[str, float]] = None, batch_latency: float = 0.0):
+        if response_shape not in RESPONSE_SHAPES:
+            raise ValueError(f"response_shape must be one of {RESPONSE_SHAPES}")
+        super().__init__(address, _MockLLMHandler)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        # Mean latency per requested model, e.g. a slower large model; others use ``latency``
+        self.model_latency = dict(model_latency or {})
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.response_shape = response_shape
+        self.reply = reply
+        # Seconds a submitted batch stays in progress
+        self.batch_latency = batch_latency
+        self._rng = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.files: Dict[str, dict] = {}
+        self.batches: Dict[str, dict] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.connections = 0
+            self.requests = 0
+            self.status_counts: Dict[int, int] = {}
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.batches_created = 0
+            self.batch_requests = 0
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                'connections': self.connections,
+                'requests': self.requests,
+                'status_counts': dict(self.status_counts),
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'batches_created': self.batches_created,
+                'batch_requests': self.batch_requests,
+            }
+
+    def get_request(self):
+        request = super().get_request()
+        with self._stats_lock:
+            self.connections += 1
+        return request
+
+    def draw(self, model: Optional[str] = None) -> Tuple[float, float]:
+        """Return (failure roll, latency) for one request"""
+        with self._stats_lock:
+            self.requests += 1
+            roll = self._rng.random()
+            delay = self.model_latency.get(model, self.latency)
+            if self.latency_jitter > 0:
+                delay = max(0.0, self._rng.gauss(delay, self.latency_jitter))
+        return roll, delay
+
+    def record(self, status: int, prompt_tokens: int = 0, completion_tokens: int = 0):
+        with self._stats_lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def completion_payload(self, body: dict) -> dict:
+        """Successful chat.completion response for a request body"""
+        messages = body.get('messages', [])
+        content = self.completion_text(messages)
+        max_tokens = body.get('max_tokens')
+        if max_tokens:
+            content = content[:max_tokens * 4]
+        prompt_tokens = sum(approx_tokens(m.get('content', '')) for m in messages)
+        completion_tokens = approx_tokens(content)
+        self.record(200, prompt_tokens, completion_tokens)
+        choice = {
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content},
+            'finish_reason': 'stop',
+        }
+        if body.get('logprobs'):
+            choice['logprobs'] = {'content': [self.first_token_logprobs(messages, content,
+                                                                        body.get('top_logprobs') or 0)]}
+        return {
+            'id': f"chatcmpl-mock-{next(self._ids)}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'mock'),
+            'choices': [choice],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        }
+
+    def add_file(self, filename: str, purpose: str, data: bytes) -> dict:
+        with self._stats_lock:
+            file_id = f"file-mock-{next(self._ids)}"
+            self.files[file_id] = {'id': file_id, 'object': 'file', 'bytes': len(data),
+                                   'created_at': int(time.time()), 'filename': filename,
+                                   'purpose': purpose, 'data': data}
+        return self.files[file_id]
+
+    def create_batch(self, body: dict) -> Optional[dict]:
+        input_file = self.files.get(body.get('input_file_id'))
+        if input_file is None:
+            return None
+        lines = [line for line in input_file['data'].splitlines() if line.strip()]
+        with self._stats_lock:
+            batch_id = f"batch_mock_{next(self._ids)}"
+            self.batches_created += 1
+            self.batches[batch_id] = {
+                'id': batch_id, 'object': 'batch', 'endpoint': body.get('endpoint'),
+                'completion_window': body.get('completion_window'), 'input_file_id': input_file['id'],
+                'status': 'in_progress', 'created_at': int(time.time()), 'output_file_id': None,
+                'error_file_id': None, 'errors': None, 'metadata': body.get('metadata'),
+                'request_counts': {'total': len(lines), 'completed': 0, 'failed': 0},
+                '_submitted': time.monotonic(),
+            }
+        return self.batch_view(batch_id)
+
+    def batch_view(self, batch_id: str) -> Optional[dict]:
+        """The batch object, running it first if its latency has passed"""
+        batch = self.batches.get(batch_id)
+        if batch is None:
+            return None
+        with self._stats_lock:
+            due = batch['status'] == 'in_progress' and time.monotonic() - batch['_submitted'] >= self.batch_latency
+            if due:
+                # Concurrent polls must not run the batch twice
+                batch['status'] = 'finalizing'
+        if due:
+            self._run_batch(batch)
+        return {key: value for key, value in batch.items() if not key.startswith('_')}
+
+    def cancel_batch(self, batch_id: str) -> Optional[dict]:
+        batch = self.batches.get(batch_id)
+        with self._stats_lock:
+            if batch is not None and batch['status'] == 'in_progress':
+                batch['status'] = 'cancelled'
+        return self.batch_view(batch_id)
+
+    def _run_batch(self, batch: dict):
+        outputs, errors = [], []
+        for line in self.files[batch['input_file_id']]['data'].splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            with self._stats_lock:
+                self.batch_requests += 1
+                roll = self._rng.random()
+            result = {'id': f"batch_req_mock_{next(self._ids)}", 'custom_id': request.get('custom_id')}
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.record(500)
+                result.update(response={'status_code': 500, 'body': {'error': {
+                    'message': "Internal server error (mock)", 'type': 'server_error'}}}, error=None)
+                errors.append(result)
+            else:
+                result.update(response={'status_code': 200, 'request_id': result['id'],
+                                        'body': self.completion_payload(request.get('body', {}))}, error=None)
+                outputs.append(result)
+        for key, results in (('output_file_id', outputs), ('error_file_id', errors)):
+            if results:
+                data = ''.join(json.dumps(result) + '\n' for result in results).encode('utf-8')
+                batch[key] = self.add_file(f"{batch['id']}_{key[:-8]}.jsonl", 'batch_output', data)['id']
+        batch['request_counts'].update(completed=len(outputs), failed=len(errors))
+        batch['status'] = 'completed'
+        batch['completed_at'] = int(time.time())
+
+    @staticmethod
+    def _prompt(messages: list) -> Tuple[str, int]:
+        # (system prompt, digest of the user message)
+        system = next((m.get('content', '') for m in messages if m.get('role') == 'system'), '')
+        user = next((m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'), '')
+        return system, int(hashlib.md5(user.encode('utf-8')).hexdigest(), 16)
+
+    def label_probabilities(self, digest: int) -> List[float]:
+        """Deterministic per-prompt distribution over the categories"""
+        top = 0.4 + 0.59 * ((digest >> 16) % 1000) / 1000
+        split = 0.05 + 0.9 * ((digest >> 32) % 1000) / 1000
+        probabilities = [(1 - top) * split, (1 - top) * (1 - split)]
+        probabilities.insert(digest % len(MOCK_CATEGORIES), top)
+        return probabilities
+
+    def first_token_logprobs(self, messages: list, content: str, top_logprobs: int) -> dict:
+        system, digest = self._prompt(messages)
+        token = content[:1] or ' '
+        alternatives = []
+        if 'letter' in system.lower() and self.reply is None:
+            # The label letters carry 99% of the mass; the rest goes to a stray token
+            for label, probability in zip(MOCK_LABELS, self.label_probabilities(digest)):
+                alternatives.append({'token': label, 'logprob': math.log(0.99 * probability)})
+            alternatives.append({'token': 'The', 'logprob': math.log(0.01)})
+            alternatives.sort(key=lambda alternative: alternative['logprob'], reverse=True)
+        else:
+            alternatives.append({'token': token, 'logprob': 0.0})
+        alternatives = alternatives[:top_logprobs]
+        return {'token': token, 'logprob': alternatives[0]['logprob'] if alternatives else 0.0,
+                'top_logprobs': alternatives}
+
+    def completion_text(self, messages: list) -> str:
+        if self.reply is not None:
+            return self.reply
+        system, digest = self._prompt(messages)
+
+        if 'sentiment' in system.lower():
+            # Two 1-5 ratings: sentiment, then urgency
+            return f"{1 + digest % 5}{1 + (digest >> 8) % 5}"
+        if 'categoriz' not in system.lower():
+            return f"Customer reports issue #{digest % 10000} affecting daily operations and needs a fix."
+
+        category = MOCK_CATEGORIES[digest % len(MOCK_CATEGORIES)]
+        shape = self.response_shape
+        if shape == 'mixed':
+            shape = RESPONSE_SHAPES[(digest >> 8) % 4]
+        if 'letter' in system.lower():
+            label = MOCK_LABELS[digest % len(MOCK_LABELS)]
+            if shape == 'lowercase':
+                return label.lower()
+            if shape == 'invalid':
+                return "Unclear"
+            return label
+        if shape == 'verbose':
+            return f"Category: {category}."
+        if shape == 'lowercase':
+            return category.lower()
+        if shape == 'invalid':
+            return "Unclear"
+        return category
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+class _MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second one stalls on delayed ACKs and keep-alive looks slower than it is
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.rstrip('/')
+        parts = path.split('/')
+        if path.endswith('/mock/stats'):
+            self._send_json(200, self.server.stats())
+        elif len(parts) >= 3 and parts[-3] == 'files' and parts[-1] == 'content':
+            stored = self.server.files.get(parts[-2])
+            if stored is None:
+                self._send_error(404, f"No such file {parts[-2]}", 'invalid_request_error')
+            else:
+                self._send_bytes(200, stored['data'], 'application/jsonl')
+        elif len(parts) >= 2 and parts[-2] == 'batches':
+            self._send_found(self.server.batch_view(parts[-1]), parts[-1])
+        elif path.endswith('/models'):
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'gpt-3.5-turbo', 'object': 'model'}]})
+        else:
+            self._send_error(404, f"Unknown path {self.path}", 'invalid_request_error')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length)
+        path = self.path.rstrip('/')
+        parts = path.split('/')
+        if path.endswith('/files'):
+            self._upload_file(raw)
+            return
+        body = json.loads(raw or b'{}')
+        if path.endswith('/batches'):
+            self._send_found(self.server.create_batch(body), body.get('input_file_id'))
+            return
+        if len(parts) >= 3 and parts[-3] == 'batches' and parts[-1] == 'cancel':
+            self._send_found(self.server.cancel_batch(parts[-2]), parts[-2])
+            return
+        if not path.endswith('/chat/completions'):
+            self._send_error(404, f"Unknown path {self.path}", 'invalid_request_error')
+            return
+
+        server = self.server
+        roll, delay = server.draw(body.get('model'))
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < server.rate_limit_rate:
+            headers = {'retry-after': str(server.retry_after)} if server.retry_after > 0 else {}
+            self._send_error(429, "Rate limit reached (mock)", 'rate_limit_error', headers)
+            return
+        if roll < server.rate_limit_rate + server.error_rate:
+            self._send_error(500, "Internal server error (mock)", 'server_error')
+            return
+
+        self._send_json(200, server.completion_payload(body))
+
+    def _upload_file(self, raw: bytes):
+        # multipart/form-data with 'purpose' and 'file' fields, as the SDK sends it
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode('latin-1')
+        form = BytesParser(policy=HTTP).parsebytes(header + raw)
+        fields, filename = {}, 'upload.jsonl'
+        for part in form.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            fields[name] = part.get_payload(decode=True)
+            if name == 'file':
+                filename = part.get_filename() or filename
+        if 'file' not in fields:
+            self._send_error(400, "Missing file field", 'invalid_request_error')
+            return
+        stored = self.server.add_file(filename, fields.get('purpose', b'').decode('utf-8'), fields['file'])
+        self._send_json(200, {key: value for key, value in stored.items() if key != 'data'})
+
+    def _send_found(self, payload: Optional[dict], name: Optional[str]):
+        if payload is None:
+            self._send_error(404, f"No such object {name}", 'invalid_request_error')
+        else:
+            self._send_json(200, payload)
+
+    def _send_error(self, status: int, message: str, error_type: str, headers: Optional[dict] = None):
+        self.server.record(status)
+        self._send_json(status, {'error': {'message': message, 'type': error_type}}, headers)
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+        self._send_bytes(status, json.dumps(payload).encode('utf-8'), 'application/json', headers)
+
+    def _send_bytes(self, status: int, data: bytes, content_type: str, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 0, **kwargs) -> MockLLMServer:
+    """Start a server on a background thread; port 0 picks a free port"""
+    server = MockLLMServer((host, port), **kwargs)
+    thread = threading.Thread(target=server.serve_forever, name='mock-llm-server', daemon=True)
+    thread.start()
+    return server
+
+
+def parse_model_latency(values) -> Dict[str, float]:
+    """['gpt-4o=0.8', ...] -> {'gpt-4o': 0.8}"""
+    latency = {}
+    for value in values:
+        model, _, seconds = value.rpartition('=')
+        if not model:
+            raise ValueError(f"Expected MODEL=SECONDS, got {value!r}")
+        latency[model] = float(seconds)
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stub server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0, help="Mean response latency in seconds")
+    parser.add_argument('--model-latency', action='append', default=[], metavar='MODEL=SECONDS',
+                        help="Mean latency for one model (repeatable), e.g. gpt-4o=0.8")
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help="Latency standard deviation in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--retry-after', type=float, default=0.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--response-shape', choices=RESPONSE_SHAPES, default='exact')
+    parser.add_argument('--batch-latency', type=float, default=0.0, help="Seconds a batch job stays in progress")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        (args.host, args.port), latency=args.latency, latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        response_shape=args.response_shape, seed=args.seed,
+        model_latency=parse_model_latency(args.model_latency), batch_latency=args.batch_latency
+    )
+    print(f"Mock LLM server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Route each feedback item to the cheapest backend that can handle it.
+
+A routing policy is an ordered list of tiers. ``local`` is a keyword
+classifier that runs in-process at no cost, ``small`` and ``large`` are
+chat models. A row's category comes from the first tier that is confident
+enough; Critical rows skip straight to the last tier. The summary is
+generated by the large model when the row ended there and by the small
+model otherwise, since the local tier cannot write one.
+
+``ModelRouter`` also keeps per-tier call counts, latency, tokens and
+estimated cost so policies can be compared on the same data.
+"""
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from metrics import estimate_cost
+
+LOCAL_TIER = 'local'
+SMALL_MODEL = 'gpt-4o-mini'
+LARGE_MODEL = 'gpt-4o'
+
+# Policy name -> tiers tried in order. Without a router (policy 'single')
+# every call goes to AIAnalyzer.MODEL as before.
+ROUTING_POLICIES = {
+    'single': [],
+    'small_only': ['small'],
+    'small_large': ['small', 'large'],
+    'cascade': [LOCAL_TIER, 'small', 'large'],
+}
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.6
+
+# Term -> weight per category. Terms match at the start of a word, so
+# 'crash' also covers 'crashes' and 'crashed'.
+LOCAL_CLASSIFIER_KEYWORDS = {
+    'Win Enterprise Deals': {
+        'enterprise': 1, 'sso': 2, 'single sign-on': 2, 'okta': 2, 'active directory': 2, 'saml': 2,
+        'multi-tenan': 2, 'white-label': 2, 'rbac': 2, 'role-based': 2, 'subsidiar': 1, 'renewal': 1,
+        'alternatives': 1, 'fortune 500': 2, 'procurement': 1, 'contract': 1, 'deal': 1,
+    },
+    'Ensure Regulatory & Data Compliance': {
+        'compliance': 2, 'compliant': 2, 'sox': 2, 'gdpr': 2, 'hipaa': 2, 'ccpa': 2, 'audit': 2,
+        'regulat': 2, 'encrypt': 2, 'security review': 2, 'privacy': 2, 'data retention': 2,
+        'data residency': 2, 'data export': 1, 'legal': 1,
+    },
+    'Improve Platform Usability & Performance': {
+        'slow': 2, 'crash': 2, 'times out': 2, 'timeout': 2, 'timing out': 2, 'performance': 2,
+        'latency': 2, 'lag': 1, 'freez': 2, 'loading': 1, 'usability': 2, 'confusing': 2,
+        'training': 1, 'intuitive': 1, 'inconsistent': 1, 'bug': 1, 'error': 1, 'concurrent users': 1,
+    },
+}
+
+
+class KeywordClassifier:
+    """Weighted keyword match with a margin-based confidence in [0, 1)"""
+
+    def __init__(self, keywords: Optional[Dict[str, Dict[str, int]]] = None):
+        keywords = keywords if keywords is not None else LOCAL_CLASSIFIER_KEYWORDS
+        self.categories = list(keywords)
+        self._terms: Dict[str, Tuple[int, int]] = {}
+        for index, terms in enumerate(keywords.values()):
+            for term, weight in terms.items():
+                self._terms[term.lower()] = (index, weight)
+        # Longest first, so 'data export' wins over a shorter overlapping term
+        alternation = '|'.join(re.escape(term) for term in sorted(self._terms, key=len, reverse=True))
+        self._pattern = re.compile(r'\b(?:' + alternation + ')', re.IGNORECASE)
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """(category, confidence); (None, 0.0) when no keyword matches"""
+        if not isinstance(text, str):
+            return None, 0.0
+        scores = [0] * len(self.categories)
+        for match in self._pattern.finditer(text):
+            index, weight = self._terms[match.group(0).lower()]
+            scores[index] += weight
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        top, second = scores[ranked[0]], scores[ranked[1]] if len(ranked) > 1 else 0
+        if top == 0:
+            return None, 0.0
+        # One strong term alone scores 2/3; conflicting evidence pulls it down
+        return self.categories[ranked[0]], (top - second) / (top + second + 1)
+
+
+class _TierStats:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.rows = 0
+
+
+class ModelRouter:
+    """Routing policy plus per-tier accounting, shared by AIAnalyzer worker threads"""
+
+    def __init__(self, policy: str = 'cascade', small_model: str = SMALL_MODEL,
+                 large_model: str = LARGE_MODEL,
+                 confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+                 classifier: Optional[KeywordClassifier] = None):
+        if policy not in ROUTING_POLICIES or not ROUTING_POLICIES[policy]:
+            raise ValueError(f"policy must be one of {[p for p, tiers in ROUTING_POLICIES.items() if tiers]}")
+        self.policy = policy
+        self.tiers: List[str] = ROUTING_POLICIES[policy]
+        self.models = {'small': small_model, 'large': large_model}
+        self.confidence_threshold = confidence_threshold
+        self.classifier = classifier if classifier is not None else KeywordClassifier()
+        self._tier_by_model = {model: tier for tier, model in self.models.items()}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _TierStats] = {tier: _TierStats() for tier in self.tiers}
+        self._reasons: Dict[Tuple[str, str], int] = {}
+
+    def tiers_for(self, severity: Optional[str]) -> List[str]:
+        if severity == 'Critical':
+            return self.tiers[-1:]
+        return self.tiers
+
+    def summary_model(self, tier: str) -> str:
+        return self.models['large'] if tier == 'large' else self.models['small']
+
+    def observe_call(self, model: str, seconds: float, prompt_tokens: int = 0, completion_tokens: int = 0):
+        """Account one backend call; ``model`` is a chat model or LOCAL_TIER"""
+        tier = LOCAL_TIER if model == LOCAL_TIER else self._tier_by_model.get(model)
+        if tier is None:
+            return
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            stats = self._stats.setdefault(tier, _TierStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost += cost
+
+    def observe_row(self, tier: str, reason: str):
+        """Record which tier settled a row's category and why (confident, critical, low_confidence, fallback, failed)"""
+        with self._lock:
+            self._stats.setdefault(tier, _TierStats()).rows += 1
+            self._reasons[(tier, reason)] = self._reasons.get((tier, reason), 0) + 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            tiers = {}
+            for tier, stats in self._stats.items():
+                tiers[tier] = {
+                    'model': self.models.get(tier, LOCAL_TIER),
+                    'rows_settled': stats.rows,
+                    'calls': stats.calls,
+                    'seconds': round(stats.seconds, 4),
+                    'mean_latency_ms': round(stats.seconds / stats.calls * 1000, 3) if stats.calls else None,
+                    'prompt_tokens': stats.prompt_tokens,
+                    'completion_tokens': stats.completion_tokens,
+                    'cost_usd': round(stats.cost, 6),
+                }
+            reasons = {f'{tier}:{reason}': count for (tier, reason), count in sorted(self._reasons.items())}
+        return {
+            'policy': self.policy,
+            'confidence_threshold': self.confidence_threshold,
+            'tiers': tiers,
+            'reasons': reasons,
+            'cost_usd': round(sum(t['cost_usd'] for t in tiers.values()), 6),
+        }
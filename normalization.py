@@ -0,0 +1,117 @@
+"""Single-pass normalization of categorical columns through lookup tables.
+
+Each raw column is factorized once (or read straight from its categorical
+codes); only the distinct raw spellings are normalized in Python, and the
+resulting code table is applied to every row with one NumPy take. Invalid
+values are reported as counts per raw value instead of row copies.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+INVALID = -1
+MISSING = -2
+
+
+def _lookup_key(value) -> str:
+    # Case- and whitespace-insensitive: ' high', 'HIGH' and 'High ' all match
+    return ' '.join(str(value).split()).lower()
+
+
+class ColumnNormalizer:
+    """Maps raw spellings and aliases of one column onto fixed categories"""
+
+    def __init__(self, categories: List[str], aliases: Optional[Dict[str, str]] = None,
+                 default: Optional[str] = None):
+        self.categories = list(categories)
+        self.default = default
+        self._lookup = {_lookup_key(category): i for i, category in enumerate(self.categories)}
+        for alias, target in (aliases or {}).items():
+            self._lookup[_lookup_key(alias)] = self.categories.index(target)
+
+    @property
+    def default_code(self) -> int:
+        return self.categories.index(self.default) if self.default is not None else INVALID
+
+    def code_for(self, value) -> int:
+        return self._lookup.get(_lookup_key(value), INVALID)
+
+    def encode(self, values: pd.Series) -> Tuple[np.ndarray, pd.Index, np.ndarray]:
+        """Return (raw codes, raw uniques, category code per unique).
+
+        Raw codes are -1 for missing values, like pd.factorize.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            raw_codes = values.cat.codes.to_numpy()
+            uniques = values.cat.categories
+        else:
+            raw_codes, uniques = pd.factorize(values)
+        table = np.fromiter((self.code_for(value) for value in uniques), dtype=np.int8, count=len(uniques))
+        return raw_codes, pd.Index(uniques), table
+
+    def normalize(self, values: pd.Series, keep: Optional[np.ndarray] = None) -> Tuple[np.ndarray, 'ColumnReport']:
+        """Category codes (default applied) and a report for the ``keep`` rows"""
+        raw_codes, uniques, table = self.encode(values)
+        if keep is not None:
+            raw_codes = raw_codes[keep]
+        # Index -1 (missing) lands on the trailing MISSING sentinel
+        codes = np.append(table, np.int8(MISSING))[raw_codes]
+
+        report = ColumnReport()
+        if len(uniques):
+            # Shift by one so missing values get their own bin
+            per_unique = np.bincount(raw_codes + 1, minlength=len(uniques) + 1)[1:]
+            exact = np.array([value in self.categories for value in uniques], dtype=bool)
+            report.normalized = int(per_unique[(table >= 0) & ~exact].sum())
+            for i in np.flatnonzero((table == INVALID) & (per_unique > 0)):
+                report.invalid[str(uniques[i])] = int(per_unique[i])
+
+        if report.invalid and self.default is not None:
+            codes[codes == INVALID] = self.default_code
+        return codes, report
+
+    def to_categorical(self, codes: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(codes, categories=self.categories)
+
+
+class ColumnReport:
+    def __init__(self):
+        # Rows whose raw spelling or alias mapped onto a category
+        self.normalized = 0
+        # Raw value -> rows, for values replaced with the default
+        self.invalid: Dict[str, int] = {}
+
+    @property
+    def invalid_rows(self) -> int:
+        return sum(self.invalid.values())
+
+    def top_invalid(self, limit: int = 3) -> List[Tuple[str, int]]:
+        return sorted(self.invalid.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+class ValidationReport:
+    """What validation dropped, normalized or defaulted, as counts"""
+
+    def __init__(self, rows_in: int = 0):
+        self.rows_in = rows_in
+        self.rows_out = 0
+        self.missing: Dict[str, int] = {}
+        self.columns: Dict[str, ColumnReport] = {}
+        # Non-empty timestamps that could not be parsed (kept as NaT)
+        self.unparsed_timestamps = 0
+
+    @property
+    def dropped_rows(self) -> int:
+        return self.rows_in - self.rows_out
+
+    def to_dict(self) -> dict:
+        return {
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'dropped_rows': self.dropped_rows,
+            'missing': dict(self.missing),
+            'normalized': {column: report.normalized for column, report in self.columns.items()},
+            'invalid': {column: dict(report.invalid) for column, report in self.columns.items()},
+            'unparsed_timestamps': self.unparsed_timestamps,
+        }
@@ -0,0 +1,157 @@
+"""PII redaction for feedback text before it reaches prompts, caches or exports.
+
+``PIIRedactor`` replaces each match of its rules with a ``[TYPE]``
+placeholder. A rule is either a built-in regex (emails, card numbers,
+account IDs, IP addresses, phone numbers) or a dictionary of terms such as
+customer or contact names, matched case-insensitively on word boundaries.
+
+Redaction runs over a whole column in two steps:
+
+1. Screen: one ``str.contains`` with every rule in a single alternation
+   finds the rows with anything to redact. On pandas' pyarrow string
+   dtype this is a single native pass, so clean rows cost one scan.
+2. Rules: each rule counts and replaces its matches on the screened rows
+   only, in rule order, so a later rule never sees an earlier placeholder's
+   text. The counts make up the per-type report.
+
+Rules must stay within the regex syntax shared by Python's ``re`` and RE2
+(pyarrow's engine): no lookarounds or backreferences. Case-insensitive
+rules use a scoped ``(?i:...)`` group, since the screen joins every rule
+into one pattern and Python only accepts a global ``(?i)`` at its start;
+a leading ``(?i)`` in a configured pattern is rewritten that way.
+
+Dictionaries and pattern overrides come from a JSON file, for example::
+
+    {"dictionaries": {"customer": ["Acme Corp"], "contact": ["Jordan Smith"]},
+     "patterns": {"account_id": "\\\\bCUST-\\\\d{6}\\\\b", "ip_address": null}}
+
+A ``null`` pattern switches that built-in off.
+"""
+import json
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PII_CONFIG_ENV = 'FEEDBACK_PII_CONFIG'
+
+# Type -> pattern, applied in this order. Emails and card numbers go
+# before phone numbers, whose pattern would match part of either.
+DEFAULT_PATTERNS = {
+    'email': r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}',
+    'card_number': r'\b(?:\d[ -]?){12,15}\d\b',
+    'account_id': r'(?i:\b(?:acct|acc|cust|account|customer)(?:[ _-]?(?:id|no|number))?[ #:._-]{0,3}\d{5,}\b)',
+    'ip_address': r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
+    # A country code, area code or leading group is required, so year
+    # ranges like 2023-2024 and bare counts are left alone
+    'phone': r'(?:\+\d{1,3}[ .-]?|\(\d{2,4}\)[ .-]?|\b\d{2,4}[ .-])(?:\(?\d{2,4}\)?[ .-])?\d{3,4}[ .-]?\d{4}\b',
+}
+
+
+def placeholder(pii_type: str) -> str:
+    return f'[{pii_type.upper()}]'
+
+
+def _dictionary_pattern(terms: Iterable[str]) -> Optional[str]:
+    # Longest first, so 'Acme Corp EU' wins over 'Acme Corp'
+    terms = sorted({term.strip() for term in terms if term and term.strip()}, key=len, reverse=True)
+    if not terms:
+        return None
+    return r'(?i:\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\b)'
+
+
+def _scoped(pattern: str) -> str:
+    # '(?i)rest' -> '(?i:rest)', so the rule can sit inside an alternation
+    flags = re.match(r'\(\?([a-z]+)\)', pattern)
+    return f'(?{flags.group(1)}:{pattern[flags.end():]})' if flags else pattern
+
+
+class RedactionReport:
+    """Placeholders written per PII type, as counts"""
+
+    def __init__(self, rows: int = 0):
+        self.rows = rows
+        # Rows with at least one redaction
+        self.redacted_rows = 0
+        self.counts: Dict[str, int] = {}
+        self.seconds = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def summary(self) -> str:
+        """e.g. '3 email, 1 phone'; empty when nothing was redacted"""
+        return ', '.join(f"{count} {pii_type.replace('_', ' ')}" for pii_type, count in self.counts.items() if count)
+
+    def to_dict(self) -> dict:
+        return {
+            'rows': self.rows,
+            'redacted_rows': self.redacted_rows,
+            'redactions': self.total,
+            'counts': dict(self.counts),
+            'seconds': round(self.seconds, 4),
+        }
+
+
+class PIIRedactor:
+    def __init__(self, patterns: Optional[Dict[str, Optional[str]]] = None,
+                 dictionaries: Optional[Dict[str, List[str]]] = None):
+        """``patterns`` override DEFAULT_PATTERNS by type (None drops one);
+        each dictionary becomes a rule of its own type after the patterns"""
+        rules = dict(DEFAULT_PATTERNS)
+        rules.update(patterns or {})
+        for pii_type, terms in (dictionaries or {}).items():
+            rules[pii_type] = _dictionary_pattern(terms)
+        self.rules = {pii_type: _scoped(pattern) for pii_type, pattern in rules.items() if pattern}
+        self._any = '|'.join(f'(?:{pattern})' for pattern in self.rules.values())
+        self._compiled = [(re.compile(pattern), placeholder(pii_type)) for pii_type, pattern in self.rules.items()]
+
+    @classmethod
+    def from_file(cls, path: str) -> 'PIIRedactor':
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config.get('patterns'), config.get('dictionaries'))
+
+    @classmethod
+    def from_env(cls) -> 'PIIRedactor':
+        path = os.getenv(PII_CONFIG_ENV)
+        return cls.from_file(path) if path else cls()
+
+    def redact(self, texts: pd.Series) -> Tuple[pd.Series, RedactionReport]:
+        """Redacted copy of ``texts`` and what was replaced; missing text stays missing"""
+        start = time.perf_counter()
+        texts = texts.astype('str') if texts.dtype == object else texts
+        report = RedactionReport(rows=len(texts))
+        report.counts = dict.fromkeys(self.rules, 0)
+        if self.rules and len(texts):
+            screened = np.flatnonzero(texts.str.contains(self._any, na=False).to_numpy(dtype=bool))
+            if len(screened):
+                subset = texts.iloc[screened]
+                redacted = np.zeros(len(screened), dtype=bool)
+                for pii_type, pattern in self.rules.items():
+                    hits = subset.str.count(pattern).to_numpy(dtype=np.int64)
+                    report.counts[pii_type] = int(hits.sum())
+                    if report.counts[pii_type]:
+                        subset = subset.str.replace(pattern, placeholder(pii_type), regex=True)
+                        redacted |= hits > 0
+                report.redacted_rows = int(redacted.sum())
+                texts = texts.copy()
+                texts.iloc[screened] = subset.to_numpy()
+        report.seconds = time.perf_counter() - start
+        return texts, report
+
+    def redact_text(self, text):
+        """Redact one text, for callers outside the DataFrame pipeline"""
+        if not isinstance(text, str):
+            return text
+        for pattern, replacement in self._compiled:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def apply(self, df: pd.DataFrame, column: str = 'Feedback') -> Tuple[pd.DataFrame, RedactionReport]:
+        texts, report = self.redact(df[column])
+        return df.assign(**{column: texts}), report
@@ -0,0 +1,119 @@
+"""Token-aware compaction of feedback text before it is sent to the model.
+
+Pasted emails and logs carry signatures, quoted reply chains, legal
+disclaimers and stack traces that cost tokens without changing the
+category or summary. ``compact_feedback`` strips that boilerplate and
+truncates what is left to a token budget. Token counts use tiktoken when
+it is installed and fall back to ~4 characters per token otherwise.
+"""
+import re
+from typing import Optional
+
+DEFAULT_MAX_FEEDBACK_TOKENS = 256
+CHARS_PER_TOKEN = 4
+TIKTOKEN_ENCODING = 'cl100k_base'
+TRUNCATION_MARKER = ' …'
+
+# Anything from here to the end of the text is a forwarded or quoted thread.
+# A "From:" line only counts as a reply header when the next line is another
+# header, so feedback that merely starts with "From: " is kept
+_QUOTED_THREAD = re.compile(
+    r'^(?:-{2,}\s*Original Message\s*-{2,}\s*$|On .{0,200}wrote:\s*$'
+    r'|From:[ \t].*\n[ \t]*(?:Sent|Date|To|Cc|Subject):)(?s:.*)',
+    re.IGNORECASE | re.MULTILINE,
+)
+_QUOTED_LINE = re.compile(r'^[ \t]*>.*(?:\n|$)', re.MULTILINE)
+
+# "-- " signature delimiter, or a sign-off line followed by a short tail
+_SIGNATURE = re.compile(
+    r'(?:^--[ \t]*$|^[ \t]*(?:thanks|thank you|regards|best|best regards|kind regards|cheers|sincerely)'
+    r'[ \t]*[,!.]?[ \t]*$(?=(?:\n[^\n]*){0,6}\Z)|^Sent from my \w+)(?s:.*)',
+    re.IGNORECASE | re.MULTILINE,
+)
+_DISCLAIMER = re.compile(
+    r'\b(?:This|The information in this) (?:e-?mail|message|communication)\b[^\n]*?'
+    r'\b(?:confidential|privileged|intended solely)\b[^\n]*',
+    re.IGNORECASE,
+)
+
+# Python tracebacks collapse to their final "ErrorType: message" line;
+# Java-style "at ..." frames are dropped
+_TRACEBACK = re.compile(
+    r'^Traceback \(most recent call last\):\n(?:[ \t]+.*\n)+(?P<error>[\w.]+(?::.*)?)$',
+    re.MULTILINE,
+)
+_JAVA_FRAMES = re.compile(r'(?:^[ \t]+at [\w.$<>]+\(.*\)[ \t]*(?:\n|$))+', re.MULTILINE)
+
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def strip_boilerplate(text: str) -> str:
+    """Remove quoted replies, signatures, disclaimers and stack frames"""
+    # Boilerplate is always pasted on its own lines; single-line feedback is
+    # by far the common case and skips every regex
+    if '\n' not in text:
+        return text.strip()
+
+    text = _QUOTED_THREAD.sub('', text)
+    text = _QUOTED_LINE.sub('', text)
+    text = _TRACEBACK.sub(lambda m: f"[stack trace: {m.group('error').strip()}]", text)
+    text = _JAVA_FRAMES.sub('', text)
+    text = _SIGNATURE.sub('', text)
+    text = _DISCLAIMER.sub('', text)
+    return _BLANK_LINES.sub('\n', text).strip()
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """Keep the first ``max_tokens`` tokens, where the complaint usually is"""
+    if max_tokens <= 0:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens]).rstrip() + TRUNCATION_MARKER
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    # Prefer a word boundary when one is reasonably close
+    boundary = cut.rfind(' ', int(max_chars * 0.8))
+    return (cut[:boundary] if boundary > 0 else cut).rstrip() + TRUNCATION_MARKER
+
+
+def compact_feedback(text: str, max_tokens: Optional[int] = DEFAULT_MAX_FEEDBACK_TOKENS) -> str:
+    if not isinstance(text, str):
+        return text
+    compacted = strip_boilerplate(text)
+    if not compacted:
+        # Nothing but boilerplate; the raw text is better than an empty prompt
+        compacted = text.strip()
+    if max_tokens:
+        compacted = truncate_to_budget(compacted, max_tokens)
+    return compacted
@@ -0,0 +1,163 @@
+import json
+import logging
+import sys
+import time
+from typing import Callable, Optional, TextIO
+
+ProgressCallback = Callable[[float, str], None]
+
+
+class Reporter:
+    """Sink for user-facing messages and progress from the core classes.
+
+    The base class drops everything, which is what headless callers that
+    don't care about progress want.
+    """
+
+    def info(self, message: str):
+        pass
+
+    def warning(self, message: str):
+        pass
+
+    def error(self, message: str):
+        pass
+
+    def progress(self, fraction: float, message: str = ""):
+        pass
+
+    def progress_done(self, message: str = ""):
+        pass
+
+    def event(self, name: str, **fields):
+        pass
+
+
+class CallbackReporter(Reporter):
+    """Forwards progress to a plain ``callback(fraction, message)`` function"""
+
+    def __init__(self, progress_callback: ProgressCallback, base: Optional[Reporter] = None):
+        self.progress_callback = progress_callback
+        self.base = base if base is not None else LoggingReporter()
+
+    def info(self, message: str):
+        self.base.info(message)
+
+    def warning(self, message: str):
+        self.base.warning(message)
+
+    def error(self, message: str):
+        self.base.error(message)
+
+    def progress(self, fraction: float, message: str = ""):
+        self.progress_callback(fraction, message)
+
+    def progress_done(self, message: str = ""):
+        self.progress_callback(1.0, message)
+
+    def event(self, name: str, **fields):
+        self.base.event(name, **fields)
+
+
+class LoggingReporter(Reporter):
+    """Sends messages to the standard logging module; progress is dropped"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger if logger is not None else logging.getLogger('feedback')
+
+    def info(self, message: str):
+        self.logger.info(message)
+
+    def warning(self, message: str):
+        self.logger.warning(message)
+
+    def error(self, message: str):
+        self.logger.error(message)
+
+    def event(self, name: str, **fields):
+        self.logger.debug("%s %s", name, fields)
+
+
+class StreamlitReporter(Reporter):
+    """Routes messages to st.info/st.warning/st.error and a progress bar"""
+
+    def __init__(self):
+        self._progress_bar = None
+        self._status_text = None
+
+    def info(self, message: str):
+        import streamlit as st
+        st.info(message)
+
+    def warning(self, message: str):
+        import streamlit as st
+        st.warning(message)
+
+    def error(self, message: str):
+        import streamlit as st
+        st.error(message)
+
+    def progress(self, fraction: float, message: str = ""):
+        import streamlit as st
+        if self._progress_bar is None:
+            self._progress_bar = st.progress(0)
+            self._status_text = st.empty()
+        self._progress_bar.progress(min(max(fraction, 0.0), 1.0))
+        if message:
+            self._status_text.text(message)
+
+    def progress_done(self, message: str = ""):
+        self.progress(1.0, message)
+        # The next progress() call starts a fresh bar
+        self._progress_bar = None
+        self._status_text = None
+
+
+class JsonLinesReporter(Reporter):
+    """Writes one JSON object per message, for machine consumption"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream if stream is not None else sys.stderr
+
+    def _emit(self, event: str, **fields):
+        record = {'event': event, 'ts': round(time.time(), 3)}
+        record.update(fields)
+        self.stream.write(json.dumps(record, default=str) + "\n")
+        self.stream.flush()
+
+    def info(self, message: str):
+        self._emit('info', message=message)
+
+    def warning(self, message: str):
+        self._emit('warning', message=message)
+
+    def error(self, message: str):
+        self._emit('error', message=message)
+
+    def progress(self, fraction: float, message: str = ""):
+        self._emit('progress', fraction=round(fraction, 4), message=message)
+
+    def progress_done(self, message: str = ""):
+        self._emit('progress', fraction=1.0, message=message)
+
+    def event(self, name: str, **fields):
+        self._emit(name, **fields)
+
+
+def _in_streamlit_script() -> bool:
+    # Only look for a script context if the app already imported Streamlit;
+    # never import it just to find out.
+    if 'streamlit' not in sys.modules:
+        return False
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return True
+    return get_script_run_ctx() is not None
+
+
+def default_reporter() -> Reporter:
+    """StreamlitReporter inside a running Streamlit script, LoggingReporter elsewhere"""
+    if _in_streamlit_script():
+        return StreamlitReporter()
+    return LoggingReporter()
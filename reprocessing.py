@@ -0,0 +1,168 @@
+"""Background re-processing of rows whose AI analysis fell back or failed.
+
+Rows with AI_Status 'fallback' or 'failed' hold local estimates. Instead of
+re-running the whole batch, ``ReprocessingQueue`` retries just those rows
+on a daemon thread with per-row exponential backoff, and waits out an open
+circuit breaker instead of burning attempts on local fallbacks. Completed
+rows are collected until the caller drains them and applies them with
+``DataProcessor.apply_ai_updates``, which patches the frame and rollups in
+place of a full rebuild. Rows still degraded after ``max_attempts`` keep
+their estimate and are counted as abandoned.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from reporters import Reporter
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BASE_DELAY = 5.0
+DEFAULT_MAX_DELAY = 300.0
+
+
+class ReprocessingQueue:
+    def __init__(self, analyzer, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY,
+                 reporter: Optional[Reporter] = None, clock: Callable[[], float] = time.monotonic):
+        self.analyzer = analyzer
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Per-row errors would flood the UI; the drained statuses tell the story
+        self.reporter = reporter if reporter is not None else Reporter()
+        self._clock = clock
+        self._cond = threading.Condition()
+        # (due time, tie-breaker, index label); row details live in _rows
+        self._heap: List[Tuple[float, int, object]] = []
+        self._sequence = itertools.count()
+        # index label -> (text, severity, language, failed attempts)
+        self._rows: Dict[object, Tuple[str, Optional[str], Optional[str], int]] = {}
+        # (index label, analyze_row result)
+        self._done: List[Tuple[object, tuple]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.attempts = 0
+        self.completed = 0
+        self.abandoned = 0
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._rows)
+
+    @property
+    def running(self) -> bool:
+        with self._cond:
+            return self._thread is not None
+
+    def enqueue(self, df: pd.DataFrame) -> int:
+        """Queue the degraded rows of ``df`` (by index label); returns how many were added"""
+        if 'AI_Status' not in df.columns:
+            return 0
+        rows = df[df['AI_Status'].isin(self.analyzer.REPROCESS_STATUSES)]
+        severities = rows['Severity'].astype(object).tolist() if 'Severity' in rows.columns else [None] * len(rows)
+        languages = self.analyzer.row_languages(rows) or [None] * len(rows)
+        added = 0
+        with self._cond:
+            now = self._clock()
+            for index, text, severity, language in zip(rows.index, rows['Feedback'].tolist(), severities, languages):
+                if index in self._rows:
+                    continue
+                self._rows[index] = (text, severity, language, 0)
+                heapq.heappush(self._heap, (now, next(self._sequence), index))
+                added += 1
+            if added:
+                self._stopped = False
+                self._cond.notify_all()
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='ai-reprocessing', daemon=True)
+                    self._thread.start()
+        return added
+
+    def drain(self) -> pd.DataFrame:
+        """AI columns of the rows finished since the last call, indexed like the input frame"""
+        with self._cond:
+            done, self._done = self._done, []
+        updates = pd.DataFrame(index=[index for index, _ in done])
+        self.analyzer.assign_results(updates, [result for _, result in done])
+        return updates
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is pending; False if ``timeout`` ran out first"""
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while self._rows and not self._stopped:
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def to_dict(self) -> dict:
+        with self._cond:
+            return {
+                'pending': len(self._rows),
+                'completed': self.completed,
+                'abandoned': self.abandoned,
+                'attempts': self.attempts,
+            }
+
+    def _next_due(self) -> Optional[Tuple[object, str, Optional[str], Optional[str], int]]:
+        with self._cond:
+            while not self._stopped and self._heap:
+                wait = self._heap[0][0] - self._clock()
+                if wait <= 0:
+                    breaker = self.analyzer.circuit_breaker
+                    wait = breaker.seconds_until_probe() or 0.0
+                    if wait <= 0 and breaker.probe_in_flight:
+                        # Another caller holds the probe; its outcome decides
+                        # whether the next call goes out
+                        wait = self.base_delay
+                if wait <= 0:
+                    _, _, index = heapq.heappop(self._heap)
+                    return (index,) + self._rows[index]
+                self._cond.wait(wait)
+            # Cleared under the lock, so enqueue either sees this thread
+            # still looping or starts a new one
+            self._thread = None
+            return None
+
+    def _run(self):
+        # Exits once the queue is empty; enqueue starts a new thread
+        while True:
+            item = self._next_due()
+            if item is None:
+                return
+            index, text, severity, language, attempts = item
+            result = self.analyzer.analyze_row(text, severity, self.reporter, language)
+            status = result[2]
+            with self._cond:
+                self.attempts += 1
+                if status == self.analyzer.STATUS_FAILED:
+                    attempts += 1
+                if status not in self.analyzer.REPROCESS_STATUSES:
+                    del self._rows[index]
+                    self._done.append((index, result))
+                    self.completed += 1
+                elif attempts >= self.max_attempts:
+                    del self._rows[index]
+                    self.abandoned += 1
+                else:
+                    # A 'fallback' result means the breaker short-circuited the
+                    # call: it opened meanwhile (_next_due then holds the row
+                    # until it probes again) or another caller holds its probe.
+                    # Either way it doesn't count as an attempt, so wait at
+                    # least base_delay rather than retrying straight away
+                    self._rows[index] = (text, severity, language, attempts)
+                    delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1)) if attempts else self.base_delay
+                    heapq.heappush(self._heap, (self._clock() + delay, next(self._sequence), index))
+                self._cond.notify_all()
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+# (AI_Category, AI_Summary, category probabilities or None)
+CacheEntry = Tuple[str, str, Optional[Tuple[float, ...]]]
+
+
+class ResultCache:
+    """Maps feedback text to its AI_Category, AI_Summary and category probabilities.
+
+    Keys are SHA-256 digests of the text so the cache file never stores raw
+    feedback. When a path is given the cache is loaded from and saved to a
+    JSON file, which lets repeated CLI runs skip rows they've already seen.
+    Files written before probabilities were stored load with None for them.
+    Results for non-English feedback are keyed by language as well, since
+    they come from that language's prompts; English keeps the plain text key.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def key(feedback_text: str, language: Optional[str] = None) -> str:
+        if language is not None:
+            feedback_text = f"{language}\0{feedback_text}"
+        return hashlib.sha256(feedback_text.encode('utf-8')).hexdigest()
+
+    def get(self, feedback_text: str, language: Optional[str] = None) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(self.key(feedback_text, language))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(self, feedback_text: str, category: str, summary: str,
+            probabilities: Optional[Sequence[float]] = None, language: Optional[str] = None):
+        if probabilities is not None:
+            probabilities = tuple(round(float(p), 4) for p in probabilities)
+        with self._lock:
+            self._entries[self.key(feedback_text, language)] = (category, summary, probabilities)
+
+    def load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        with self._lock:
+            self._entries = {k: (v[0], v[1], tuple(v[2]) if len(v) > 2 and v[2] else None)
+                             for k, v in raw.items()}
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            raw = {k: list(v) for k, v in self._entries.items()}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(raw, f)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self._entries)
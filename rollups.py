@@ -0,0 +1,277 @@
+"""Daily and weekly feedback rollups for trend charts.
+
+A rollup is a sparse cube: one entry per non-empty (period, AI_Category,
+Product, Severity, Region, Language) cell with its row count and summed
+Opportunity_Score, stored as parallel NumPy arrays. Trend series for any
+breakdown and any combination of dashboard filters are bincounts over
+those cells, so a year of trends over millions of rows reads a few
+hundred thousand numbers at most instead of the row-level frame.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROLLUP_DIMENSIONS = ['AI_Category', 'Product', 'Severity', 'Region', 'Language']
+FREQUENCIES = {'D': 'Daily', 'W': 'Weekly'}
+
+# 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+_WEEK_OFFSET_DAYS = 3
+
+
+class TimeRollup:
+    def __init__(self, freq: str, first_period: np.datetime64, n_periods: int,
+                 labels: Dict[str, List[str]], period: np.ndarray, codes: Dict[str, np.ndarray],
+                 counts: np.ndarray, score_sums: np.ndarray):
+        self.freq = freq
+        self.first_period = first_period
+        self.n_periods = n_periods
+        self.labels = labels
+        self.period = period
+        self.codes = codes
+        self.counts = counts
+        self.score_sums = score_sums
+
+    @property
+    def periods(self) -> np.ndarray:
+        """Start date of every period, including empty ones"""
+        step = 7 if self.freq == 'W' else 1
+        return self.first_period + np.arange(self.n_periods) * np.timedelta64(step, 'D')
+
+    @property
+    def n_cells(self) -> int:
+        return len(self.counts)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.period, self.counts, self.score_sums] + list(self.codes.values())
+        return sum(array.nbytes for array in arrays)
+
+    def _filter_mask(self, filters: Optional[Dict[str, Sequence]]) -> Optional[np.ndarray]:
+        mask = None
+        for dimension, allowed in (filters or {}).items():
+            # Like DataProcessor.filter_data, an empty selection means no filter
+            if dimension not in self.codes or allowed is None or len(allowed) == 0:
+                continue
+            allowed = {str(value) for value in allowed}
+            allowed_codes = np.array([i for i, label in enumerate(self.labels[dimension]) if label in allowed],
+                                     dtype=self.codes[dimension].dtype)
+            dimension_mask = np.isin(self.codes[dimension], allowed_codes)
+            mask = dimension_mask if mask is None else mask & dimension_mask
+        return mask
+
+    def series(self, by: Optional[str] = None, filters: Optional[Dict[str, Sequence]] = None,
+               value: str = 'count') -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """(periods, group labels, values[period, group]) for one breakdown.
+
+        ``value`` is 'count' or 'avg_score'; ``by=None`` gives one total series.
+        """
+        mask = self._filter_mask(filters)
+        period = self.period if mask is None else self.period[mask]
+        counts = self.counts if mask is None else self.counts[mask]
+
+        if by is None:
+            labels, n_groups, key = ['All'], 1, period.astype(np.int64)
+        else:
+            labels = self.labels[by]
+            n_groups = len(labels)
+            group = self.codes[by] if mask is None else self.codes[by][mask]
+            if (group < 0).any():
+                # Cells with a missing value in the breakdown column
+                present = group >= 0
+                period, counts, group = period[present], counts[present], group[present]
+                if mask is None:
+                    mask = np.ones(self.n_cells, dtype=bool)
+                mask = mask.copy()
+                mask[mask] = present
+            key = period.astype(np.int64) * n_groups + group
+
+        size = self.n_periods * n_groups
+        totals = np.bincount(key, weights=counts, minlength=size).reshape(self.n_periods, n_groups)
+        if value == 'avg_score':
+            score_sums = self.score_sums if mask is None else self.score_sums[mask]
+            sums = np.bincount(key, weights=score_sums, minlength=size).reshape(self.n_periods, n_groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = np.where(totals > 0, sums / totals, np.nan)
+        elif value == 'count':
+            values = totals.astype(np.int64)
+        else:
+            raise ValueError(f"Unknown rollup value {value!r}; expected 'count' or 'avg_score'")
+        return self.periods, list(labels), values
+
+    def to_weekly(self) -> 'TimeRollup':
+        if self.freq != 'D':
+            raise ValueError("Only daily rollups can be coarsened to weekly")
+        day_numbers = (self.first_period.astype('datetime64[D]').astype(np.int64) + self.period.astype(np.int64))
+        week_numbers = (day_numbers + _WEEK_OFFSET_DAYS) // 7
+        first_week = int(week_numbers.min()) if len(week_numbers) else 0
+        first_period = np.datetime64(first_week * 7 - _WEEK_OFFSET_DAYS, 'D')
+        n_periods = int(week_numbers.max()) - first_week + 1 if len(week_numbers) else 0
+        return _aggregate_cells('W', first_period, n_periods, self.labels,
+                                (week_numbers - first_week).astype(np.int32), self.codes,
+                                self.counts, self.score_sums)
+
+
+def _dimension_codes(values: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), [str(c) for c in values.cat.categories]
+    codes, uniques = pd.factorize(values)
+    return codes, [str(u) for u in uniques]
+
+
+def _cell_keys(labels: Dict[str, List[str]], period: np.ndarray, codes: Dict[str, np.ndarray]) -> np.ndarray:
+    # Mixed-radix key over (period, dimension codes...); cells are stored in key order
+    key = period.astype(np.int64)
+    for dimension, dimension_codes in codes.items():
+        key = key * (len(labels[dimension]) + 1) + (dimension_codes.astype(np.int64) + 1)
+    return key
+
+
+def _aggregate_cells(freq: str, first_period: np.datetime64, n_periods: int, labels: Dict[str, List[str]],
+                     period: np.ndarray, codes: Dict[str, np.ndarray], weights: np.ndarray,
+                     score_sums: np.ndarray) -> TimeRollup:
+    cell_keys, inverse = np.unique(_cell_keys(labels, period, codes), return_inverse=True)
+    counts = np.bincount(inverse, weights=weights, minlength=len(cell_keys)).astype(np.int32)
+    sums = np.bincount(inverse, weights=score_sums, minlength=len(cell_keys)).astype(np.float32)
+    return _decode_cells(freq, first_period, n_periods, labels, list(codes), cell_keys, counts, sums)
+
+
+def _decode_cells(freq: str, first_period: np.datetime64, n_periods: int, labels: Dict[str, List[str]],
+                  dimensions: List[str], cell_keys: np.ndarray, counts: np.ndarray,
+                  sums: np.ndarray) -> TimeRollup:
+    # Decode the cell keys back into compact per-dimension code arrays
+    cell_codes = {}
+    remainder = cell_keys
+    for dimension in reversed(dimensions):
+        radix = len(labels[dimension]) + 1
+        cell_codes[dimension] = (remainder % radix - 1).astype(np.int16)
+        remainder = remainder // radix
+    cell_codes = {dimension: cell_codes[dimension] for dimension in dimensions}
+    return TimeRollup(freq, first_period, n_periods, labels, remainder.astype(np.int32), cell_codes, counts, sums)
+
+
+def build_rollups(df: pd.DataFrame, timestamp_column: str = 'Timestamp',
+                  dimensions: Sequence[str] = ROLLUP_DIMENSIONS,
+                  score_column: str = 'Opportunity_Score') -> Optional[Dict[str, TimeRollup]]:
+    """Daily and weekly rollups, or None when there are no usable timestamps"""
+    if timestamp_column not in df.columns:
+        return None
+    timestamps = df[timestamp_column]
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        return None
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        timestamps = timestamps.dt.tz_convert(None)
+
+    days = timestamps.to_numpy().astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    if not valid.any():
+        return None
+    day_numbers = days[valid].astype(np.int64)
+    first_day = int(day_numbers.min())
+
+    labels, codes = {}, {}
+    for dimension in dimensions:
+        if dimension in df.columns:
+            dimension_codes, labels[dimension] = _dimension_codes(df[dimension])
+            codes[dimension] = dimension_codes[valid]
+
+    if score_column in df.columns:
+        scores = pd.to_numeric(df[score_column], errors='coerce').to_numpy(dtype=np.float64)[valid]
+        scores = np.nan_to_num(scores, nan=0.0)
+    else:
+        scores = np.zeros(int(valid.sum()))
+
+    daily = _aggregate_cells('D', np.datetime64(first_day, 'D'), int(day_numbers.max()) - first_day + 1,
+                             labels, (day_numbers - first_day).astype(np.int32), codes,
+                             np.ones(len(day_numbers)), scores)
+    return {'D': daily, 'W': daily.to_weekly()}
+
+
+def _frame_codes(df: pd.DataFrame, labels: Dict[str, List[str]]) -> Optional[Dict[str, np.ndarray]]:
+    # Codes of ``df`` against existing labels; None if a value has no label
+    codes = {}
+    for dimension, dimension_labels in labels.items():
+        values = df[dimension]
+        dimension_codes = pd.Index(dimension_labels).get_indexer(values.astype(str))
+        missing = values.isna().to_numpy()
+        if ((dimension_codes < 0) & ~missing).any():
+            return None
+        dimension_codes[missing] = -1
+        codes[dimension] = dimension_codes
+    return codes
+
+
+def _apply_delta(rollup: TimeRollup, period: np.ndarray, codes: Dict[str, np.ndarray],
+                 weights: np.ndarray, score_sums: np.ndarray) -> TimeRollup:
+    # Add signed per-row entries to a rollup: binary search for the cells
+    # that exist, one small unique pass for the ones that do not
+    keys = _cell_keys(rollup.labels, rollup.period, rollup.codes)
+    delta_keys = _cell_keys(rollup.labels, period, codes)
+    positions = np.searchsorted(keys, delta_keys)
+    found = positions < len(keys)
+    found[found] = keys[positions[found]] == delta_keys[found]
+
+    counts = rollup.counts.astype(np.int64)
+    sums = rollup.score_sums.astype(np.float64)
+    np.add.at(counts, positions[found], weights[found].astype(np.int64))
+    np.add.at(sums, positions[found], score_sums[found])
+    if not found.all():
+        new_keys, inverse = np.unique(delta_keys[~found], return_inverse=True)
+        keys = np.concatenate([keys, new_keys])
+        counts = np.concatenate([counts, np.bincount(inverse, weights=weights[~found]).astype(np.int64)])
+        sums = np.concatenate([sums, np.bincount(inverse, weights=score_sums[~found])])
+        order = np.argsort(keys, kind='stable')
+        keys, counts, sums = keys[order], counts[order], sums[order]
+
+    # Drop cells whose rows all moved elsewhere
+    kept = counts != 0
+    return _decode_cells(rollup.freq, rollup.first_period, rollup.n_periods, rollup.labels, list(rollup.codes),
+                         keys[kept], counts[kept].astype(np.int32), sums[kept].astype(np.float32))
+
+
+def update_rollups(rollups: Dict[str, TimeRollup], before: pd.DataFrame, after: pd.DataFrame,
+                   timestamp_column: str = 'Timestamp',
+                   score_column: str = 'Opportunity_Score') -> Optional[Dict[str, TimeRollup]]:
+    """Rollups with the rows in ``before`` replaced by their new values in ``after``.
+
+    Only the changed rows are read: their old cells are decremented and
+    the new ones incremented in both cubes, so the cost grows with the
+    number of changed rows rather than with the frame. Returns None when a
+    changed row falls outside the existing periods or labels; rebuild with
+    build_rollups then.
+    """
+    daily, weekly = rollups['D'], rollups['W']
+    first_day = daily.first_period.astype('datetime64[D]').astype(np.int64)
+    first_week = (weekly.first_period.astype('datetime64[D]').astype(np.int64) + _WEEK_OFFSET_DAYS) // 7
+    # One negative entry per old row and one positive entry per new row
+    day_parts, weights, score_sums = [], [], []
+    codes = {dimension: [] for dimension in daily.codes}
+
+    for frame, sign in ((before, -1.0), (after, 1.0)):
+        timestamps = frame[timestamp_column]
+        if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+            timestamps = timestamps.dt.tz_convert(None)
+        days = timestamps.to_numpy().astype('datetime64[D]')
+        valid = ~np.isnat(days)
+        day_numbers = days[valid].astype(np.int64) - first_day
+        if len(day_numbers) and (day_numbers.min() < 0 or day_numbers.max() >= daily.n_periods):
+            return None
+        frame_codes = _frame_codes(frame.loc[valid, list(daily.labels)], daily.labels)
+        if frame_codes is None:
+            return None
+        day_parts.append(day_numbers)
+        weights.append(np.full(len(day_numbers), sign))
+        if score_column in frame.columns:
+            scores = pd.to_numeric(frame[score_column], errors='coerce').to_numpy(dtype=np.float64)[valid]
+            score_sums.append(sign * np.nan_to_num(scores, nan=0.0))
+        else:
+            score_sums.append(np.zeros(len(day_numbers)))
+        for dimension in codes:
+            codes[dimension].append(frame_codes[dimension])
+
+    day_numbers = np.concatenate(day_parts)
+    week_numbers = (day_numbers + first_day + _WEEK_OFFSET_DAYS) // 7 - first_week
+    codes = {dimension: np.concatenate(parts) for dimension, parts in codes.items()}
+    weights, score_sums = np.concatenate(weights), np.concatenate(score_sums)
+    return {'D': _apply_delta(daily, day_numbers, codes, weights, score_sums),
+            'W': _apply_delta(weekly, week_numbers, codes, weights, score_sums)}
@@ -0,0 +1,257 @@
+"""Configurable, vectorized opportunity scoring.
+
+The Opportunity_Score is a sum of factor contributions. Each factor turns a
+column into a weight-independent feature once (``ScoringEngine.prepare``):
+categorical columns become integer codes plus their distinct values,
+numeric ones become float arrays. Scoring then compiles the configured
+weights into small lookup tables and combines the features with NumPy
+takes and multiply-adds, so re-scoring after a weight change never touches
+the original strings or re-runs AI.
+
+Configuration is a JSON object mapping factor names to specs::
+
+    {
+      "severity":   {"type": "categorical", "column": "Severity",
+                     "weights": {"Critical": 5, "High": 4, "Medium": 3, "Low": 2},
+                     "output": "Severity_Score"},
+      "category":   {"type": "categorical", "column": "AI_Category",
+                     "weights": {"Ensure Regulatory & Data Compliance": 1.5}},
+      "recency":    {"type": "recency", "column": "Timestamp", "weight": 2, "half_life_days": 30},
+      "arr":        {"type": "log", "column": "ARR", "weight": 0.5},
+      "urgency":    {"type": "linear", "column": "Urgency", "weight": 2},
+      "duplicates": {"type": "cluster_size", "column": "Feedback", "weight": 1}
+    }
+
+Factors whose column is missing from the frame contribute nothing.
+"""
+import copy
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+SCORING_CONFIG_ENV = 'FEEDBACK_SCORING_CONFIG'
+
+# float32 halves memory traffic and is ample precision for a ranking score
+SCORE_DTYPE = np.float32
+
+DEFAULT_SCORING_CONFIG = {
+    'severity': {
+        'type': 'categorical', 'column': 'Severity', 'output': 'Severity_Score',
+        'weights': {'Critical': 5, 'High': 4, 'Medium': 3, 'Low': 2},
+    },
+    'region': {
+        'type': 'categorical', 'column': 'Region', 'output': 'Region_Score',
+        'weights': {'US': 3, 'EU': 2, 'APAC': 1, 'LATAM': 1},
+    },
+    'category': {'type': 'categorical', 'column': 'AI_Category', 'weights': {}},
+    'recency': {'type': 'recency', 'column': 'Timestamp', 'weight': 0, 'half_life_days': 30},
+    'arr': {'type': 'log', 'column': 'ARR', 'weight': 0},
+    # Columns from sentiment.SentimentScorer; a negative sentiment weight
+    # ranks unhappy feedback higher
+    'sentiment': {'type': 'linear', 'column': 'Sentiment', 'weight': 0},
+    'urgency': {'type': 'linear', 'column': 'Urgency', 'weight': 0},
+    'duplicates': {'type': 'cluster_size', 'column': 'Feedback', 'weight': 0},
+}
+
+
+class Factor:
+    """One additive term of the score"""
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.column = spec['column']
+        self.output = spec.get('output')
+        self.weight = float(spec.get('weight', 0))
+
+    @property
+    def active(self) -> bool:
+        return self.weight != 0
+
+    @property
+    def integral(self) -> bool:
+        """Whether contributions are always whole numbers"""
+        return not self.active
+
+    def prepare(self, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def contribution(self, feature) -> np.ndarray:
+        return feature * SCORE_DTYPE(self.weight)
+
+
+class CategoricalFactor(Factor):
+    def __init__(self, name: str, spec: dict):
+        super().__init__(name, spec)
+        self.weights = {str(k): float(v) for k, v in spec.get('weights', {}).items()}
+        self.default = float(spec.get('default', 0))
+
+    @property
+    def active(self) -> bool:
+        return bool(self.weights) or self.default != 0 or self.output is not None
+
+    @property
+    def integral(self) -> bool:
+        return all(float(w).is_integer() for w in list(self.weights.values()) + [self.default])
+
+    def prepare(self, df: pd.DataFrame):
+        values = df[self.column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy(), values.cat.categories
+        codes, uniques = pd.factorize(values)
+        return codes, uniques
+
+    def contribution(self, feature) -> np.ndarray:
+        codes, uniques = feature
+        # Trailing entry is for missing values (code -1)
+        table = np.array([self.weights.get(str(value), self.default) for value in uniques] + [self.default],
+                         dtype=SCORE_DTYPE)
+        return table[codes]
+
+
+class RecencyFactor(Factor):
+    """``weight`` for feedback received now, halving every ``half_life_days``"""
+
+    def __init__(self, name: str, spec: dict):
+        super().__init__(name, spec)
+        self.half_life_days = float(spec.get('half_life_days', 30))
+        self.reference = spec.get('reference')
+
+    def prepare(self, df: pd.DataFrame) -> np.ndarray:
+        timestamps = pd.to_datetime(df[self.column], errors='coerce', utc=True)
+        reference = pd.Timestamp(self.reference, tz='UTC') if self.reference else pd.Timestamp.now(tz='UTC')
+        age_days = (reference - timestamps).dt.total_seconds().to_numpy(dtype=np.float64) / 86400.0
+        return np.clip(np.nan_to_num(age_days, nan=np.inf), 0.0, None).astype(SCORE_DTYPE)
+
+    def contribution(self, feature: np.ndarray) -> np.ndarray:
+        decay = np.multiply(feature, SCORE_DTYPE(-1.0 / self.half_life_days))
+        np.exp2(decay, out=decay)
+        decay *= SCORE_DTYPE(self.weight)
+        return decay
+
+
+class LogFactor(Factor):
+    """``weight * log10(1 + value)``, e.g. for customer ARR"""
+
+    def prepare(self, df: pd.DataFrame) -> np.ndarray:
+        values = pd.to_numeric(df[self.column], errors='coerce').to_numpy(dtype=np.float64)
+        return np.log10(1.0 + np.clip(np.nan_to_num(values, nan=0.0), 0.0, None)).astype(SCORE_DTYPE)
+
+
+class LinearFactor(Factor):
+    """``weight * value`` for numeric columns such as Sentiment and Urgency; missing values add 0"""
+
+    def prepare(self, df: pd.DataFrame) -> np.ndarray:
+        values = pd.to_numeric(df[self.column], errors='coerce').to_numpy(dtype=SCORE_DTYPE)
+        return np.nan_to_num(values, nan=0.0)
+
+
+class ClusterSizeFactor(Factor):
+    """``weight * log2(rows sharing this row's text)``; unique rows add 0"""
+
+    def prepare(self, df: pd.DataFrame) -> np.ndarray:
+        codes, _ = pd.factorize(df[self.column])
+        sizes = np.bincount(codes[codes >= 0])
+        feature = np.zeros(len(codes), dtype=SCORE_DTYPE)
+        feature[codes >= 0] = np.log2(sizes[codes[codes >= 0]])
+        return feature
+
+
+FACTOR_TYPES = {
+    'categorical': CategoricalFactor,
+    'recency': RecencyFactor,
+    'log': LogFactor,
+    'linear': LinearFactor,
+    'cluster_size': ClusterSizeFactor,
+}
+
+
+class ScoringInputs:
+    """Weight-independent features of one frame, reusable across re-scores.
+
+    Features are built on first use, so a factor switched on by a later
+    weight change is prepared once and then cached like the others.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.n_rows = len(df)
+        self.features: Dict[str, object] = {}
+
+    def feature(self, factor: Factor):
+        key = f"{type(factor).__name__}:{factor.column}"
+        if key not in self.features:
+            if factor.column not in self.df.columns:
+                return None
+            self.features[key] = factor.prepare(self.df)
+        return self.features[key]
+
+
+class ScoringEngine:
+    def __init__(self, config: Optional[dict] = None):
+        self.config = copy.deepcopy(config if config is not None else DEFAULT_SCORING_CONFIG)
+        self.factors = []
+        for name, spec in self.config.items():
+            factor_type = spec.get('type', 'categorical')
+            if factor_type not in FACTOR_TYPES:
+                raise ValueError(f"Unknown scoring factor type {factor_type!r} for {name!r}; "
+                                 f"expected one of {sorted(FACTOR_TYPES)}")
+            self.factors.append(FACTOR_TYPES[factor_type](name, spec))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ScoringEngine':
+        """Load a config; factors it leaves out keep their defaults"""
+        with open(path, encoding='utf-8') as f:
+            overrides = json.load(f)
+        config = copy.deepcopy(DEFAULT_SCORING_CONFIG)
+        for name, spec in overrides.items():
+            config[name] = {**config.get(name, {}), **spec}
+        return cls(config)
+
+    @classmethod
+    def from_env(cls) -> 'ScoringEngine':
+        path = os.getenv(SCORING_CONFIG_ENV)
+        return cls.from_file(path) if path else cls()
+
+    def with_weights(self, **factor_updates: dict) -> 'ScoringEngine':
+        """Copy of this engine with some factor specs updated"""
+        config = copy.deepcopy(self.config)
+        for name, spec in factor_updates.items():
+            config[name] = {**config.get(name, {}), **spec}
+        return ScoringEngine(config)
+
+    def uses_column(self, column: str) -> bool:
+        return any(factor.active and factor.column == column for factor in self.factors)
+
+    def prepare(self, df: pd.DataFrame) -> ScoringInputs:
+        inputs = ScoringInputs(df)
+        for factor in self.factors:
+            if factor.active:
+                inputs.feature(factor)
+        return inputs
+
+    def score(self, inputs: ScoringInputs) -> Dict[str, np.ndarray]:
+        """Per-factor outputs plus the total under 'Opportunity_Score'"""
+        total = np.zeros(inputs.n_rows, dtype=SCORE_DTYPE)
+        integral = True
+        columns = {}
+        for factor in self.factors:
+            if not factor.active:
+                continue
+            feature = inputs.feature(factor)
+            if feature is None:
+                continue
+            contribution = factor.contribution(feature)
+            total += contribution
+            integral = integral and factor.integral
+            if factor.output:
+                columns[factor.output] = contribution.astype(np.int64) if factor.integral else contribution
+        columns['Opportunity_Score'] = total.astype(np.int64) if integral else np.round(total, 2)
+        return columns
+
+    def apply(self, df: pd.DataFrame, inputs: Optional[ScoringInputs] = None) -> pd.DataFrame:
+        if inputs is None or inputs.n_rows != len(df):
+            inputs = self.prepare(df)
+        return df.assign(**self.score(inputs))
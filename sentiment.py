@@ -0,0 +1,101 @@
+"""Lexicon sentiment and urgency scores for feedback text.
+
+``SentimentScorer`` adds two float32 columns that the scoring engine can
+weight like any other numeric factor (``{"type": "linear"}``):
+
+- ``Sentiment`` in (-1, 1): (positive - negative) / (positive + negative + 1)
+  over weighted lexicon hits, so one strong negative term gives -0.67.
+- ``Urgency`` in [0, 1): hits / (hits + 1), same scale.
+
+Terms match case-insensitively at the start of a word, so 'crash' also
+covers 'crashes' and 'crashed'. Scoring runs once per distinct text, with
+one regex count per lexicon and weight over the whole column; on the
+pyarrow string dtype (pandas' default when pyarrow is installed) each
+count is a single native pass. Rows without any lexicon hit score 0 on
+both; ``AIAnalyzer.refine_sentiment`` can ask the model about those.
+"""
+import re
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+SENTIMENT_COLUMN = 'Sentiment'
+URGENCY_COLUMN = 'Urgency'
+
+SIGNAL_DTYPE = np.float32
+
+# Term -> weight; negative weights are negative sentiment
+SENTIMENT_LEXICON = {
+    'crash': -2, 'broken': -2, 'breaks': -2, 'fails': -2, 'failing': -2, 'failure': -2, 'unacceptable': -2,
+    'frustrat': -2, 'terrible': -2, 'useless': -2, 'violation': -2, 'blocking': -2, 'blocked': -2,
+    'slow': -1, 'times out': -1, 'timeout': -1, 'timing out': -1, 'missing': -1, 'lacks': -1, 'lacking': -1,
+    'confusing': -1, 'inconsistent': -1, 'error': -1, 'bug': -1, 'degrade': -1, 'flagged': -1,
+    'not meet': -1, 'not support': -1, 'does not work': -1, "doesn't work": -1, 'unable': -1,
+    'cannot': -1, "can't": -1, 'difficult': -1, 'alternatives': -1, 'complain': -1, 'annoying': -1,
+    'love': 2, 'excellent': 2, 'great': 1, 'thanks': 1, 'thank you': 1, 'helpful': 1, 'works well': 1,
+    'easy': 1, 'improved': 1, 'happy': 1, 'appreciate': 1, 'smooth': 1, 'fast': 1,
+}
+
+URGENCY_LEXICON = {
+    'urgent': 2, 'asap': 2, 'immediately': 2, 'critical': 2, 'outage': 2, 'production down': 2,
+    'blocking': 2, 'blocker': 2, 'data loss': 2, 'security breach': 2, 'violation': 2, 'deadline': 2,
+    'as soon as possible': 2, 'right away': 2,
+    'crash': 1, 'broken': 1, 'fails': 1, 'auditor': 1, 'renewal': 1, 'alternatives': 1,
+    'prioriti': 1, 'several times': 1, 'daily operations': 1, 'quarterly': 1, 'growing': 1,
+    'delays': 1, 'escalat': 1, 'soon': 1,
+}
+
+
+def _weighted_patterns(lexicon: Dict[str, int]) -> Dict[int, str]:
+    # weight -> one alternation of its terms, longest first
+    by_weight: Dict[int, list] = {}
+    for term, weight in lexicon.items():
+        by_weight.setdefault(weight, []).append(term.lower())
+    return {weight: r'(?i)\b(?:' + '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + ')'
+            for weight, terms in by_weight.items()}
+
+
+class SentimentScorer:
+    def __init__(self, sentiment_lexicon: Optional[Dict[str, int]] = None,
+                 urgency_lexicon: Optional[Dict[str, int]] = None):
+        self._sentiment = _weighted_patterns(sentiment_lexicon if sentiment_lexicon is not None
+                                             else SENTIMENT_LEXICON)
+        self._urgency = _weighted_patterns(urgency_lexicon if urgency_lexicon is not None else URGENCY_LEXICON)
+
+    def score(self, texts: pd.Series) -> Dict[str, np.ndarray]:
+        """Sentiment and Urgency arrays aligned with ``texts``; missing text scores 0"""
+        codes, uniques = pd.factorize(texts)
+        values = pd.Series(uniques, dtype='str')
+        positive = np.zeros(len(values), dtype=SIGNAL_DTYPE)
+        negative = np.zeros(len(values), dtype=SIGNAL_DTYPE)
+        for weight, pattern in self._sentiment.items():
+            hits = values.str.count(pattern).to_numpy(dtype=SIGNAL_DTYPE) * SIGNAL_DTYPE(abs(weight))
+            if weight > 0:
+                positive += hits
+            else:
+                negative += hits
+        urgent = np.zeros(len(values), dtype=SIGNAL_DTYPE)
+        for weight, pattern in self._urgency.items():
+            urgent += values.str.count(pattern).to_numpy(dtype=SIGNAL_DTYPE) * SIGNAL_DTYPE(weight)
+
+        # Trailing entry is for missing text (code -1)
+        sentiment = np.append((positive - negative) / (positive + negative + 1), SIGNAL_DTYPE(0))
+        urgency = np.append(urgent / (urgent + 1), SIGNAL_DTYPE(0))
+        return {SENTIMENT_COLUMN: sentiment[codes], URGENCY_COLUMN: urgency[codes]}
+
+    def apply(self, df: pd.DataFrame, column: str = 'Feedback') -> pd.DataFrame:
+        return df.assign(**self.score(df[column]))
+
+
+def unscored_rows(df: pd.DataFrame) -> np.ndarray:
+    """Mask of rows the lexicon found neither sentiment nor urgency in"""
+    if SENTIMENT_COLUMN not in df.columns or URGENCY_COLUMN not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return ((df[SENTIMENT_COLUMN].to_numpy() == 0) & (df[URGENCY_COLUMN].to_numpy() == 0)
+            & df['Feedback'].notna().to_numpy())
+
+
+def from_ratings(sentiment_rating: int, urgency_rating: int):
+    """Map 1-5 ratings onto the Sentiment (-1..1) and Urgency (0..1) scales"""
+    return SIGNAL_DTYPE((sentiment_rating - 3) / 2), SIGNAL_DTYPE((urgency_rating - 1) / 4)
@@ -1,4 +1,5 @@
-import streamlit as st
+import hashlib
+import re
 
 # Robinhood-Inspired Color Palette
 class RobinhoodColors:
@@ -23,11 +24,30 @@ class RobinhoodColors:
     NEUTRAL_BLUE = "#1E40AF"
     CHART_PURPLE = "#8B5CF6"
 
-def inject_robinhood_css():
-    """Inject custom CSS to achieve Robinhood-inspired styling"""
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+# Spaces around these never matter; around ':' they can (".a :hover"), so
+# only the space after it goes
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = _CSS_COMMENT.sub('', css)
+    css = _WHITESPACE.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    css = css.replace(': ', ':').replace(';}', '}')
+    return css.strip()
+
+def minify_html(html):
+    """Collapse whitespace runs in an HTML fragment to single spaces, on one line"""
+    return _WHITESPACE.sub(' ', html).replace('> <', '><').strip()
+
+# Built once at import. Streamlit re-sends every element on every rerun, but
+# it replaces byte-identical messages the browser already holds with a hash
+# reference (see global.minCachedMessageSize in .streamlit/config.toml), so
+# a stable tag is effectively sent once per session.
+THEME_CSS = minify_css(f"""
     
-    css = f"""
-    <style>
     /* Import Inter font for modern typography */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
     
@@ -500,10 +520,14 @@ def inject_robinhood_css():
     .compact-spacing {{
         margin: 1rem 0;
     }}
-    </style>
-    """
-    
-    st.markdown(css, unsafe_allow_html=True)
+    """)
+THEME_CSS_VERSION = hashlib.sha256(THEME_CSS.encode('utf-8')).hexdigest()[:12]
+THEME_STYLE_TAG = f'<style data-theme-version="{THEME_CSS_VERSION}">{THEME_CSS}</style>'
+
+def inject_robinhood_css():
+    """Inject custom CSS to achieve Robinhood-inspired styling"""
+    import streamlit as st
+    st.markdown(THEME_STYLE_TAG, unsafe_allow_html=True)
 
 def get_severity_color(severity):
     """Get color for severity level"""
@@ -0,0 +1,315 @@
+"""Seedable synthetic feedback generator for production-scale testing.
+
+Everything is drawn with NumPy in whole-column operations, so generating a
+million rows takes seconds. Large datasets are produced in chunks and
+streamed to CSV or Parquet without holding the full frame in memory.
+
+    python synthetic_data.py 1000000 -o feedback_1m.parquet --seed 7
+"""
+import argparse
+import os
+import re
+import sys
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+PRODUCTS = [
+    'Core Platform', 'Analytics Dashboard', 'Mobile App', 'API Platform', 'Enterprise Dashboard',
+    'Access Control', 'Data Export', 'Security Module', 'User Interface', 'Collaboration Tools',
+    'Billing', 'Integrations', 'Reporting', 'Notifications', 'Admin Console',
+]
+# Roughly Zipf-shaped: a few products attract most of the feedback
+PRODUCT_WEIGHTS = 1.0 / np.arange(1, len(PRODUCTS) + 1) ** 0.9
+
+SEVERITIES = ['Critical', 'High', 'Medium', 'Low']
+SEVERITY_WEIGHTS = [0.10, 0.25, 0.40, 0.25]
+
+# Timestamps end here unless ``end`` is given; fixed, so a seed gives the
+# same dataset on any day
+DEFAULT_END = '2025-01-01'
+
+REGIONS = ['US', 'EU', 'APAC', 'LATAM']
+REGION_WEIGHTS = [0.45, 0.30, 0.15, 0.10]
+
+CATEGORIES = [
+    'Win Enterprise Deals',
+    'Ensure Regulatory & Data Compliance',
+    'Improve Platform Usability & Performance',
+]
+
+# Raw spellings seen in real exports. The first group still normalizes to a
+# valid value after strip/title-casing; the second group doesn't.
+SEVERITY_VARIANTS = [' high', 'CRITICAL', 'low ', 'medium', 'High ']
+SEVERITY_INVALID = ['crit', 'Sev1', 'urgent', 'P2', 'n/a']
+REGION_VARIANTS = ['us', ' eu', 'Apac', 'latam ', 'Us']
+REGION_INVALID = ['Europe', 'NA', 'North America', 'Brazil', 'APJ']
+
+SUBJECTS = [
+    'The dashboard', 'Our admin team', 'The mobile app', 'SSO login', 'The export job', 'Search',
+    'The API', 'Role-based access', 'Audit logging', 'The billing page', 'Report scheduling',
+    'The onboarding flow', 'Data encryption', 'Bulk import', 'Notifications',
+]
+PROBLEMS = [
+    'is extremely slow to load', 'crashes when processing large datasets',
+    'is missing controls we need for SOX compliance', 'fails for users in our EU tenant',
+    'does not support Okta or Active Directory', 'breaks GDPR data export requests',
+    'times out with more than 1000 concurrent users', 'requires extensive training for new staff',
+    'lacks multi-tenancy for our subsidiaries', 'returns inconsistent results',
+    'does not meet our security review requirements', 'needs white-label customization',
+]
+TEAMS = [
+    'finance', 'sales', 'support', 'engineering', 'legal', 'marketing', 'operations', 'HR',
+    'procurement', 'security', 'data science', 'customer success', 'compliance', 'IT', 'product',
+]
+IMPACTS = [
+    'which is blocking our enterprise rollout.', 'and it affects our daily operations.',
+    'so our auditors flagged it.', 'and we are evaluating alternatives.',
+    'which delays our quarterly reporting.', 'and our support tickets keep growing.',
+    'which makes renewal difficult to justify.', 'and needs attention.',
+]
+FILLERS = [
+    'We have raised this several times already.', 'This used to work last quarter.',
+    'Several teams across the company are affected.', 'Please prioritise a fix.',
+    'Our account manager is aware of the issue.', 'A workaround would help in the meantime.',
+]
+# Long pasted content: email signatures, quoted replies and stack traces
+LONG_TAILS = [
+    '\n\nThanks,\nJordan Smith\nDirector of IT Operations\nAcme Corp | +1 555 0100\n'
+    'This email and any attachments are confidential and intended solely for the addressee.',
+    '\n\n> On Mon, Support wrote:\n> Thanks for reaching out. Could you share more details?\n'
+    '> We are looking into it and will get back to you shortly.\n> Best regards, Support Team',
+    '\n\nTraceback (most recent call last):\n  File "app/export.py", line 214, in run_export\n'
+    '    rows = fetch_rows(query)\n  File "app/db.py", line 88, in fetch_rows\n'
+    '    raise TimeoutError("query exceeded 30s")\nTimeoutError: query exceeded 30s',
+]
+
+# Feedback in the customer's language, for APAC and LATAM rows; the seat
+# count is appended with the local word for users
+NON_ENGLISH_FEEDBACK = {
+    'LATAM': {
+        'es': ['El panel tarda demasiado en cargar y afecta a nuestras operaciones diarias',
+               'La exportación de datos para GDPR no funciona y nuestros auditores lo señalaron',
+               'Necesitamos integración con Okta para el equipo de ventas lo antes posible'],
+        'pt': ['O aplicativo trava quando processamos grandes volumes de dados',
+               'Precisamos de controles de acesso por função para nossas subsidiárias',
+               'A página de faturamento está muito lenta para o nosso time'],
+    },
+    'APAC': {
+        'ja': ['ダッシュボードの読み込みが非常に遅く、業務に支障が出ています',
+               '監査ログの機能が不足しており、コンプライアンス要件を満たせません'],
+        'zh': ['仪表板加载非常慢，影响了我们的日常运营', '我们需要支持单点登录和基于角色的访问控制'],
+        'ko': ['대시보드 로딩이 너무 느려서 업무에 지장이 있습니다',
+               '대용량 데이터를 처리할 때 모바일 앱이 자주 종료됩니다'],
+        'id': ['Dasbor sangat lambat saat memuat laporan untuk tim keuangan kami',
+               'Ekspor data gagal dan auditor kami sudah menandainya'],
+        'vi': ['Bảng điều khiển tải rất chậm và ảnh hưởng đến công việc hằng ngày',
+               'Chúng tôi cần tích hợp đăng nhập một lần với Okta'],
+    },
+}
+USERS_WORD = {'es': 'usuarios', 'pt': 'usuários', 'ja': 'ユーザー', 'zh': '用户', 'ko': '사용자',
+              'id': 'pengguna', 'vi': 'người dùng'}
+# Contact details customers paste into feedback; {id} is a random number
+CONTACT_DETAILS = [
+    ' You can reach me at jordan.lee{id}@example.com.', ' Please call me back on +1 415 555 {id:04d}.',
+    ' Our account is ACCT-{id:08d}.', ' The affected host is 10.20.{id:03d}.7.',
+]
+
+
+def generate_feedback(n_rows: int, seed: int = 0, duplicate_rate: float = 0.05,
+                      invalid_rate: float = 0.01, variant_rate: float = 0.05,
+                      missing_rate: float = 0.002, long_text_rate: float = 0.03,
+                      non_english_rate: float = 0.0, pii_rate: float = 0.0, days: int = 365,
+                      end: Optional[str] = None, rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+    """Generate ``n_rows`` of raw feedback in the CSV upload schema.
+
+    ``duplicate_rate`` rows repeat an earlier row's Feedback text,
+    ``variant_rate`` rows use messy but normalizable Severity/Region
+    spellings, ``invalid_rate`` rows use values validation has to default,
+    and ``missing_rate`` rows blank out a required column.
+    ``non_english_rate`` of the APAC and LATAM rows are written in one of
+    the region's languages (NON_ENGLISH_FEEDBACK), and ``pii_rate`` rows
+    end with an email, phone number, account ID or IP address
+    (CONTACT_DETAILS). Timestamps span
+    the ``days`` days before ``end`` (default: DEFAULT_END); ``days=0``
+    leaves the Timestamp column out.
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+
+    product_p = PRODUCT_WEIGHTS / PRODUCT_WEIGHTS.sum()
+    product_idx = rng.choice(len(PRODUCTS), size=n_rows, p=product_p)
+    severity = np.array(SEVERITIES, dtype=object)[rng.choice(len(SEVERITIES), size=n_rows, p=SEVERITY_WEIGHTS)]
+    region = np.array(REGIONS, dtype=object)[rng.choice(len(REGIONS), size=n_rows, p=REGION_WEIGHTS)]
+    # Human labels loosely follow the product so the Category column isn't pure noise
+    category_idx = (product_idx + (rng.random(n_rows) < 0.3) * rng.integers(1, 3, n_rows)) % len(CATEGORIES)
+
+    feedback = _generate_text(n_rows, rng, long_text_rate)
+    if non_english_rate > 0:
+        _localize(feedback, region, rng, non_english_rate)
+    if pii_rate > 0:
+        _add_contact_details(feedback, rng, pii_rate)
+
+    if duplicate_rate > 0 and n_rows > 1:
+        is_dup = rng.random(n_rows) < duplicate_rate
+        is_dup[0] = False
+        dup_rows = np.flatnonzero(is_dup)
+        # Copy from any earlier row so duplicates look like repeat reports
+        sources = (rng.random(len(dup_rows)) * dup_rows).astype(np.int64)
+        feedback[dup_rows] = feedback[sources]
+
+    _mix_in(severity, rng, variant_rate, SEVERITY_VARIANTS)
+    _mix_in(severity, rng, invalid_rate, SEVERITY_INVALID)
+    _mix_in(region, rng, variant_rate, REGION_VARIANTS)
+    _mix_in(region, rng, invalid_rate, REGION_INVALID)
+
+    df = pd.DataFrame({
+        'Feedback': feedback,
+        'Product': pd.Categorical.from_codes(product_idx, PRODUCTS).astype(object),
+        'Severity': severity,
+        'Region': region,
+        'Category': np.array(CATEGORIES, dtype=object)[category_idx],
+    })
+    if days > 0:
+        df['Timestamp'] = _generate_timestamps(n_rows, rng, days, end)
+
+    if missing_rate > 0:
+        for column in ['Feedback', 'Product', 'Severity', 'Region']:
+            df.loc[rng.random(n_rows) < missing_rate / 4, column] = np.nan
+
+    return df
+
+
+def _generate_text(n_rows: int, rng: np.random.Generator, long_text_rate: float) -> np.ndarray:
+    def pick(options):
+        return np.array(options, dtype=object)[rng.integers(0, len(options), n_rows)]
+
+    # Team and seat count keep organic collisions well below duplicate_rate
+    seats = rng.integers(2, 20000, n_rows).astype(str).astype(object)
+    text = (pick(SUBJECTS) + ' ' + pick(PROBLEMS) + ' for our ' + pick(TEAMS)
+            + ' team (' + seats + ' users) ' + pick(IMPACTS))
+
+    # 0-3 filler sentences gives a long-tailed length distribution
+    n_fillers = np.minimum(rng.geometric(0.55, n_rows) - 1, 3)
+    for k in range(1, 4):
+        has_filler = n_fillers >= k
+        text[has_filler] = text[has_filler] + ' ' + pick(FILLERS)[has_filler]
+
+    if long_text_rate > 0:
+        is_long = rng.random(n_rows) < long_text_rate
+        text[is_long] = text[is_long] + pick(LONG_TAILS)[is_long]
+
+    return text
+
+
+def _localize(feedback: np.ndarray, region: np.ndarray, rng: np.random.Generator, rate: float):
+    for region_name, by_language in NON_ENGLISH_FEEDBACK.items():
+        rows = np.flatnonzero((region == region_name) & (rng.random(len(region)) < rate))
+        texts = np.array([text for texts in by_language.values() for text in texts], dtype=object)
+        users = np.array([USERS_WORD[language] for language, texts in by_language.items() for _ in texts],
+                         dtype=object)
+        picks = rng.integers(0, len(texts), len(rows))
+        seats = rng.integers(2, 20000, len(rows)).astype(str).astype(object)
+        feedback[rows] = texts[picks] + ' (' + seats + ' ' + users[picks] + ')'
+
+
+def _add_contact_details(feedback: np.ndarray, rng: np.random.Generator, rate: float):
+    rows = np.flatnonzero(rng.random(len(feedback)) < rate)
+    picks = rng.integers(0, len(CONTACT_DETAILS), len(rows))
+    ids = rng.integers(0, 256, len(rows))
+    # One whole-column fill per template: text before {id}, the id
+    # zero-padded to the template's width, text after
+    for pick, template in enumerate(CONTACT_DETAILS):
+        prefix, width, suffix = re.fullmatch(r'(.*)\{id(?::0(\d+)d)?\}(.*)', template).groups()
+        chosen = picks == pick
+        contact_ids = np.char.zfill(ids[chosen].astype(str), int(width or 0)).astype(object)
+        feedback[rows[chosen]] = feedback[rows[chosen]] + prefix + contact_ids + suffix
+
+
+def _generate_timestamps(n_rows: int, rng: np.random.Generator, days: int, end: Optional[str]) -> np.ndarray:
+    end = np.datetime64(end or DEFAULT_END, 's')
+    # Volume grows ~2x over the window; weekends get a third of weekday traffic
+    day_offset = np.floor(days * np.sqrt(rng.random(n_rows))).astype(np.int64)
+    day = end - np.timedelta64(days, 'D') + day_offset.astype('timedelta64[D]')
+    weekend = ((day.astype('datetime64[D]').astype(np.int64) + 3) % 7) >= 5
+    resample = weekend & (rng.random(n_rows) < 2 / 3)
+    day[resample] -= np.timedelta64(2, 'D')
+    return day + rng.integers(0, 86400, n_rows).astype('timedelta64[s]')
+
+
+def _mix_in(values: np.ndarray, rng: np.random.Generator, rate: float, replacements):
+    if rate <= 0:
+        return
+    mask = rng.random(len(values)) < rate
+    values[mask] = np.array(replacements, dtype=object)[rng.integers(0, len(replacements), mask.sum())]
+
+
+def iter_feedback_chunks(n_rows: int, chunk_size: int = 1_000_000, seed: int = 0,
+                         **kwargs) -> Iterator[pd.DataFrame]:
+    """Yield the dataset in chunks; output depends only on (seed, chunk_size) and ``kwargs``"""
+    n_chunks = max(1, -(-n_rows // chunk_size))
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        rows = min(chunk_size, n_rows - i * chunk_size)
+        if rows <= 0:
+            break
+        yield generate_feedback(rows, rng=np.random.default_rng(child), **kwargs)
+
+
+def write_feedback(path: str, n_rows: int, fmt: Optional[str] = None, chunk_size: int = 1_000_000,
+                   seed: int = 0, **kwargs) -> int:
+    """Stream a synthetic dataset to CSV or Parquet; returns rows written"""
+    fmt = fmt or ('parquet' if path.endswith('.parquet') else 'csv')
+    written = 0
+
+    if fmt == 'csv':
+        for i, chunk in enumerate(iter_feedback_chunks(n_rows, chunk_size, seed, **kwargs)):
+            chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            written += len(chunk)
+    elif fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([(column, pa.string()) for column in
+                            ['Feedback', 'Product', 'Severity', 'Region', 'Category']]
+                           + ([('Timestamp', pa.timestamp('s'))] if kwargs.get('days', 365) > 0 else []))
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in iter_feedback_chunks(n_rows, chunk_size, seed, **kwargs):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                written += len(chunk)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic customer feedback dataset.")
+    parser.add_argument('rows', type=int, help="Number of rows, e.g. 10000 or 10000000")
+    parser.add_argument('-o', '--output', required=True, help="Output .csv or .parquet path")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05)
+    parser.add_argument('--invalid-rate', type=float, default=0.01)
+    parser.add_argument('--variant-rate', type=float, default=0.05)
+    parser.add_argument('--missing-rate', type=float, default=0.002)
+    parser.add_argument('--long-text-rate', type=float, default=0.03)
+    parser.add_argument('--non-english-rate', type=float, default=0.0,
+                        help="Share of APAC and LATAM rows written in a local language")
+    parser.add_argument('--pii-rate', type=float, default=0.0,
+                        help="Share of rows with an email, phone number, account ID or IP address")
+    parser.add_argument('--days', type=int, default=365, help="Timestamp span in days; 0 omits timestamps")
+    parser.add_argument('--end', default=DEFAULT_END, help=f"Last timestamp date (default: {DEFAULT_END})")
+    args = parser.parse_args(argv)
+
+    written = write_feedback(
+        args.output, args.rows, chunk_size=args.chunk_size, seed=args.seed,
+        duplicate_rate=args.duplicate_rate, invalid_rate=args.invalid_rate,
+        variant_rate=args.variant_rate, missing_rate=args.missing_rate,
+        long_text_rate=args.long_text_rate, non_english_rate=args.non_english_rate, pii_rate=args.pii_rate,
+        days=args.days, end=args.end,
+    )
+    print(f"Wrote {written} rows to {os.path.abspath(args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
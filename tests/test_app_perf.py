@@ -0,0 +1,27 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+import instrumentation
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def has_perf_panel(at: AppTest) -> bool:
+    return any(expander.label == "⏱️ Performance" for expander in at.sidebar.expander)
+
+
+def test_perf_query_param_only_enables_its_own_session(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setattr(instrumentation, '_enabled', False)
+
+    opted_in = AppTest.from_file(APP, default_timeout=60)
+    opted_in.query_params['perf'] = '1'
+    opted_in.run()
+    assert not opted_in.exception
+    assert has_perf_panel(opted_in)
+    assert not instrumentation.is_enabled()
+
+    other = AppTest.from_file(APP, default_timeout=60).run()
+    assert not other.exception
+    assert not has_perf_panel(other)
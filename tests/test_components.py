@@ -0,0 +1,21 @@
+import pandas as pd
+import plotly.io
+
+from components import clear_figure_cache, create_robinhood_donut_chart
+
+
+def severity_counts() -> pd.DataFrame:
+    return pd.DataFrame({'Severity': ['High', 'Low'], 'Count': [3, 5]})
+
+
+def test_cached_figure_hands_out_independent_dicts():
+    clear_figure_cache()
+    fig = create_robinhood_donut_chart(severity_counts(), "Severity", 'Severity', 'Count')
+    assert create_robinhood_donut_chart(severity_counts(), "Severity", 'Severity', 'Count') is fig
+
+    expected = plotly.io.to_json(create_robinhood_donut_chart.__wrapped__.__wrapped__(
+        severity_counts(), "Severity", 'Severity', 'Count').to_dict(), validate=False)
+    spec = fig.to_dict()
+    spec['data'][0]['values'] = [0, 0]
+    spec['layout'].clear()
+    assert plotly.io.to_json(fig.to_dict(), validate=False) == expected
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from data_processor import DataProcessor
+from pii_redaction import PIIRedactor
+from reporters import Reporter
+
+TEXTS = ['Mail me at jane@example.com, ACCT-00123456', None, 'Thanks, Jordan Smith', 'No details here']
+
+
+@pytest.mark.parametrize('dtype', [object, 'string[python]', 'str'])
+def test_redact_any_string_dtype(dtype):
+    # string[python] and object columns go through Python's re, which
+    # rejects inline flags anywhere but the start of the screen pattern
+    redactor = PIIRedactor(dictionaries={'contact': ['jordan smith']})
+    redacted, report = redactor.redact(pd.Series(TEXTS, dtype=dtype))
+    assert redacted.tolist()[0] == 'Mail me at [EMAIL], [ACCOUNT_ID]'
+    assert pd.isna(redacted.tolist()[1])
+    assert redacted.tolist()[2:] == ['Thanks, [CONTACT]', 'No details here']
+    assert report.counts['email'] == report.counts['account_id'] == report.counts['contact'] == 1
+    assert report.redacted_rows == 2
+
+
+def test_configured_global_flag_is_scoped():
+    redactor = PIIRedactor(patterns={'account_id': r'(?i)\bcust-\d{6}\b'})
+    redacted, report = redactor.redact(pd.Series(['see CUST-123456 and a@b.io'], dtype='string[python]'))
+    assert redacted.tolist() == ['see [ACCOUNT_ID] and [EMAIL]']
+    assert redactor.redact_text('see cust-123456') == 'see [ACCOUNT_ID]'
+
+
+def test_sample_data_loads_with_python_strings():
+    processor = DataProcessor(reporter=Reporter())
+    df = processor._validate_and_clean_data(pd.DataFrame({
+        'Feedback': pd.Series(TEXTS[:1] + TEXTS[2:], dtype='string[python]'),
+        'Product': ['API'] * 3, 'Severity': ['High'] * 3, 'Region': ['US'] * 3,
+    }))
+    assert df['Feedback'].tolist()[0] == 'Mail me at [EMAIL], [ACCOUNT_ID]'
+    assert processor.redaction_report.counts['email'] == 1
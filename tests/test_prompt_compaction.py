@@ -0,0 +1,17 @@
+from prompt_compaction import strip_boilerplate
+
+
+def test_quoted_reply_header_is_stripped():
+    text = ("Exports still time out after the update.\n\n"
+            "From: Support <support@example.com>\n"
+            "Sent: Monday, March 3, 2025 9:14 AM\n"
+            "To: Jordan\n"
+            "Subject: RE: Export failures\n\n"
+            "Thanks for reaching out, we are looking into it.")
+    assert strip_boilerplate(text) == "Exports still time out after the update."
+
+
+def test_feedback_starting_with_from_is_kept():
+    text = ("From: our finance team — exports fail every month-end close.\n"
+            "The CSV download spins for minutes and then errors out.")
+    assert strip_boilerplate(text) == text
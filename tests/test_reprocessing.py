@@ -0,0 +1,66 @@
+import time
+
+import pandas as pd
+
+from circuit_breaker import CircuitBreaker
+from reprocessing import ReprocessingQueue
+
+
+class StubAnalyzer:
+    STATUS_OK = 'ok'
+    STATUS_FALLBACK = 'fallback'
+    STATUS_FAILED = 'failed'
+    REPROCESS_STATUSES = (STATUS_FALLBACK, STATUS_FAILED)
+
+    def __init__(self, circuit_breaker: CircuitBreaker):
+        self.circuit_breaker = circuit_breaker
+        self.calls = 0
+
+    @staticmethod
+    def row_languages(df):
+        return None
+
+    def analyze_row(self, text, severity=None, reporter=None, language=None):
+        self.calls += 1
+        if not self.circuit_breaker.allow_request():
+            return 'Local', '', self.STATUS_FALLBACK, ()
+        self.circuit_breaker.record_success()
+        return 'Model', 'summary', self.STATUS_OK, ()
+
+
+def test_queue_stays_idle_while_another_caller_holds_the_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    # Another session's call takes the half-open probe and is still running
+    assert breaker.allow_request() and breaker.probe_in_flight
+    analyzer = StubAnalyzer(breaker)
+    queue = ReprocessingQueue(analyzer, base_delay=0.5)
+    try:
+        queue.enqueue(pd.DataFrame({'Feedback': ['export fails'], 'AI_Status': ['fallback']}))
+        time.sleep(0.3)
+        assert analyzer.calls == 0
+        assert breaker.short_circuited == 0
+
+        # The probe succeeds; the row goes through on the next check
+        breaker.record_success()
+        assert queue.wait(timeout=5)
+        assert analyzer.calls == 1
+        assert queue.to_dict()['completed'] == 1
+    finally:
+        queue.stop()
+
+
+def test_short_circuited_row_waits_base_delay():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    analyzer = StubAnalyzer(breaker)
+    # The probe is taken between the queue's check and its call
+    analyzer.analyze_row = lambda *args: (setattr(analyzer, 'calls', analyzer.calls + 1),
+                                          ('Local', '', 'fallback', ()))[1]
+    queue = ReprocessingQueue(analyzer, base_delay=0.5)
+    try:
+        queue.enqueue(pd.DataFrame({'Feedback': ['export fails'], 'AI_Status': ['failed']}))
+        time.sleep(0.3)
+        assert analyzer.calls == 1
+        assert queue.to_dict()['attempts'] == 1
+    finally:
+        queue.stop()
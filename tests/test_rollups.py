@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from rollups import build_rollups, update_rollups
+
+
+def language_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Timestamp': pd.to_datetime(['2025-01-06', '2025-01-06', '2025-01-07', '2025-01-14']),
+        'AI_Category': ['Win Enterprise Deals'] * 4,
+        'Product': ['API'] * 4,
+        'Severity': ['High'] * 4,
+        'Region': ['APAC'] * 4,
+        'Language': pd.Categorical(['en', 'ja', 'ja', 'en']),
+        'Opportunity_Score': [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+def test_language_filter_and_breakdown():
+    rollups = build_rollups(language_frame())
+    _, _, values = rollups['D'].series(filters={'Language': ['ja']})
+    assert values.sum() == 2
+    _, labels, values = rollups['W'].series(by='Language')
+    assert dict(zip(labels, values.sum(axis=0))) == {'en': 2, 'ja': 2}
+
+
+def test_language_survives_incremental_update():
+    df = language_frame()
+    rollups = build_rollups(df)
+    updated = update_rollups(rollups, df.iloc[[1]], df.iloc[[1]].assign(Opportunity_Score=5.0))
+    _, _, scores = updated['D'].series(filters={'Language': ['ja']}, value='avg_score')
+    assert np.nanmax(scores) == 5.0
+    _, _, scores = updated['D'].series(filters={'Language': ['en']}, value='avg_score')
+    assert np.nanmax(scores) == 4.0
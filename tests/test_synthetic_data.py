@@ -0,0 +1,9 @@
+import pandas as pd
+
+from synthetic_data import DEFAULT_END, generate_feedback
+
+
+def test_seed_alone_fixes_the_timestamps():
+    df = generate_feedback(500, seed=3)
+    assert df['Timestamp'].max() < pd.Timestamp(DEFAULT_END)
+    pd.testing.assert_frame_equal(df, generate_feedback(500, seed=3))